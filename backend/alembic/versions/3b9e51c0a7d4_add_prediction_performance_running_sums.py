@@ -0,0 +1,54 @@
+"""add prediction performance running sums
+
+Revision ID: 3b9e51c0a7d4
+Revises: db4ae8e69b10
+Create Date: 2026-10-18 10:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e51c0a7d4'
+down_revision: Union[str, Sequence[str], None] = 'db4ae8e69b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('prediction_performance', sa.Column('scored_predictions', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('prediction_performance', sa.Column('accuracy_sum', sa.Float(), server_default='0', nullable=False))
+    op.add_column('prediction_performance', sa.Column('absolute_error_sum', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('prediction_performance', sa.Column('percentage_error_sum', sa.Float(), server_default='0', nullable=False))
+    op.create_index(
+        'ix_predictions_user_status_accuracy',
+        'predictions',
+        ['user_id', 'status', 'accuracy_score'],
+        unique=False
+    )
+
+    # --- Backfill the running sums of existing users ---
+    scored = (
+        "FROM predictions p WHERE p.user_id = prediction_performance.user_id "
+        "AND p.status = 'COMPLETED' AND p.accuracy_score IS NOT NULL"
+    )
+    op.execute(
+        "UPDATE prediction_performance SET "
+        f"scored_predictions = (SELECT COUNT(*) {scored}), "
+        f"accuracy_sum = (SELECT COALESCE(SUM(p.accuracy_score), 0) {scored}), "
+        f"absolute_error_sum = (SELECT COALESCE(SUM(p.absolute_error), 0) {scored}), "
+        f"percentage_error_sum = (SELECT COALESCE(SUM(p.percentage_error), 0) {scored})"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_predictions_user_status_accuracy', table_name='predictions')
+    op.drop_column('prediction_performance', 'percentage_error_sum')
+    op.drop_column('prediction_performance', 'absolute_error_sum')
+    op.drop_column('prediction_performance', 'accuracy_sum')
+    op.drop_column('prediction_performance', 'scored_predictions')
@@ -0,0 +1,54 @@
+"""add per-user composite indexes, created_at not null
+
+Revision ID: 8c4f2d7e19a3
+Revises: 3b9e51c0a7d4
+Create Date: 2026-10-18 14:37:05.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f2d7e19a3'
+down_revision: Union[str, Sequence[str], None] = '3b9e51c0a7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_videos_user_created', 'videos', ['user_id', 'created_at', 'id']),
+    ('ix_videos_user_channel_created', 'videos', ['user_id', 'channel_id', 'created_at', 'id']),
+    ('ix_videos_user_draft_created', 'videos', ['user_id', 'is_draft', 'created_at', 'id']),
+    ('ix_videos_user_channel_title', 'videos', ['user_id', 'channel_id', 'title']),
+    ('ix_channels_user_created', 'channels', ['user_id', 'created_at', 'id']),
+    ('ix_predictions_user_date', 'predictions', ['user_id', 'prediction_date', 'id']),
+    ('ix_predictions_user_channel_date', 'predictions', ['user_id', 'channel_id', 'prediction_date', 'id']),
+    ('ix_predictions_user_video_date', 'predictions', ['user_id', 'video_id', 'prediction_date', 'id']),
+    ('ix_predictions_user_status_date', 'predictions', ['user_id', 'status', 'prediction_date', 'id']),
+]
+
+
+# Listings page by (created_at, id), so created_at must always be set
+SORT_COLUMN_TABLES = ['videos', 'channels']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in SORT_COLUMN_TABLES:
+        op.execute(f"UPDATE {table} SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL")
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(),
+                        existing_server_default=sa.text('now()'), nullable=False)
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    for table in reversed(SORT_COLUMN_TABLES):
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(),
+                        existing_server_default=sa.text('now()'), nullable=True)
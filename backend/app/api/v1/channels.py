@@ -64,18 +64,24 @@ async def create_channel(
 
 @router.get("/", response_model=ChannelListResponse)
 def list_channels(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Rows to skip; ignored when cursor is passed"),
     limit: int = Query(100, ge=1, le=100),
     connected_only: bool = Query(False),
     type_filter: Optional[str] = Query(None, description="Filter by channel type: real or dummy"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces skip"),
+    include_total: bool = Query(True, description="Count all matching rows; skip on later pages"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Get all channels for the current user."""
-    channels, total = ChannelService.get_user_channels(
-        db, current_user.id, skip, limit, connected_only, type_filter
+    """
+    Get the current user's channels, newest first.
+    Pass the returned next_cursor as `cursor` to fetch the next page;
+    `skip` is ignored when a cursor is passed.
+    """
+    channels, total, next_cursor = ChannelService.get_user_channels(
+        db, current_user.id, skip, limit, connected_only, type_filter, cursor, include_total
     )
-    return ChannelListResponse(channels=channels, total=total)
+    return ChannelListResponse(channels=channels, total=total, next_cursor=next_cursor)
 
 
 @router.get("/{channel_id}", response_model=ChannelResponse)
@@ -11,6 +11,7 @@ from app.schemas import (
     PredictionResponse,
     PredictionListResponse,
     PredictionPerformanceResponse,
+    PredictionPerformanceBreakdownResponse,
     UpdateActualViews,
 )
 from app.services import PredictionService, VideoService, ChannelService
@@ -49,19 +50,25 @@ def create_prediction(
 
 @router.get("/", response_model=PredictionListResponse)
 def list_predictions(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Rows to skip; ignored when cursor is passed"),
     limit: int = Query(100, ge=1, le=100),
     channel_id: Optional[int] = Query(None),
     video_id: Optional[int] = Query(None),
     status: Optional[PredictionStatus] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces skip"),
+    include_total: bool = Query(True, description="Count all matching rows; skip on later pages"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Get all predictions for the current user with optional filters."""
-    predictions, total = PredictionService.get_user_predictions(
-        db, current_user.id, skip, limit, channel_id, video_id, status
+    """
+    Get the current user's predictions, most recent first, with optional filters.
+    Pass the returned next_cursor as `cursor` to fetch the next page;
+    `skip` is ignored when a cursor is passed.
+    """
+    predictions, total, next_cursor = PredictionService.get_user_predictions(
+        db, current_user.id, skip, limit, channel_id, video_id, status, cursor, include_total
     )
-    return PredictionListResponse(predictions=predictions, total=total)
+    return PredictionListResponse(predictions=predictions, total=total, next_cursor=next_cursor)
 
 
 @router.get("/performance", response_model=PredictionPerformanceResponse)
@@ -88,6 +95,18 @@ def get_prediction_performance(
     return performance
 
 
+@router.get("/performance/breakdown", response_model=PredictionPerformanceBreakdownResponse)
+def get_prediction_performance_breakdown(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get live prediction performance metrics for the current user, overall
+    and broken down per channel and per model version.
+    """
+    return PredictionService.get_performance_breakdown(db, current_user.id)
+
+
 @router.get("/{prediction_id}", response_model=PredictionResponse)
 def get_prediction(
     prediction_id: int,
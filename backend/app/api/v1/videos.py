@@ -33,7 +33,7 @@ def create_video(
 
 @router.get("/", response_model=VideoListResponse)
 def list_videos(
-        skip: int = Query(0, ge=0),
+        skip: int = Query(0, ge=0, description="Rows to skip; ignored when cursor is passed"),
         limit: int = Query(100, ge=1, le=100),
         channel_id: Optional[int] = Query(None),
         is_draft: Optional[bool] = Query(None),
@@ -44,11 +44,17 @@ def list_videos(
         is_synthetic: Optional[bool] = Query(
             None, description="Filter by whether the video is synthetic"
         ),
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces skip"),
+        include_total: bool = Query(True, description="Count all matching rows; skip on later pages"),
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_active_user),
 ):
-    """Get all videos for the current user with optional filters."""
-    videos, total = VideoService.get_user_videos(
+    """
+    Get the current user's videos, newest first, with optional filters.
+    Pass the returned next_cursor as `cursor` to fetch the next page;
+    `skip` is ignored when a cursor is passed.
+    """
+    videos, total, next_cursor = VideoService.get_user_videos(
         db=db,
         user_id=current_user.id,
         skip=skip,
@@ -58,8 +64,10 @@ def list_videos(
         is_uploaded=is_uploaded,
         source_type=source_type,
         is_synthetic=is_synthetic,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return VideoListResponse(videos=videos, total=total)
+    return VideoListResponse(videos=videos, total=total, next_cursor=next_cursor)
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
@@ -1,7 +1,7 @@
 """Application settings and environment configuration."""
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import json
 
 
@@ -31,6 +31,23 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_SERVICE_KEY: str
 
+    # Forecast model service (the model/ FastAPI app); unset uses the heuristic only
+    FORECAST_SERVICE_URL: Optional[str] = None
+    FORECAST_HORIZON: str = "30d"
+    FORECAST_CONNECT_TIMEOUT_S: float = 1.0
+    FORECAST_TIMEOUT_S: float = 5.0
+    FORECAST_MAX_RETRIES: int = 2
+    FORECAST_RETRY_BACKOFF_S: float = 0.2
+    FORECAST_POOL_SIZE: int = 20
+    FORECAST_HTTP2: bool = False
+    FORECAST_BREAKER_FAILURES: int = 5
+    FORECAST_BREAKER_RESET_S: float = 30.0
+
+    # Seconds between in-process recomputes of the incremental prediction performance metrics;
+    # 0 (the default) leaves them to `python -m app.services.performance_reconciliation`.
+    # Enable on one API process only.
+    PERFORMANCE_RECONCILE_INTERVAL_S: int = 0
+
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = []
 
@@ -0,0 +1,63 @@
+"""Keyset (cursor) pagination helpers."""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Query
+
+from app.core.exceptions import InvalidCursorException
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Opaque cursor for the position after the row with this sort value and id."""
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Sort value and id of an encode_cursor cursor; InvalidCursorException when malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
+
+
+def keyset_page(
+        query: Query,
+        model: Any,
+        sort_column: Any,
+        limit: int,
+        cursor: Optional[str] = None,
+        skip: int = 0
+) -> tuple[list, Optional[str]]:
+    """
+    One page of `query` in descending (sort_column, id) order, and the cursor
+    of the next page (None on the last page).
+
+    With a cursor, rows are selected by a (sort_column, id) < (value, id) row
+    comparison, so an index on the filter columns followed by sort_column
+    serves any page without scanning the skipped rows. `skip` is an offset
+    for clients that do not pass cursors; it is ignored with a cursor.
+    sort_column must be NOT NULL: NULLs would not survive the row comparison.
+    """
+    if cursor is not None:
+        sort_value, row_id = decode_cursor(cursor)
+        # Compare with the stored value of the cursor row, so both sides share
+        # the column's storage format; fall back to the cursor's copy if it was deleted
+        anchor = select(sort_column).where(model.id == row_id).scalar_subquery()
+        query = query.filter(
+            tuple_(sort_column, model.id) < tuple_(func.coalesce(anchor, sort_value), row_id)
+        )
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.order_by(sort_column.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+    return rows[:limit], next_cursor
@@ -1,15 +1,34 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.router import api_router
 from app.db.session import engine, Base
+from app.services.forecast_client import set_forecast_client
+from app.services.performance_reconciliation import run_periodically
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    reconciliation = None
+    if settings.PERFORMANCE_RECONCILE_INTERVAL_S > 0:
+        reconciliation = asyncio.create_task(run_periodically(settings.PERFORMANCE_RECONCILE_INTERVAL_S))
+    yield
+    if reconciliation is not None:
+        reconciliation.cancel()
+    # Close the pooled forecast service connections
+    set_forecast_client(None)
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # CORS middleware
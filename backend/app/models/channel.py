@@ -8,6 +8,8 @@ from sqlalchemy import (
     BigInteger,
     Text,
     Enum,
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -51,7 +53,8 @@ class Channel(Base):
     likes = Column(BigInteger, default=0)
 
     # Timestamps
-    created_at = Column(DateTime, server_default=func.now())
+    # Listings page by (created_at, id), so it is never NULL
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, onupdate=func.now())
 
     # Relationships
@@ -59,5 +62,12 @@ class Channel(Base):
     videos = relationship("Video", back_populates="channel", cascade="all, delete-orphan")
     predictions = relationship("Prediction", back_populates="channel", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Lookup by YouTube channel ID within a user's channels
+        UniqueConstraint("user_id", "channel_id", name="uix_user_channel_unique"),
+        # Listings, newest first
+        Index("ix_channels_user_created", "user_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<Channel(id={self.id}, type={self.type}, title={self.channel_title})>"
@@ -1,5 +1,7 @@
 """Prediction model for storing video view predictions."""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, BigInteger, Float, JSON, Enum as SQLEnum
+from sqlalchemy import (
+    Column, Integer, String, DateTime, ForeignKey, BigInteger, Float, JSON, Index, Enum as SQLEnum
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -56,6 +58,16 @@ class Prediction(Base):
     channel = relationship("Channel", back_populates="predictions")
     video = relationship("Video", back_populates="predictions")
 
+    __table_args__ = (
+        # Best/worst completed prediction of a user by accuracy
+        Index("ix_predictions_user_status_accuracy", "user_id", "status", "accuracy_score"),
+        # Listings, most recent first, optionally by channel, video or status
+        Index("ix_predictions_user_date", "user_id", "prediction_date", "id"),
+        Index("ix_predictions_user_channel_date", "user_id", "channel_id", "prediction_date", "id"),
+        Index("ix_predictions_user_video_date", "user_id", "video_id", "prediction_date", "id"),
+        Index("ix_predictions_user_status_date", "user_id", "status", "prediction_date", "id"),
+    )
+
 
 class PredictionPerformance(Base):
     """Aggregated prediction performance metrics by user."""
@@ -70,6 +82,12 @@ class PredictionPerformance(Base):
     completed_predictions = Column(Integer, default=0)
     pending_predictions = Column(Integer, default=0)
 
+    # Running sums over completed predictions with accuracy metrics, maintained incrementally
+    scored_predictions = Column(Integer, nullable=False, default=0, server_default="0")
+    accuracy_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    absolute_error_sum = Column(BigInteger, nullable=False, default=0, server_default="0")
+    percentage_error_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+
     # Accuracy metrics
     average_accuracy = Column(Float, nullable=True)
     average_absolute_error = Column(BigInteger, nullable=True)
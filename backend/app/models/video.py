@@ -1,6 +1,8 @@
 import enum
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, BigInteger, Text, JSON, Enum
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Boolean, ForeignKey, BigInteger, Text, JSON, Enum, Index, UniqueConstraint
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -59,7 +61,8 @@ class Video(Base):
     is_synthetic = Column(Boolean, default=False)  # For model-generated or test data
 
     # Timestamps
-    created_at = Column(DateTime, server_default=func.now())
+    # Listings page by (created_at, id), so it is never NULL
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, onupdate=func.now())
     last_synced_at = Column(DateTime, nullable=True)
 
@@ -67,3 +70,14 @@ class Video(Base):
     user = relationship("User", back_populates="videos")
     channel = relationship("Channel", back_populates="videos")
     predictions = relationship("Prediction", back_populates="video", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Lookup by YouTube video ID within a user's videos
+        UniqueConstraint("user_id", "video_id", name="uix_user_video_unique"),
+        # Listings, newest first, optionally by channel or draft status
+        Index("ix_videos_user_created", "user_id", "created_at", "id"),
+        Index("ix_videos_user_channel_created", "user_id", "channel_id", "created_at", "id"),
+        Index("ix_videos_user_draft_created", "user_id", "is_draft", "created_at", "id"),
+        # Existing video lookup by title when forecasting without a YouTube ID
+        Index("ix_videos_user_channel_title", "user_id", "channel_id", "title"),
+    )
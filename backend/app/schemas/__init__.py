@@ -30,6 +30,10 @@ from app.schemas.prediction import (
     PredictionResponse,
     PredictionListResponse,
     PredictionPerformanceResponse,
+    PerformanceMetrics,
+    ChannelPerformance,
+    ModelVersionPerformance,
+    PredictionPerformanceBreakdownResponse,
     UpdateActualViews,
 )
 
@@ -58,5 +62,9 @@ __all__ = [
     "PredictionResponse",
     "PredictionListResponse",
     "PredictionPerformanceResponse",
+    "PerformanceMetrics",
+    "ChannelPerformance",
+    "ModelVersionPerformance",
+    "PredictionPerformanceBreakdownResponse",
     "UpdateActualViews",
 ]
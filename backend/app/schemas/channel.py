@@ -77,4 +77,5 @@ class ChannelResponse(ChannelInDB):
 class ChannelListResponse(BaseModel):
     """Schema for a paginated list of channels."""
     channels: list[ChannelResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Count of all matching rows; null when not requested")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page; null on the last page")
@@ -1,7 +1,7 @@
 """Prediction schemas for API requests/responses."""
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, Any
+from typing import Optional, Any, List
 from app.models.prediction import PredictionStatus
 
 
@@ -58,7 +58,8 @@ class PredictionResponse(PredictionInDB):
 class PredictionListResponse(BaseModel):
     """Schema for list of predictions."""
     predictions: list[PredictionResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Count of all matching rows; null when not requested")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page; null on the last page")
 
 
 class PredictionPerformanceResponse(BaseModel):
@@ -78,6 +79,36 @@ class PredictionPerformanceResponse(BaseModel):
         from_attributes = True
 
 
+class PerformanceMetrics(BaseModel):
+    """Performance metrics of a set of predictions."""
+    total_predictions: int
+    completed_predictions: int
+    pending_predictions: int
+    average_accuracy: Optional[float]
+    average_absolute_error: Optional[int]
+    average_percentage_error: Optional[float]
+    best_prediction_id: Optional[int]
+    worst_prediction_id: Optional[int]
+
+
+class ChannelPerformance(PerformanceMetrics):
+    """Performance metrics of a channel's predictions."""
+    channel_id: int
+
+
+class ModelVersionPerformance(PerformanceMetrics):
+    """Performance metrics of the predictions made by one model version."""
+    model_version: Optional[str]
+
+
+class PredictionPerformanceBreakdownResponse(BaseModel):
+    """Live performance metrics, overall and per channel and model version."""
+    user_id: int
+    overall: PerformanceMetrics
+    by_channel: List[ChannelPerformance]
+    by_model_version: List[ModelVersionPerformance]
+
+
 class UpdateActualViews(BaseModel):
     """Schema for updating actual views."""
     actual_views: int = Field(..., ge=0, description="Actual view count after 30 days")
\ No newline at end of file
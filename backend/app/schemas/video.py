@@ -102,7 +102,8 @@ class VideoResponse(VideoInDB):
 class VideoListResponse(BaseModel):
     """Schema for list of videos."""
     videos: list[VideoResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Count of all matching rows; null when not requested")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page; null on the last page")
 
 
 class ThumbnailAnalysisRequest(BaseModel):
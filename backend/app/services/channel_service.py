@@ -7,6 +7,7 @@ from datetime import datetime
 from app.models import Channel
 from app.schemas import ChannelCreate, ChannelUpdate
 from app.core.exceptions import ChannelNotFoundException, ForbiddenException
+from app.db.pagination import keyset_page
 
 
 class ChannelService:
@@ -74,9 +75,15 @@ class ChannelService:
         skip: int = 0,
         limit: int = 100,
         connected_only: bool = False,
-        type_filter: Optional[str] = None
-    ) -> tuple[list[Channel], int]:
-        """Get all channels for a user, with optional filtering."""
+        type_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[list[Channel], Optional[int], Optional[str]]:
+        """
+        Get a page of a user's channels, newest first, with optional filtering.
+        Returns the channels, the total count (None unless include_total) and
+        the cursor of the next page.
+        """
         query = db.query(Channel).filter(Channel.user_id == user_id)
 
         if connected_only:
@@ -85,9 +92,9 @@ class ChannelService:
         if type_filter in {"real", "dummy"}:
             query = query.filter(Channel.type == type_filter)
 
-        total = query.count()
-        channels = query.offset(skip).limit(limit).all()
-        return channels, total
+        total = query.count() if include_total else None
+        channels, next_cursor = keyset_page(query, Channel, Channel.created_at, limit, cursor, skip)
+        return channels, total, next_cursor
 
     # -------------------------------------------------------
     # UPDATE
@@ -0,0 +1,367 @@
+"""Client for the forecast model service (the model/ FastAPI app)."""
+import json
+import logging
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.models import Video, Channel
+
+logger = logging.getLogger(__name__)
+
+# YouTube's default category ("People & Blogs") for videos without a valid one
+DEFAULT_CATEGORY_ID = 22
+# The model service accepts observed days 1..30
+MAX_CURRENT_DAY = 30
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+# PredictionResponse fields MLService reads besides the predictions
+RESPONSE_FIELDS = ("current_day", "horizon", "video_type", "model_used")
+
+_DURATION_PATTERN = re.compile(
+    r"^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+
+class ForecastUnavailableError(Exception):
+    """The forecast service could not produce a forecast; callers fall back to the heuristic."""
+
+
+class CircuitOpenError(ForecastUnavailableError):
+    """The circuit breaker refused the call without contacting the forecast service."""
+
+
+def _check_forecast(body: Any) -> Dict[str, Any]:
+    """Return a PredictionResponse body with at least one predicted day; ForecastUnavailableError otherwise."""
+    if not isinstance(body, dict) or any(field not in body for field in RESPONSE_FIELDS):
+        raise ForecastUnavailableError("Malformed forecast response")
+    predictions = body.get("predictions")
+    if not isinstance(predictions, list) or not predictions:
+        # The service answers with no predictions when none of its models could score
+        raise ForecastUnavailableError("Forecast response has no predictions")
+    for point in predictions:
+        if not isinstance(point, dict) or not isinstance(point.get("predicted_views"), (int, float)):
+            raise ForecastUnavailableError("Malformed forecast response: prediction without predicted_views")
+    return body
+
+
+def parse_duration(duration: Optional[str]) -> int:
+    """Seconds of an ISO 8601 duration such as PT5M10S; 0 when missing or malformed."""
+    match = _DURATION_PATTERN.match(duration or "")
+    if not match:
+        return 0
+    parts = {k: int(v or 0) for k, v in match.groupdict().items()}
+    return parts["days"] * 86400 + parts["hours"] * 3600 + parts["minutes"] * 60 + parts["seconds"]
+
+
+def build_forecast_request(
+        video: Video,
+        channel: Channel,
+        days_after_upload: int = 0,
+        horizon: str = "30d",
+        now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Map a Video and its Channel to a PredictionRequest payload of the model service.
+
+    Only current totals are stored for a video, so its daily history up to
+    `current_day` is spread evenly between day 1 and today. Drafts are sent
+    as day 1 with no views yet.
+    """
+    now = now or datetime.utcnow()
+    published_at = video.published_at or now
+
+    if video.is_uploaded and video.published_at:
+        age_days = max((now - video.published_at.replace(tzinfo=None)).days, 1)
+        current_day = min(max(days_after_upload, age_days), MAX_CURRENT_DAY)
+        totals = (video.view_count or 0, video.like_count or 0, video.comment_count or 0)
+    else:
+        current_day = 1
+        totals = (0, 0, 0)
+    # Cumulative counts for days 1..current_day
+    views, likes, comments = (
+        [total * day // current_day for day in range(1, current_day + 1)] for total in totals
+    )
+
+    duration_seconds = parse_duration(video.duration)
+    # Orientation is not stored; YouTube only counts portrait videos up to 3 minutes as shorts
+    portrait = 0 < duration_seconds <= 180 and "#shorts" in (video.title or "").lower()
+    try:
+        category_id = int(video.category_id)
+    except (TypeError, ValueError):
+        category_id = DEFAULT_CATEGORY_ID
+    if not 1 <= category_id <= 44:
+        category_id = DEFAULT_CATEGORY_ID
+
+    payload = {
+        "video_id": video.video_id or str(video.id),
+        "category_id": category_id,
+        "video_metadata": {
+            "duration_seconds": max(duration_seconds, 1),
+            "width": 1080 if portrait else 1920,
+            "height": 1920 if portrait else 1080,
+            "fps": 30.0,
+            "orientation": "portrait" if portrait else "landscape",
+            "resolution": "1080p",
+        },
+        "published_at": published_at.isoformat(),
+        "channel_info": {
+            "channel_id": channel.channel_id or str(channel.id),
+            "subscribers": channel.subscriber_count or 0,
+            "total_views": channel.view_count or 0,
+            "total_videos": max(channel.video_count or 0, 1),
+            "created_at": (channel.published_at or channel.created_at or now).isoformat(),
+        },
+        "daily_series": {"views": views, "likes": likes, "comments": comments},
+        "current_day": current_day,
+        "horizon": horizon,
+    }
+    if video.title:
+        payload["text_features"] = {"title": video.title}
+    return payload
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After `failure_threshold` failures in a row the circuit opens and calls
+    are refused for `reset_timeout_s`; then a single trial call is let
+    through (half-open), which closes the circuit on success or reopens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout_s:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may be made now."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Forecast service circuit closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._state() != self.OPEN:
+                    logger.warning(
+                        "Forecast service circuit opened after %d consecutive failures", self._failures
+                    )
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+class ForecastClient:
+    """
+    Pooled client of the forecast service.
+
+    One httpx.Client is shared by every request thread, so connections are
+    kept alive and reused instead of paying a TCP/TLS handshake per
+    prediction. Transport errors, timeouts and 429/5xx responses are retried
+    with jittered exponential backoff; repeated failures open the circuit
+    breaker and calls fail fast with ForecastUnavailableError.
+    """
+
+    def __init__(
+            self,
+            base_url: str,
+            connect_timeout_s: float = 1.0,
+            timeout_s: float = 5.0,
+            max_retries: int = 2,
+            retry_backoff_s: float = 0.2,
+            pool_size: int = 20,
+            http2: bool = False,
+            breaker: Optional[CircuitBreaker] = None,
+            transport: Optional[httpx.BaseTransport] = None,
+            sleep: Callable[[float], None] = time.sleep,
+    ):
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("FORECAST_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+                http2 = False
+        self.max_retries = max_retries
+        self.retry_backoff_s = retry_backoff_s
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+        self._client = httpx.Client(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout_s, connect=connect_timeout_s),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            http2=http2,
+            transport=transport,
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: uniform between 0 and backoff * 2^attempt seconds."""
+        return random.uniform(0, self.retry_backoff_s * 2 ** attempt)
+
+    def forecast(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST one PredictionRequest payload to /predict and return the
+        PredictionResponse, which holds at least one predicted day.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("Forecast service circuit is open")
+
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._sleep(self._backoff(attempt - 1))
+            try:
+                response = self._client.post("/predict", json=payload)
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {e}"
+                continue
+            if response.status_code in RETRY_STATUS_CODES:
+                error = f"HTTP {response.status_code}"
+                continue
+            if response.status_code >= 400:
+                # The service is up but rejected the payload; retrying will not help
+                self.breaker.record_success()
+                raise ForecastUnavailableError(f"Forecast request rejected: HTTP {response.status_code}")
+            try:
+                body = _check_forecast(response.json())
+            except ValueError:
+                self.breaker.record_failure()
+                raise ForecastUnavailableError("Forecast response is not JSON")
+            except ForecastUnavailableError:
+                # A retry would get the same answer, but repeated broken answers open the circuit
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
+            return body
+
+        self.breaker.record_failure()
+        raise ForecastUnavailableError(f"Forecast service failed after {self.max_retries + 1} attempts: {error}")
+
+    def close(self):
+        self._client.close()
+
+
+class InProcessForecastService:
+    """
+    In-process stand-in for the forecast service, for tests and local runs.
+
+    Pass `client.transport()` as the transport of a ForecastClient. Each
+    /predict call answers with cumulative views growing by the last observed
+    daily gain; `fail_times` makes the first calls answer `fail_status`.
+    """
+
+    def __init__(self, fail_times: int = 0, fail_status: int = 503, model_used: str = "hybrid_30d_all@stub",
+                 body: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        self.fail_times = fail_times
+        self.fail_status = fail_status
+        self.model_used = model_used
+        # Replaces the successful response body, e.g. to simulate a broken service
+        self.body = body
+        self.requests = []
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/predict":
+            return httpx.Response(404, json={"detail": "Not Found"})
+        self.requests.append(request)
+        if len(self.requests) <= self.fail_times:
+            return httpx.Response(self.fail_status, json={"detail": "Service unavailable"})
+
+        payload = json.loads(request.content)
+        views = payload["daily_series"]["views"]
+        current_day = payload["current_day"]
+        daily_gain = max(views[-1] - (views[-2] if len(views) > 1 else 0), 1)
+        horizon_days = int(payload["horizon"].rstrip("d"))
+        if self.body is not None:
+            body = self.body(payload)
+            if isinstance(body, (bytes, str)):
+                return httpx.Response(200, content=body)
+            return httpx.Response(200, json=body)
+        return httpx.Response(200, json={
+            "video_id": payload["video_id"],
+            "horizon": payload["horizon"],
+            "video_type": payload.get("video_type") or "all",
+            "current_day": current_day,
+            "predictions": [
+                {
+                    "day": current_day + step,
+                    "predicted_views": float(views[-1] + daily_gain * step),
+                    "confidence_interval_lower": float(views[-1] + daily_gain * step * 0.8),
+                    "confidence_interval_upper": float(views[-1] + daily_gain * step * 1.2),
+                }
+                for step in range(1, horizon_days + 1)
+            ],
+            "model_used": self.model_used,
+        })
+
+
+_client: Optional[ForecastClient] = None
+_client_lock = threading.Lock()
+
+
+def get_forecast_client() -> Optional[ForecastClient]:
+    """The shared ForecastClient, created on first use; None when FORECAST_SERVICE_URL is unset."""
+    global _client
+    if _client is None and settings.FORECAST_SERVICE_URL:
+        with _client_lock:
+            if _client is None:
+                _client = ForecastClient(
+                    settings.FORECAST_SERVICE_URL,
+                    connect_timeout_s=settings.FORECAST_CONNECT_TIMEOUT_S,
+                    timeout_s=settings.FORECAST_TIMEOUT_S,
+                    max_retries=settings.FORECAST_MAX_RETRIES,
+                    retry_backoff_s=settings.FORECAST_RETRY_BACKOFF_S,
+                    pool_size=settings.FORECAST_POOL_SIZE,
+                    http2=settings.FORECAST_HTTP2,
+                    breaker=CircuitBreaker(settings.FORECAST_BREAKER_FAILURES, settings.FORECAST_BREAKER_RESET_S),
+                )
+    return _client
+
+
+def set_forecast_client(client: Optional[ForecastClient]):
+    """Replace the shared client (closing the previous one); None disables the forecast service."""
+    global _client
+    with _client_lock:
+        if _client is not None and _client is not client:
+            _client.close()
+        _client = client
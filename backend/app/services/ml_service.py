@@ -1,18 +1,24 @@
 """Machine Learning service for video view predictions."""
-# TODO: implement
+import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models import Video, Channel
 from app.schemas import PredictionResult
+from app.services.forecast_client import (
+    CircuitOpenError,
+    ForecastUnavailableError,
+    build_forecast_request,
+    get_forecast_client,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class MLService:
-    """
-    Service for ML model integration.
-    This is a placeholder implementation. Replace with your actual ML model.
-    """
+    """Service for ML model integration."""
 
     MODEL_VERSION = "v1.0.0"
 
@@ -26,25 +32,78 @@ class MLService:
         """
         Predict 30-day view count for a video.
 
-        TODO: Replace this placeholder with your actual ML model.
-        Your model should consider:
-        - Video metadata (title, description, tags, duration)
-        - Thumbnail analysis
-        - Channel statistics and historical performance
-        - Publishing time and day
-        - Competition and trends
+        The forecast model service is used when FORECAST_SERVICE_URL is set;
+        when it is unset, unreachable or its circuit breaker is open, the
+        prediction falls back to the channel-average heuristic.
         """
-        # Extract features
         features = MLService._extract_features(video, channel, days_after_upload)
 
-        # Placeholder prediction logic
-        # In production, replace this with your trained model
+        client = get_forecast_client()
+        if client is not None:
+            payload = build_forecast_request(
+                video, channel, days_after_upload, horizon=settings.FORECAST_HORIZON
+            )
+            try:
+                response = client.forecast(payload)
+            except CircuitOpenError:
+                # The breaker logs when it opens and closes, not on every refused call
+                logger.debug("Forecast service circuit is open, using heuristic")
+            except ForecastUnavailableError as e:
+                logger.warning("Forecast service unavailable, using heuristic: %s", e)
+            else:
+                return MLService._forecast_result(response, payload, features)
+
+        return MLService._heuristic_prediction(features, channel)
+
+    @staticmethod
+    def _forecast_result(
+            response: Dict[str, Any],
+            payload: Dict[str, Any],
+            features: Dict[str, Any]
+    ) -> PredictionResult:
+        """Build a PredictionResult from a forecast service PredictionResponse."""
+        predictions = response["predictions"]
+        final = predictions[-1]
+        predicted_views = int(round(final["predicted_views"]))
+
+        # predicted_views are cumulative; the breakdown holds the daily gains
+        previous = payload["daily_series"]["views"][-1]
+        daily_predictions = []
+        for point in predictions:
+            cumulative = int(round(point["predicted_views"]))
+            daily_predictions.append(max(cumulative - previous, 0))
+            previous = cumulative
+
+        # Narrower prediction intervals give higher confidence
+        lower, upper = final.get("confidence_interval_lower"), final.get("confidence_interval_upper")
+        if lower is not None and upper is not None and predicted_views > 0:
+            confidence = min(max(1 - (upper - lower) / (2 * predicted_views), 0.0), 1.0)
+        else:
+            confidence = 0.75
+
+        return PredictionResult(
+            predicted_views=predicted_views,
+            confidence_score=round(confidence, 4),
+            prediction_breakdown={
+                "daily_predictions": daily_predictions,
+                "growth_pattern": "model",
+                "current_day": response["current_day"],
+                "horizon": response["horizon"],
+                "video_type": response["video_type"],
+                "confidence_interval": [lower, upper],
+            },
+            model_features={**features, "model_used": response["model_used"]},
+        )
+
+    @staticmethod
+    def _heuristic_prediction(features: Dict[str, Any], channel: Channel) -> PredictionResult:
+        """Channel-average heuristic used when the forecast service is not available."""
         base_views = channel.view_count / max(channel.video_count, 1)
 
-        # Simple heuristic-based prediction (replace with actual model)
+        # Simple heuristic-based prediction
         predicted_views = int(base_views * 0.1)  # Assume 10% of avg views per video
 
-        # Adjust based on features (placeholder logic)
+        # Adjust based on features
         if features.get("title_length", 0) > 50:
             predicted_views = int(predicted_views * 1.1)
 
@@ -54,10 +113,8 @@ class MLService:
         if features.get("thumbnail_quality", 0) > 0.7:
             predicted_views = int(predicted_views * 1.15)
 
-        # Generate daily breakdown (placeholder)
         daily_predictions = MLService._generate_daily_breakdown(predicted_views)
 
-        # Calculate confidence (placeholder)
         confidence = 0.75 if channel.video_count > 10 else 0.5
 
         return PredictionResult(
@@ -65,9 +122,9 @@ class MLService:
             confidence_score=confidence,
             prediction_breakdown={
                 "daily_predictions": daily_predictions,
-                "growth_pattern": "exponential_decay",  # or "linear", "viral", etc.
+                "growth_pattern": "exponential_decay",
             },
-            model_features=features,
+            model_features={**features, "model_used": "heuristic"},
         )
 
     @staticmethod
@@ -0,0 +1,42 @@
+"""
+Periodic reconciliation of the incrementally maintained prediction performance metrics.
+
+Schedule it once per deployment (e.g. from cron):
+
+    python -m app.services.performance_reconciliation
+
+or set PERFORMANCE_RECONCILE_INTERVAL_S to run it inside the API process;
+only enable that on a single process, since every process runs its own loop.
+"""
+import asyncio
+import logging
+
+from app.db.session import SessionLocal
+from app.services.prediction_service import PredictionService
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_all() -> int:
+    """Recompute every user's performance metrics; returns the number of users."""
+    db = SessionLocal()
+    try:
+        return PredictionService.reconcile_performance_metrics(db)
+    finally:
+        db.close()
+
+
+async def run_periodically(interval_s: float) -> None:
+    """Reconcile every `interval_s` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            users = await asyncio.to_thread(reconcile_all)
+            logger.info("Reconciled prediction performance metrics for %d users", users)
+        except Exception:
+            logger.exception("Prediction performance reconciliation failed")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Reconciled prediction performance metrics for %d users", reconcile_all())
@@ -1,11 +1,12 @@
 """Prediction service for business logic."""
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from typing import Optional
+from sqlalchemy import and_, case, func, select, update
+from typing import Any, Optional
 from datetime import datetime, timedelta
 from app.models import Prediction, PredictionPerformance, Video, Channel, PredictionStatus
 from app.schemas import PredictionCreate, PredictionResult
 from app.core.exceptions import PredictionNotFoundException, ForbiddenException
+from app.db.pagination import keyset_page
 
 
 class PredictionService:
@@ -60,12 +61,13 @@ class PredictionService:
         )
 
         db.add(prediction)
-        db.commit()
-        db.refresh(prediction)
+        db.flush()
 
-        # Update performance metrics
-        PredictionService._update_performance_metrics(db, user_id)
+        # Update performance metrics in the same transaction
+        PredictionService._apply_performance_delta(db, user_id, total=1, pending=1)
 
+        db.commit()
+        db.refresh(prediction)
         return prediction
 
     @staticmethod
@@ -86,9 +88,15 @@ class PredictionService:
             limit: int = 100,
             channel_id: Optional[int] = None,
             video_id: Optional[int] = None,
-            status: Optional[PredictionStatus] = None
-    ) -> tuple[list[Prediction], int]:
-        """Get all predictions for a user with optional filters."""
+            status: Optional[PredictionStatus] = None,
+            cursor: Optional[str] = None,
+            include_total: bool = True
+    ) -> tuple[list[Prediction], Optional[int], Optional[str]]:
+        """
+        Get a page of a user's predictions, most recent first, with optional
+        filters. Returns the predictions, the total count (None unless
+        include_total) and the cursor of the next page.
+        """
         query = db.query(Prediction).filter(Prediction.user_id == user_id)
 
         if channel_id is not None:
@@ -100,9 +108,11 @@ class PredictionService:
         if status is not None:
             query = query.filter(Prediction.status == status)
 
-        total = query.count()
-        predictions = query.order_by(Prediction.prediction_date.desc()).offset(skip).limit(limit).all()
-        return predictions, total
+        total = query.count() if include_total else None
+        predictions, next_cursor = keyset_page(
+            query, Prediction, Prediction.prediction_date, limit, cursor, skip
+        )
+        return predictions, total, next_cursor
 
     @staticmethod
     def update_actual_views(
@@ -114,6 +124,17 @@ class PredictionService:
         """Update actual views and calculate accuracy metrics."""
         prediction = PredictionService.get_prediction(db, prediction_id, user_id)
 
+        # Previous state, to be replaced in the running performance sums
+        previous_status = prediction.status
+        was_scored = (
+            previous_status == PredictionStatus.COMPLETED and prediction.accuracy_score is not None
+        )
+        previous_metrics = (
+            prediction.accuracy_score or 0.0,
+            prediction.absolute_error or 0,
+            prediction.percentage_error or 0.0,
+        ) if was_scored else (0.0, 0, 0.0)
+
         prediction.actual_views = actual_views
         prediction.status = PredictionStatus.COMPLETED
         prediction.completed_at = datetime.utcnow()
@@ -135,12 +156,23 @@ class PredictionService:
         if prediction.percentage_error is not None:
             prediction.accuracy_score = max(0, 100 - prediction.percentage_error)
 
+        db.flush()
+
+        # Update performance metrics in the same transaction
+        PredictionService._apply_performance_delta(
+            db,
+            user_id,
+            completed=0 if previous_status == PredictionStatus.COMPLETED else 1,
+            pending=-1 if previous_status == PredictionStatus.PENDING else 0,
+            scored=0 if was_scored else 1,
+            accuracy=prediction.accuracy_score - previous_metrics[0],
+            absolute_error=prediction.absolute_error - previous_metrics[1],
+            percentage_error=prediction.percentage_error - previous_metrics[2],
+            update_extremes=True,
+        )
+
         db.commit()
         db.refresh(prediction)
-
-        # Update performance metrics
-        PredictionService._update_performance_metrics(db, user_id)
-
         return prediction
 
     @staticmethod
@@ -151,53 +183,217 @@ class PredictionService:
         ).first()
         return x
 
+    @staticmethod
+    def _apply_performance_delta(
+            db: Session,
+            user_id: int,
+            total: int = 0,
+            completed: int = 0,
+            pending: int = 0,
+            scored: int = 0,
+            accuracy: float = 0.0,
+            absolute_error: int = 0,
+            percentage_error: float = 0.0,
+            update_extremes: bool = False
+    ) -> None:
+        """
+        Add count and sum deltas to the user's performance metrics with one
+        UPDATE, recomputing the averages from the running sums in SQL.
+
+        Does not commit, so the metrics change in the caller's transaction.
+        A user without metrics yet is recomputed in full once.
+        """
+        performance = PredictionPerformance
+        scored_after = func.nullif(performance.scored_predictions + scored, 0)
+        result = db.execute(
+            update(performance)
+            .where(performance.user_id == user_id)
+            .values(
+                total_predictions=performance.total_predictions + total,
+                completed_predictions=performance.completed_predictions + completed,
+                pending_predictions=performance.pending_predictions + pending,
+                scored_predictions=performance.scored_predictions + scored,
+                accuracy_sum=performance.accuracy_sum + accuracy,
+                absolute_error_sum=performance.absolute_error_sum + absolute_error,
+                percentage_error_sum=performance.percentage_error_sum + percentage_error,
+                average_accuracy=(performance.accuracy_sum + accuracy) / scored_after,
+                # Integer division, truncating like the full recompute
+                average_absolute_error=(performance.absolute_error_sum + absolute_error).self_group().op("/")(scored_after),
+                average_percentage_error=(performance.percentage_error_sum + percentage_error) / scored_after,
+                last_calculated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        if result.rowcount == 0:
+            PredictionService._recompute_performance_metrics(db, user_id)
+        elif update_extremes:
+            best_id, worst_id = PredictionService._best_and_worst_prediction_ids(db, user_id)
+            db.execute(
+                update(performance)
+                .where(performance.user_id == user_id)
+                .values(best_prediction_id=best_id, worst_prediction_id=worst_id)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def _best_and_worst_prediction_ids(db: Session, user_id: int) -> tuple[Optional[int], Optional[int]]:
+        """Most and least accurate completed predictions, read from the (user_id, status, accuracy_score) index."""
+        scored = db.query(Prediction.id).filter(
+            and_(
+                Prediction.user_id == user_id,
+                Prediction.status == PredictionStatus.COMPLETED,
+                Prediction.accuracy_score.isnot(None)
+            )
+        )
+        best = scored.order_by(Prediction.accuracy_score.desc(), Prediction.id).limit(1).scalar()
+        worst = scored.order_by(Prediction.accuracy_score.asc(), Prediction.id).limit(1).scalar()
+        return best, worst
+
     @staticmethod
     def _update_performance_metrics(db: Session, user_id: int) -> None:
-        """Update aggregated performance metrics for a user."""
-        # Get or create performance record
-        performance = db.query(PredictionPerformance).filter(
-            PredictionPerformance.user_id == user_id
-        ).first()
+        """Recompute a user's performance metrics from all of their predictions."""
+        PredictionService._recompute_performance_metrics(db, user_id)
+        db.commit()
 
-        if not performance:
-            performance = PredictionPerformance(user_id=user_id)
-            db.add(performance)
+    @staticmethod
+    def reconcile_performance_metrics(db: Session) -> int:
+        """
+        Recompute the performance metrics of every user with predictions or
+        metrics, correcting any drift of the incremental updates (e.g. from
+        predictions removed by cascading deletes). Returns the number of users.
+
+        Each user is recomputed and committed in its own short transaction
+        that locks their metrics row first, so concurrent incremental updates
+        wait for it instead of being overwritten by a stale aggregate.
+        """
+        user_ids = db.execute(
+            select(Prediction.user_id).union(select(PredictionPerformance.user_id))
+        ).scalars().all()
+        for user_id in user_ids:
+            PredictionService._update_performance_metrics(db, user_id)
+        return len(user_ids)
 
-        # Calculate metrics
-        all_predictions = db.query(Prediction).filter(
-            Prediction.user_id == user_id
-        ).all()
+    @staticmethod
+    def get_performance_breakdown(db: Session, user_id: int) -> dict[str, Any]:
+        """
+        Live performance metrics of a user, overall and per channel and model
+        version, each computed by one aggregate query in the database.
+        """
+        user_filter = Prediction.user_id == user_id
+        overall = PredictionService._performance_aggregates(db, where=user_filter)
+        return {
+            "user_id": user_id,
+            "overall": overall[0] if overall else PredictionService._empty_metrics(),
+            "by_channel": PredictionService._performance_aggregates(
+                db, group_by=(Prediction.channel_id,), where=user_filter
+            ),
+            "by_model_version": PredictionService._performance_aggregates(
+                db, group_by=(Prediction.model_version,), where=user_filter
+            ),
+        }
 
-        performance.total_predictions = len(all_predictions)
-        performance.completed_predictions = sum(
-            1 for p in all_predictions if p.status == PredictionStatus.COMPLETED
+    @staticmethod
+    def _performance_aggregates(db: Session, group_by=(), where=None) -> list[dict[str, Any]]:
+        """
+        Counts, running sums, averages and best/worst prediction ids of the
+        predictions matching `where`, per `group_by` group, in one query.
+
+        Best and worst are ranked by a window function over each group, so
+        no prediction row is loaded into Python.
+        """
+        scored = and_(
+            Prediction.status == PredictionStatus.COMPLETED,
+            Prediction.accuracy_score.isnot(None)
         )
-        performance.pending_predictions = sum(
-            1 for p in all_predictions if p.status == PredictionStatus.PENDING
+        # Scored predictions first, then by accuracy; ties go to the oldest prediction
+        unscored_last = case((scored, 0), else_=1)
+        ranked = select(
+            *group_by,
+            Prediction.id,
+            Prediction.status,
+            Prediction.accuracy_score,
+            Prediction.absolute_error,
+            Prediction.percentage_error,
+            func.row_number().over(
+                partition_by=group_by or None,
+                order_by=(unscored_last, Prediction.accuracy_score.desc(), Prediction.id)
+            ).label("best_rank"),
+            func.row_number().over(
+                partition_by=group_by or None,
+                order_by=(unscored_last, Prediction.accuracy_score.asc(), Prediction.id)
+            ).label("worst_rank"),
         )
+        if where is not None:
+            ranked = ranked.where(where)
+        ranked = ranked.subquery()
 
-        # Calculate average metrics for completed predictions
-        completed = [p for p in all_predictions if p.status == PredictionStatus.COMPLETED]
+        row_scored = and_(
+            ranked.c.status == PredictionStatus.COMPLETED,
+            ranked.c.accuracy_score.isnot(None)
+        )
+        group_columns = [ranked.c[column.key] for column in group_by]
+        query = select(
+            *group_columns,
+            func.count().label("total_predictions"),
+            func.count().filter(ranked.c.status == PredictionStatus.COMPLETED).label("completed_predictions"),
+            func.count().filter(ranked.c.status == PredictionStatus.PENDING).label("pending_predictions"),
+            func.count().filter(row_scored).label("scored_predictions"),
+            func.coalesce(func.sum(ranked.c.accuracy_score).filter(row_scored), 0.0).label("accuracy_sum"),
+            func.coalesce(func.sum(ranked.c.absolute_error).filter(row_scored), 0).label("absolute_error_sum"),
+            func.coalesce(func.sum(ranked.c.percentage_error).filter(row_scored), 0.0).label("percentage_error_sum"),
+            func.max(case((and_(row_scored, ranked.c.best_rank == 1), ranked.c.id))).label("best_prediction_id"),
+            func.max(case((and_(row_scored, ranked.c.worst_rank == 1), ranked.c.id))).label("worst_prediction_id"),
+        ).group_by(*group_columns).order_by(*group_columns)
+
+        rows = []
+        for row in db.execute(query).mappings():
+            metrics = dict(row)
+            scored_count = metrics["scored_predictions"]
+            metrics["average_accuracy"] = metrics["accuracy_sum"] / scored_count if scored_count else None
+            metrics["average_absolute_error"] = (
+                int(metrics["absolute_error_sum"]) // scored_count if scored_count else None
+            )
+            metrics["average_percentage_error"] = (
+                metrics["percentage_error_sum"] / scored_count if scored_count else None
+            )
+            rows.append(metrics)
+        return rows
 
-        if completed:
-            accuracy_scores = [p.accuracy_score for p in completed if p.accuracy_score is not None]
-            if accuracy_scores:
-                performance.average_accuracy = sum(accuracy_scores) / len(accuracy_scores)
+    @staticmethod
+    def _empty_metrics() -> dict[str, Any]:
+        return {
+            "total_predictions": 0, "completed_predictions": 0, "pending_predictions": 0,
+            "scored_predictions": 0, "accuracy_sum": 0.0, "absolute_error_sum": 0,
+            "percentage_error_sum": 0.0, "average_accuracy": None, "average_absolute_error": None,
+            "average_percentage_error": None, "best_prediction_id": None, "worst_prediction_id": None,
+        }
+
+    @staticmethod
+    def _set_performance_metrics(performance: PredictionPerformance, metrics: Optional[dict[str, Any]]) -> None:
+        """Copy aggregate metrics (None for a user without predictions) onto a PredictionPerformance row."""
+        for field, value in (metrics or PredictionService._empty_metrics()).items():
+            if hasattr(performance, field) and field != "user_id":
+                setattr(performance, field, value)
+        performance.last_calculated_at = datetime.utcnow()
 
-            absolute_errors = [p.absolute_error for p in completed if p.absolute_error is not None]
-            if absolute_errors:
-                performance.average_absolute_error = int(sum(absolute_errors) / len(absolute_errors))
+    @staticmethod
+    def _recompute_performance_metrics(db: Session, user_id: int) -> None:
+        """
+        Recompute a user's performance metrics with one aggregate query, without committing.
 
-            percentage_errors = [p.percentage_error for p in completed if p.percentage_error is not None]
-            if percentage_errors:
-                performance.average_percentage_error = sum(percentage_errors) / len(percentage_errors)
+        The metrics row is locked before the aggregates are read, so
+        incremental updates of the same user are serialized against it.
+        """
+        # Get or create performance record
+        performance = db.query(PredictionPerformance).filter(
+            PredictionPerformance.user_id == user_id
+        ).with_for_update().first()
 
-            # Find best and worst predictions
-            if accuracy_scores:
-                best = max(completed, key=lambda p: p.accuracy_score or 0)
-                worst = min(completed, key=lambda p: p.accuracy_score or 100)
-                performance.best_prediction_id = best.id
-                performance.worst_prediction_id = worst.id
+        if not performance:
+            performance = PredictionPerformance(user_id=user_id)
+            db.add(performance)
 
-        performance.last_calculated_at = datetime.utcnow()
-        db.commit()
\ No newline at end of file
+        aggregates = PredictionService._performance_aggregates(db, where=Prediction.user_id == user_id)
+        PredictionService._set_performance_metrics(performance, aggregates[0] if aggregates else None)
+        db.flush()
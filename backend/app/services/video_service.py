@@ -9,6 +9,7 @@ from datetime import datetime
 from app.models import Video, Channel, VideoSourceType
 from app.schemas import VideoCreate, VideoUpdate
 from app.core.exceptions import VideoNotFoundException, ForbiddenException
+from app.db.pagination import keyset_page
 from app.services.youtube_service import YouTubeService
 from app.schemas import ChannelCreate
 from app.services import ChannelService
@@ -85,9 +86,15 @@ class VideoService:
         is_draft: Optional[bool] = None,
         is_uploaded: Optional[bool] = None,
         source_type: Optional[VideoSourceType] = None,
-        is_synthetic: Optional[bool] = None
-    ) -> tuple[list[Video], int]:
-        """Get all videos for a user with optional filters."""
+        is_synthetic: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[list[Video], Optional[int], Optional[str]]:
+        """
+        Get a page of a user's videos, newest first, with optional filters.
+        Returns the videos, the total count (None unless include_total) and
+        the cursor of the next page.
+        """
         query = db.query(Video).filter(Video.user_id == user_id)
 
         if channel_id is not None:
@@ -101,9 +108,9 @@ class VideoService:
         if is_synthetic is not None:
             query = query.filter(Video.is_synthetic == is_synthetic)
 
-        total = query.count()
-        videos = query.order_by(Video.created_at.desc()).offset(skip).limit(limit).all()
-        return videos, total
+        total = query.count() if include_total else None
+        videos, next_cursor = keyset_page(query, Video, Video.created_at, limit, cursor, skip)
+        return videos, total, next_cursor
 
     @staticmethod
     def update_video(db: Session, video_id: int, video_data: VideoUpdate, user_id: int) -> Video:
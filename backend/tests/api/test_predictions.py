@@ -110,6 +110,49 @@ def test_list_predictions(
     assert len(data["predictions"]) == 2
 
 
+
+def test_list_predictions_with_cursor(
+        client: TestClient,
+        auth_headers: dict,
+        db: Session,
+        test_user: User,
+        test_video: Video,
+        test_channel: Channel
+):
+    """Test paging through predictions with cursors."""
+    db.add_all([
+        Prediction(
+            user_id=test_user.id,
+            channel_id=test_channel.id,
+            video_id=test_video.id,
+            prediction_date=datetime(2025, 1, day),
+            target_date=datetime(2025, 2, day),
+            predicted_views=1000 * day,
+            status=PredictionStatus.PENDING
+        )
+        for day in range(1, 6)
+    ])
+    db.commit()
+
+    first = client.get("/api/v1/predictions/", params={"limit": 2}, headers=auth_headers).json()
+    assert first["total"] == 5
+    assert [p["predicted_views"] for p in first["predictions"]] == [5000, 4000]
+
+    second = client.get(
+        "/api/v1/predictions/",
+        params={"limit": 2, "cursor": first["next_cursor"], "include_total": "false"},
+        headers=auth_headers
+    ).json()
+    assert second["total"] is None
+    assert [p["predicted_views"] for p in second["predictions"]] == [3000, 2000]
+
+    last = client.get(
+        "/api/v1/predictions/", params={"limit": 2, "cursor": second["next_cursor"]}, headers=auth_headers
+    ).json()
+    assert [p["predicted_views"] for p in last["predictions"]] == [1000]
+    assert last["next_cursor"] is None
+
+
 def test_get_prediction(
         client: TestClient,
         auth_headers: dict,
@@ -240,6 +283,44 @@ def test_get_prediction_performance(
     assert data["worst_prediction_id"] is not None
 
 
+def test_get_prediction_performance_breakdown(
+    client: TestClient,
+    auth_headers: dict,
+    db: Session,
+    test_user: User,
+    test_video: Video,
+    test_channel: Channel
+):
+    """Test getting prediction performance metrics per channel and model version."""
+    prediction = Prediction(
+        user_id=test_user.id,
+        channel_id=test_channel.id,
+        video_id=test_video.id,
+        prediction_date=datetime.utcnow(),
+        target_date=datetime.utcnow(),
+        predicted_views=100000,
+        actual_views=95000,
+        model_version="v1.0.0",
+        status=PredictionStatus.COMPLETED,
+        accuracy_score=95.0,
+        absolute_error=5000,
+        percentage_error=5.0
+    )
+    db.add(prediction)
+    db.commit()
+
+    response = client.get("/api/v1/predictions/performance/breakdown", headers=auth_headers)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["user_id"] == test_user.id
+    assert data["overall"]["completed_predictions"] == 1
+    assert data["overall"]["best_prediction_id"] == prediction.id
+    assert data["by_channel"][0]["channel_id"] == test_channel.id
+    assert data["by_model_version"][0]["model_version"] == "v1.0.0"
+    assert data["by_model_version"][0]["average_absolute_error"] == 5000
+
+
 def test_filter_predictions_by_status(
         client: TestClient,
         auth_headers: dict,
@@ -3,6 +3,8 @@ from datetime import datetime, timezone
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models import User, Channel, Video, VideoSourceType
@@ -160,6 +162,84 @@ def test_list_videos(
     assert len(data["videos"]) == 2
 
 
+def test_list_videos_with_cursor(
+        client: TestClient,
+        auth_headers: dict,
+        db: Session,
+        test_user: User,
+        test_channel: Channel
+):
+    """Test paging through videos with cursors, including videos created in the same second."""
+    same_second = datetime(2025, 1, 1, 12, 0, 0)
+    db.add_all([
+        Video(user_id=test_user.id, channel_id=test_channel.id, title=f"Video {i}",
+              created_at=same_second if i < 4 else datetime(2025, 1, 2, 12, 0, i))
+        for i in range(7)
+    ])
+    db.commit()
+
+    titles, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3, "include_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/videos/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        titles += [video["title"] for video in data["videos"]]
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    # Newest first, ties broken by id
+    assert titles == [f"Video {i}" for i in (6, 5, 4, 3, 2, 1, 0)]
+
+
+def test_list_videos_cursor_ignores_skip(
+        client: TestClient,
+        auth_headers: dict,
+        db: Session,
+        test_user: User,
+        test_channel: Channel
+):
+    """Test that skip does not move a cursor page."""
+    db.add_all([
+        Video(user_id=test_user.id, channel_id=test_channel.id, title=f"Video {i}",
+              created_at=datetime(2025, 1, 1, 12, 0, i))
+        for i in range(5)
+    ])
+    db.commit()
+
+    first = client.get("/api/v1/videos/", params={"limit": 2}, headers=auth_headers).json()
+    params = {"limit": 2, "cursor": first["next_cursor"]}
+    page = client.get("/api/v1/videos/", params=params, headers=auth_headers).json()
+    skipped = client.get("/api/v1/videos/", params={**params, "skip": 2}, headers=auth_headers).json()
+
+    assert [video["title"] for video in page["videos"]] == ["Video 2", "Video 1"]
+    assert skipped["videos"] == page["videos"]
+
+
+def test_video_created_at_is_required(db: Session, test_user: User, test_channel: Channel):
+    """Test that created_at, the listing sort key, cannot be NULL."""
+    video = Video(user_id=test_user.id, channel_id=test_channel.id, title="No timestamp")
+    db.add(video)
+    db.commit()
+    assert video.created_at is not None
+
+    with pytest.raises(IntegrityError):
+        db.execute(update(Video).where(Video.id == video.id).values(created_at=None))
+    db.rollback()
+
+
+def test_list_videos_invalid_cursor(client: TestClient, auth_headers: dict):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/api/v1/videos/", params={"cursor": "not-a-cursor"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
 def test_filter_videos_by_draft_status(
         client: TestClient,
         auth_headers: dict,
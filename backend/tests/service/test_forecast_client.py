@@ -0,0 +1,240 @@
+"""Tests for the forecast service client, its circuit breaker and the MLService fallback."""
+
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import Video, Channel
+from app.services.forecast_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ForecastClient,
+    ForecastUnavailableError,
+    InProcessForecastService,
+    build_forecast_request,
+    parse_duration,
+    set_forecast_client,
+)
+from app.services.ml_service import MLService
+
+NOW = datetime(2025, 3, 1, 12, 0)
+
+
+@pytest.fixture
+def video():
+    return Video(
+        id=7,
+        video_id="abc123",
+        title="How to bake bread",
+        duration="PT12M30S",
+        category_id="26",
+        view_count=1000,
+        like_count=50,
+        comment_count=10,
+        published_at=NOW - timedelta(days=10),
+        is_uploaded=True,
+        tags=["bread"],
+    )
+
+
+@pytest.fixture
+def channel():
+    return Channel(
+        id=3,
+        channel_id="UC123",
+        channel_title="Bakery",
+        subscriber_count=5000,
+        video_count=40,
+        view_count=400000,
+        published_at=NOW - timedelta(days=900),
+    )
+
+
+@pytest.fixture
+def forecast_service():
+    service = InProcessForecastService()
+    yield service
+    set_forecast_client(None)
+
+
+def make_client(service, **kwargs):
+    sleeps = []
+    client = ForecastClient("http://forecast", transport=service.transport(), sleep=sleeps.append, **kwargs)
+    return client, sleeps
+
+
+def test_parse_duration():
+    assert parse_duration("PT12M30S") == 750
+    assert parse_duration("PT1H") == 3600
+    assert parse_duration("P1DT2S") == 86402
+    assert parse_duration(None) == 0
+    assert parse_duration("12:30") == 0
+
+
+def test_build_forecast_request_spreads_totals_over_observed_days(video, channel):
+    payload = build_forecast_request(video, channel, horizon="30d", now=NOW)
+
+    assert payload["video_id"] == "abc123"
+    assert payload["category_id"] == 26
+    assert payload["current_day"] == 10
+    assert payload["video_metadata"]["duration_seconds"] == 750
+    assert payload["video_metadata"]["orientation"] == "landscape"
+    assert payload["channel_info"]["total_videos"] == 40
+    series = payload["daily_series"]
+    assert len(series["views"]) == 10
+    assert series["views"][0] == 100 and series["views"][-1] == 1000
+    assert series["comments"][-1] == 10
+    assert payload["text_features"] == {"title": "How to bake bread"}
+
+
+def test_build_forecast_request_for_draft(video, channel):
+    video.is_uploaded = False
+    video.published_at = None
+    video.category_id = None
+
+    payload = build_forecast_request(video, channel, now=NOW)
+
+    assert payload["current_day"] == 1
+    assert payload["daily_series"]["views"] == [0]
+    assert payload["category_id"] == 22
+    assert payload["published_at"] == NOW.isoformat()
+
+
+def test_forecast_retries_unavailable_service(video, channel):
+    service = InProcessForecastService(fail_times=2)
+    client, sleeps = make_client(service, max_retries=2)
+
+    response = client.forecast(build_forecast_request(video, channel, now=NOW))
+
+    assert len(service.requests) == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.2 and 0 <= sleeps[1] <= 0.4
+    assert response["predictions"][-1]["day"] == 40
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_forecast_does_not_retry_rejected_request(video, channel):
+    service = InProcessForecastService(fail_times=5, fail_status=422)
+    client, sleeps = make_client(service)
+
+    with pytest.raises(ForecastUnavailableError, match="rejected"):
+        client.forecast(build_forecast_request(video, channel, now=NOW))
+    assert len(service.requests) == 1 and sleeps == []
+
+
+def test_circuit_breaker_opens_and_recovers(video, channel):
+    clock = {"now": 0.0}
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=30, clock=lambda: clock["now"])
+    service = InProcessForecastService(fail_times=2)
+    client, _ = make_client(service, max_retries=0, breaker=breaker)
+    payload = build_forecast_request(video, channel, now=NOW)
+
+    for _ in range(2):
+        with pytest.raises(ForecastUnavailableError):
+            client.forecast(payload)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # Open circuit: calls fail fast without reaching the service
+    with pytest.raises(ForecastUnavailableError, match="circuit is open"):
+        client.forecast(payload)
+    assert len(service.requests) == 2
+
+    clock["now"] = 31.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    client.forecast(payload)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_failure_reopens_circuit():
+    clock = {"now": 0.0}
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=10, clock=lambda: clock["now"])
+    breaker.record_failure()
+    clock["now"] = 10.0
+
+    assert breaker.allow()
+    # Only one trial call while half-open
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_predict_views_uses_forecast_service(video, channel, forecast_service):
+    client, _ = make_client(forecast_service)
+    set_forecast_client(client)
+
+    result = MLService.predict_views(None, video, channel, days_after_upload=0)
+
+    assert len(forecast_service.requests) == 1
+    assert result.model_features["model_used"] == "hybrid_30d_all@stub"
+    assert result.prediction_breakdown["growth_pattern"] == "model"
+    daily = result.prediction_breakdown["daily_predictions"]
+    assert len(daily) == 30
+    assert result.predicted_views == video.view_count + sum(daily)
+    assert 0 < result.confidence_score < 1
+
+
+def test_predict_views_falls_back_to_heuristic(video, channel, forecast_service):
+    forecast_service.fail_times = 100
+    client, _ = make_client(forecast_service, max_retries=1)
+    set_forecast_client(client)
+
+    result = MLService.predict_views(None, video, channel, days_after_upload=0)
+
+    assert len(forecast_service.requests) == 2
+    assert result.model_features["model_used"] == "heuristic"
+    assert result.prediction_breakdown["growth_pattern"] == "exponential_decay"
+    assert result.predicted_views == int(int(400000 / 40 * 0.1) * 1.05)
+
+
+def test_open_circuit_is_logged_once_not_per_prediction(video, channel, forecast_service, caplog):
+    forecast_service.fail_times = 100
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=30)
+    client, _ = make_client(forecast_service, max_retries=0, breaker=breaker)
+    set_forecast_client(client)
+    caplog.set_level(logging.DEBUG, logger="app.services")
+
+    for _ in range(3):
+        assert MLService.predict_views(None, video, channel).model_features["model_used"] == "heuristic"
+
+    assert len(forecast_service.requests) == 1
+    warnings = [r.getMessage() for r in caplog.records if r.levelno >= logging.WARNING]
+    assert len(warnings) == 2
+    assert "opened after 1 consecutive failures" in warnings[0]
+    assert "unavailable, using heuristic" in warnings[1]
+    assert sum("circuit is open" in r.getMessage() for r in caplog.records if r.levelno == logging.DEBUG) == 2
+    with pytest.raises(CircuitOpenError):
+        client.forecast(build_forecast_request(video, channel, now=NOW))
+
+
+@pytest.mark.parametrize("body,reason", [
+    (lambda payload: {"video_id": "abc123", "horizon": "30d", "video_type": "all", "current_day": 10,
+                      "predictions": [], "model_used": "hybrid_30d_all@stub"}, "no predictions"),
+    (lambda payload: {"video_id": "abc123", "predictions": [{"day": 11}]}, "Malformed"),
+    (lambda payload: {"video_id": "abc123", "horizon": "30d", "video_type": "all", "current_day": 10,
+                      "predictions": [{"day": 11}], "model_used": "hybrid_30d_all@stub"}, "predicted_views"),
+    (lambda payload: b"<html>Bad gateway</html>", "not JSON"),
+])
+def test_unusable_forecast_response_is_unavailable(video, channel, body, reason):
+    service = InProcessForecastService(body=body)
+    client, sleeps = make_client(service)
+
+    with pytest.raises(ForecastUnavailableError, match=reason):
+        client.forecast(build_forecast_request(video, channel, now=NOW))
+    # Retrying would get the same answer
+    assert len(service.requests) == 1 and sleeps == []
+
+
+def test_empty_forecast_falls_back_to_heuristic(video, channel, forecast_service):
+    forecast_service.body = lambda payload: {
+        "video_id": payload["video_id"], "horizon": payload["horizon"], "video_type": "all",
+        "current_day": payload["current_day"], "predictions": [], "model_used": "hybrid_30d_all@stub",
+    }
+    client, _ = make_client(forecast_service)
+    set_forecast_client(client)
+
+    result = MLService.predict_views(None, video, channel, days_after_upload=0)
+
+    assert len(forecast_service.requests) == 1
+    assert result.model_features["model_used"] == "heuristic"
+    assert result.prediction_breakdown["growth_pattern"] == "exponential_decay"
@@ -0,0 +1,221 @@
+"""Tests for the incrementally maintained prediction performance metrics."""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models import User, Channel, Video, PredictionPerformance
+from app.schemas import PredictionCreate, PredictionResult
+from app.services import PredictionService
+
+METRIC_FIELDS = (
+    "total_predictions", "completed_predictions", "pending_predictions", "scored_predictions",
+    "accuracy_sum", "absolute_error_sum", "percentage_error_sum", "average_accuracy",
+    "average_absolute_error", "average_percentage_error", "best_prediction_id", "worst_prediction_id",
+)
+
+
+@pytest.fixture
+def test_channel(db: Session, test_user: User):
+    channel = Channel(user_id=test_user.id, channel_id="UC_perf", channel_title="Perf Channel")
+    db.add(channel)
+    db.commit()
+    db.refresh(channel)
+    return channel
+
+
+@pytest.fixture
+def test_video(db: Session, test_user: User, test_channel: Channel):
+    video = Video(user_id=test_user.id, channel_id=test_channel.id, title="Perf Video")
+    db.add(video)
+    db.commit()
+    db.refresh(video)
+    return video
+
+
+def create_predictions(db, user, video, channel, predicted_views):
+    return [
+        PredictionService.create_prediction(
+            db,
+            PredictionCreate(video_id=video.id, channel_id=channel.id),
+            PredictionResult(predicted_views=views, prediction_breakdown={"daily_predictions": [views]}),
+            user.id,
+        )
+        for views in predicted_views
+    ]
+
+
+def metrics(db, user_id):
+    db.expire_all()
+    performance = db.query(PredictionPerformance).filter(PredictionPerformance.user_id == user_id).one()
+    return {field: getattr(performance, field) for field in METRIC_FIELDS}
+
+
+def recomputed(db, user_id):
+    PredictionService._update_performance_metrics(db, user_id)
+    return metrics(db, user_id)
+
+
+def test_incremental_metrics_match_full_recompute(db, test_user, test_video, test_channel):
+    predictions = create_predictions(db, test_user, test_video, test_channel, [1000, 2000, 3000, 4000])
+    assert metrics(db, test_user.id)["total_predictions"] == 4
+    assert metrics(db, test_user.id)["pending_predictions"] == 4
+
+    PredictionService.update_actual_views(db, predictions[0].id, 900, test_user.id)
+    PredictionService.update_actual_views(db, predictions[1].id, 1000, test_user.id)
+    PredictionService.update_actual_views(db, predictions[2].id, 3000, test_user.id)
+    incremental = metrics(db, test_user.id)
+
+    assert incremental["completed_predictions"] == 3
+    assert incremental["pending_predictions"] == 1
+    assert incremental["best_prediction_id"] == predictions[2].id
+    assert incremental["worst_prediction_id"] == predictions[1].id
+    assert incremental["average_absolute_error"] == (100 + 1000 + 0) // 3
+    assert incremental == pytest.approx(recomputed(db, test_user.id))
+
+
+def test_revised_actual_views_replace_previous_metrics(db, test_user, test_video, test_channel):
+    first, second = create_predictions(db, test_user, test_video, test_channel, [1000, 1000])
+    PredictionService.update_actual_views(db, first.id, 1000, test_user.id)
+    PredictionService.update_actual_views(db, second.id, 800, test_user.id)
+    assert metrics(db, test_user.id)["best_prediction_id"] == first.id
+
+    # Correcting the first prediction's actual views makes it the worst one
+    PredictionService.update_actual_views(db, first.id, 500, test_user.id)
+    incremental = metrics(db, test_user.id)
+
+    assert incremental["completed_predictions"] == 2
+    assert incremental["scored_predictions"] == 2
+    assert incremental["absolute_error_sum"] == 500 + 200
+    assert incremental["best_prediction_id"] == second.id
+    assert incremental["worst_prediction_id"] == first.id
+    assert incremental == pytest.approx(recomputed(db, test_user.id))
+
+
+def test_create_prediction_does_not_load_existing_predictions(db, test_user, test_video, test_channel):
+    create_predictions(db, test_user, test_video, test_channel, [1000, 2000])
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        create_predictions(db, test_user, test_video, test_channel, [3000])
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # Only the new row's own refresh reads the JSON columns back
+    assert sum("predictions.prediction_breakdown" in s for s in statements) <= 1
+    assert not any(s.lstrip().upper().startswith("SELECT COUNT") for s in statements)
+    assert metrics(db, test_user.id)["total_predictions"] == 3
+
+
+def test_reconcile_corrects_drift(db, test_user, test_video, test_channel):
+    predictions = create_predictions(db, test_user, test_video, test_channel, [1000, 2000])
+    PredictionService.update_actual_views(db, predictions[0].id, 1000, test_user.id)
+    expected = metrics(db, test_user.id)
+
+    performance = db.query(PredictionPerformance).filter(PredictionPerformance.user_id == test_user.id).one()
+    performance.total_predictions = 99
+    performance.accuracy_sum = -1.0
+    performance.best_prediction_id = None
+    db.commit()
+
+    assert PredictionService.reconcile_performance_metrics(db) == 1
+    assert metrics(db, test_user.id) == pytest.approx(expected)
+
+
+def test_reconcile_locks_and_commits_each_user_separately(db, test_user, test_video, test_channel):
+    other = User(email="other@example.com", full_name="other", hashed_password="x")
+    db.add(other)
+    db.commit()
+    create_predictions(db, test_user, test_video, test_channel, [1000])
+    db.add(PredictionPerformance(user_id=other.id, total_predictions=5))
+    db.commit()
+    queries = []
+    commits = []
+
+    def record_query(orm_execute_state):
+        sql = str(orm_execute_state.statement.compile(dialect=postgresql.dialect()))
+        queries.append(sql)
+
+    def record_commit(session):
+        commits.append(session)
+
+    event.listen(db, "do_orm_execute", record_query)
+    event.listen(db, "after_commit", record_commit)
+    try:
+        assert PredictionService.reconcile_performance_metrics(db) == 2
+    finally:
+        event.remove(db, "do_orm_execute", record_query)
+        event.remove(db, "after_commit", record_commit)
+
+    assert len(commits) == 2
+    # Each user's metrics row is locked before their aggregates are read
+    locks = [i for i, sql in enumerate(queries) if sql.endswith("FOR UPDATE")]
+    aggregates = [i for i, sql in enumerate(queries) if "best_rank" in sql]
+    assert len(locks) == len(aggregates) == 2
+    assert all(lock < aggregate for lock, aggregate in zip(locks, aggregates))
+    assert metrics(db, other.id)["total_predictions"] == 0
+    assert metrics(db, test_user.id)["total_predictions"] == 1
+
+
+def test_recompute_aggregates_in_the_database(db, test_user, test_video, test_channel):
+    predictions = create_predictions(db, test_user, test_video, test_channel, [1000, 2000, 3000])
+    PredictionService.update_actual_views(db, predictions[0].id, 800, test_user.id)
+    PredictionService.update_actual_views(db, predictions[1].id, 2000, test_user.id)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        PredictionService._update_performance_metrics(db, test_user.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert not any("prediction_breakdown" in s or "model_features" in s for s in statements)
+    performance = metrics(db, test_user.id)
+    assert performance["total_predictions"] == 3
+    assert performance["completed_predictions"] == 2
+    assert performance["pending_predictions"] == 1
+    assert performance["average_accuracy"] == pytest.approx((75.0 + 100.0) / 2)
+    assert performance["average_absolute_error"] == 100
+    assert performance["best_prediction_id"] == predictions[1].id
+    assert performance["worst_prediction_id"] == predictions[0].id
+
+
+def test_performance_breakdown_per_channel_and_model_version(db, test_user, test_video, test_channel):
+    other_channel = Channel(user_id=test_user.id, channel_id="UC_other", channel_title="Other")
+    db.add(other_channel)
+    db.commit()
+    other_video = Video(user_id=test_user.id, channel_id=other_channel.id, title="Other Video")
+    db.add(other_video)
+    db.commit()
+
+    first, second = create_predictions(db, test_user, test_video, test_channel, [1000, 1000])
+    (third,) = create_predictions(db, test_user, other_video, other_channel, [500])
+    first.model_version = "v1"
+    second.model_version = third.model_version = "v2"
+    db.commit()
+    PredictionService.update_actual_views(db, first.id, 1000, test_user.id)
+    PredictionService.update_actual_views(db, third.id, 1000, test_user.id)
+
+    breakdown = PredictionService.get_performance_breakdown(db, test_user.id)
+
+    assert breakdown["overall"]["total_predictions"] == 3
+    assert breakdown["overall"]["best_prediction_id"] == first.id
+    assert breakdown["overall"]["worst_prediction_id"] == third.id
+    by_channel = {row["channel_id"]: row for row in breakdown["by_channel"]}
+    assert by_channel[test_channel.id]["completed_predictions"] == 1
+    assert by_channel[test_channel.id]["pending_predictions"] == 1
+    assert by_channel[other_channel.id]["average_accuracy"] == pytest.approx(50.0)
+    by_version = {row["model_version"]: row for row in breakdown["by_model_version"]}
+    assert by_version["v1"]["average_accuracy"] == pytest.approx(100.0)
+    assert by_version["v2"]["total_predictions"] == 2
+    assert by_version["v2"]["best_prediction_id"] == third.id
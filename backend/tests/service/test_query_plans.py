@@ -0,0 +1,169 @@
+"""
+EXPLAIN QUERY PLAN checks that the per-user service queries are served by
+indexes: no full table scans, and listings read in index order instead of
+sorting every matching row.
+"""
+
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, text
+
+from app.models import User, Channel, Video, Prediction, PredictionStatus
+from app.schemas import VideoCreate, PredictionCreate
+from app.services import ChannelService, VideoService, PredictionService
+from app.services.forecasting_orchestrator_service import ForecastingOrchestratorService
+
+USERS = 3
+CHANNELS_PER_USER = 3
+VIDEOS_PER_CHANNEL = 40
+PREDICTIONS_PER_VIDEO = 2
+TABLES = ("users", "channels", "videos", "predictions", "prediction_performance")
+UNINDEXED_STEP = re.compile(rf"^(SCAN ({'|'.join(TABLES)})\b|USE TEMP B-TREE FOR ORDER BY)")
+
+
+@pytest.fixture
+def seeded(db):
+    """Several users with channels, videos and predictions, analyzed for the query planner."""
+    start = datetime(2025, 1, 1)
+    users = [User(email=f"user{u}@example.com", full_name=f"user{u}", hashed_password="x") for u in range(USERS)]
+    db.add_all(users)
+    db.flush()
+    for user in users:
+        for c in range(CHANNELS_PER_USER):
+            channel = Channel(user_id=user.id, channel_id=f"UC_{user.id}_{c}", channel_title=f"Channel {c}")
+            db.add(channel)
+            db.flush()
+            for v in range(VIDEOS_PER_CHANNEL):
+                video = Video(
+                    user_id=user.id,
+                    channel_id=channel.id,
+                    video_id=f"vid_{user.id}_{c}_{v}",
+                    title=f"Video {c}-{v}",
+                    is_draft=v % 3 == 0,
+                    created_at=start + timedelta(hours=c * VIDEOS_PER_CHANNEL + v),
+                )
+                db.add(video)
+                db.flush()
+                db.add_all([
+                    Prediction(
+                        user_id=user.id,
+                        channel_id=channel.id,
+                        video_id=video.id,
+                        prediction_date=start + timedelta(hours=c * VIDEOS_PER_CHANNEL + v, minutes=p),
+                        target_date=start + timedelta(days=30),
+                        predicted_views=1000 + v,
+                        status=PredictionStatus.COMPLETED if p else PredictionStatus.PENDING,
+                        accuracy_score=90.0 - v if p else None,
+                    )
+                    for p in range(PREDICTIONS_PER_VIDEO)
+                ])
+    db.commit()
+    for user in users:
+        PredictionService._update_performance_metrics(db, user.id)
+    db.execute(text("ANALYZE"))
+    db.commit()
+    return db, users[0]
+
+
+@contextmanager
+def captured_statements(db):
+    """Collect the (statement, parameters) of every query run inside the block."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def unindexed_steps(db, statements):
+    """Every (statement, plan step) that reads a whole table or sorts all matching rows."""
+    steps = []
+    connection = db.connection().connection
+    for statement, parameters in statements:
+        for row in connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall():
+            detail = row[-1]
+            if UNINDEXED_STEP.match(detail):
+                steps.append((statement, detail))
+    return steps
+
+
+def assert_indexed(db, statements):
+    assert statements
+    steps = unindexed_steps(db, statements)
+    assert not steps, "Unindexed plan steps:\n" + "\n".join(f"{detail}: {statement}" for statement, detail in steps)
+
+
+def test_video_queries_use_indexes(seeded):
+    db, user = seeded
+    channel = db.query(Channel).filter(Channel.user_id == user.id).first()
+
+    with captured_statements(db) as statements:
+        _, _, cursor = VideoService.get_user_videos(db, user.id, limit=10)
+        VideoService.get_user_videos(db, user.id, limit=10, cursor=cursor, include_total=False)
+        VideoService.get_user_videos(db, user.id, limit=10, channel_id=channel.id)
+        VideoService.get_user_videos(db, user.id, limit=10, is_draft=True)
+        VideoService.get_video_by_youtube_id(db, f"vid_{user.id}_0_5", user.id)
+    assert_indexed(db, statements)
+
+
+def test_channel_queries_use_indexes(seeded):
+    db, user = seeded
+
+    with captured_statements(db) as statements:
+        _, _, cursor = ChannelService.get_user_channels(db, user.id, limit=1)
+        ChannelService.get_user_channels(db, user.id, limit=1, cursor=cursor, include_total=False)
+        ChannelService.get_channel_by_youtube_id(db, f"UC_{user.id}_1", user.id)
+    assert_indexed(db, statements)
+
+
+def test_prediction_queries_use_indexes(seeded):
+    db, user = seeded
+    video = db.query(Video).filter(Video.user_id == user.id).first()
+    pending = db.query(Prediction).filter(
+        Prediction.user_id == user.id, Prediction.status == PredictionStatus.PENDING
+    ).first()
+
+    with captured_statements(db) as statements:
+        _, _, cursor = PredictionService.get_user_predictions(db, user.id, limit=10)
+        PredictionService.get_user_predictions(db, user.id, limit=10, cursor=cursor, include_total=False)
+        PredictionService.get_user_predictions(db, user.id, limit=10, channel_id=video.channel_id)
+        PredictionService.get_user_predictions(db, user.id, limit=10, video_id=video.id)
+        PredictionService.get_user_predictions(db, user.id, limit=10, status=PredictionStatus.PENDING)
+        PredictionService.update_actual_views(db, pending.id, 1000, user.id)
+        PredictionService.get_performance_metrics(db, user.id)
+    assert_indexed(db, statements)
+
+
+def test_orchestrator_queries_use_indexes(seeded):
+    db, user = seeded
+    channel = db.query(Channel).filter(Channel.user_id == user.id).first()
+
+    with captured_statements(db) as statements:
+        ForecastingOrchestratorService.create_video_and_prediction(
+            db,
+            VideoCreate(channel_id=channel.id, title="Video 0-7"),
+            PredictionCreate(video_id=0, channel_id=channel.id),
+            user.id,
+        )
+    assert_indexed(db, statements)
+
+
+def test_unindexed_query_is_reported(seeded):
+    db, _ = seeded
+
+    with captured_statements(db) as statements:
+        db.query(Video).filter(Video.description == "missing").all()
+        db.query(Video).filter(Video.user_id == 1).order_by(Video.title).all()
+    details = [detail for _, detail in unindexed_steps(db, statements)]
+    assert details[0].startswith("SCAN videos")
+    assert "USE TEMP B-TREE FOR ORDER BY" in details
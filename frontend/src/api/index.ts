@@ -13,12 +13,16 @@ export type { Body_login_api_v1_auth_login_post } from './models/Body_login_api_
 export type { Body_upload_thumbnail_api_v1_videos_upload_thumbnail_post } from './models/Body_upload_thumbnail_api_v1_videos_upload_thumbnail_post';
 export type { Body_upload_thumbnail_for_video_api_v1_videos__video_id__upload_thumbnail_post } from './models/Body_upload_thumbnail_for_video_api_v1_videos__video_id__upload_thumbnail_post';
 export type { ChannelListResponse } from './models/ChannelListResponse';
+export type { ChannelPerformance } from './models/ChannelPerformance';
 export { ChannelResponse } from './models/ChannelResponse';
 export type { ChannelUpdate } from './models/ChannelUpdate';
 export type { GoogleAuthResponse } from './models/GoogleAuthResponse';
 export type { HTTPValidationError } from './models/HTTPValidationError';
+export type { ModelVersionPerformance } from './models/ModelVersionPerformance';
+export type { PerformanceMetrics } from './models/PerformanceMetrics';
 export type { PredictionCreate } from './models/PredictionCreate';
 export type { PredictionListResponse } from './models/PredictionListResponse';
+export type { PredictionPerformanceBreakdownResponse } from './models/PredictionPerformanceBreakdownResponse';
 export type { PredictionPerformanceResponse } from './models/PredictionPerformanceResponse';
 export type { PredictionResponse } from './models/PredictionResponse';
 export { PredictionStatus } from './models/PredictionStatus';
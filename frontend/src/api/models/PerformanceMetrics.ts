@@ -0,0 +1,18 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+/**
+ * Performance metrics of a set of predictions.
+ */
+export type PerformanceMetrics = {
+    total_predictions: number;
+    completed_predictions: number;
+    pending_predictions: number;
+    average_accuracy: (number | null);
+    average_absolute_error: (number | null);
+    average_percentage_error: (number | null);
+    best_prediction_id: (number | null);
+    worst_prediction_id: (number | null);
+};
+
@@ -0,0 +1,17 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+import type { ChannelPerformance } from './ChannelPerformance';
+import type { ModelVersionPerformance } from './ModelVersionPerformance';
+import type { PerformanceMetrics } from './PerformanceMetrics';
+/**
+ * Live performance metrics, overall and per channel and model version.
+ */
+export type PredictionPerformanceBreakdownResponse = {
+    user_id: number;
+    overall: PerformanceMetrics;
+    by_channel: Array<ChannelPerformance>;
+    by_model_version: Array<ModelVersionPerformance>;
+};
+
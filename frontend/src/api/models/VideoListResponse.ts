@@ -8,6 +8,13 @@ import type { VideoResponse } from './VideoResponse';
  */
 export type VideoListResponse = {
     videos: Array<VideoResponse>;
-    total: number;
+    /**
+     * Count of all matching rows; null when not requested
+     */
+    total?: (number | null);
+    /**
+     * Cursor of the next page; null on the last page
+     */
+    next_cursor?: (string | null);
 };
 
@@ -32,11 +32,15 @@ export class ChannelsService {
     }
     /**
      * List Channels
-     * Get all channels for the current user.
-     * @param skip
+     * Get the current user's channels, newest first.
+     * Pass the returned next_cursor as `cursor` to fetch the next page;
+     * `skip` is ignored when a cursor is passed.
+     * @param skip Rows to skip; ignored when cursor is passed
      * @param limit
      * @param connectedOnly
      * @param typeFilter Filter by channel type: real or dummy
+     * @param cursor next_cursor of the previous page; replaces skip
+     * @param includeTotal Count all matching rows; skip on later pages
      * @returns ChannelListResponse Successful Response
      * @throws ApiError
      */
@@ -45,6 +49,8 @@ export class ChannelsService {
         limit: number = 100,
         connectedOnly: boolean = false,
         typeFilter?: (string | null),
+        cursor?: (string | null),
+        includeTotal: boolean = true,
     ): CancelablePromise<ChannelListResponse> {
         return __request(OpenAPI, {
             method: 'GET',
@@ -54,6 +60,8 @@ export class ChannelsService {
                 'limit': limit,
                 'connected_only': connectedOnly,
                 'type_filter': typeFilter,
+                'cursor': cursor,
+                'include_total': includeTotal,
             },
             errors: {
                 422: `Validation Error`,
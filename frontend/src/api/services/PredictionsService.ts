@@ -4,6 +4,7 @@
 /* eslint-disable */
 import type { PredictionCreate } from '../models/PredictionCreate';
 import type { PredictionListResponse } from '../models/PredictionListResponse';
+import type { PredictionPerformanceBreakdownResponse } from '../models/PredictionPerformanceBreakdownResponse';
 import type { PredictionPerformanceResponse } from '../models/PredictionPerformanceResponse';
 import type { PredictionResponse } from '../models/PredictionResponse';
 import type { PredictionStatus } from '../models/PredictionStatus';
@@ -37,12 +38,16 @@ export class PredictionsService {
     }
     /**
      * List Predictions
-     * Get all predictions for the current user with optional filters.
-     * @param skip
+     * Get the current user's predictions, most recent first, with optional filters.
+     * Pass the returned next_cursor as `cursor` to fetch the next page;
+     * `skip` is ignored when a cursor is passed.
+     * @param skip Rows to skip; ignored when cursor is passed
      * @param limit
      * @param channelId
      * @param videoId
      * @param status
+     * @param cursor next_cursor of the previous page; replaces skip
+     * @param includeTotal Count all matching rows; skip on later pages
      * @returns PredictionListResponse Successful Response
      * @throws ApiError
      */
@@ -52,6 +57,8 @@ export class PredictionsService {
         channelId?: (number | null),
         videoId?: (number | null),
         status?: (PredictionStatus | null),
+        cursor?: (string | null),
+        includeTotal: boolean = true,
     ): CancelablePromise<PredictionListResponse> {
         return __request(OpenAPI, {
             method: 'GET',
@@ -62,6 +69,8 @@ export class PredictionsService {
                 'channel_id': channelId,
                 'video_id': videoId,
                 'status': status,
+                'cursor': cursor,
+                'include_total': includeTotal,
             },
             errors: {
                 422: `Validation Error`,
@@ -80,6 +89,19 @@ export class PredictionsService {
             url: '/api/v1/predictions/performance',
         });
     }
+    /**
+     * Get Prediction Performance Breakdown
+     * Get live prediction performance metrics for the current user, overall
+     * and broken down per channel and per model version.
+     * @returns PredictionPerformanceBreakdownResponse Successful Response
+     * @throws ApiError
+     */
+    public static getPredictionPerformanceBreakdownApiV1PredictionsPerformanceBreakdownGet(): CancelablePromise<PredictionPerformanceBreakdownResponse> {
+        return __request(OpenAPI, {
+            method: 'GET',
+            url: '/api/v1/predictions/performance/breakdown',
+        });
+    }
     /**
      * Get Prediction
      * Get a specific prediction.
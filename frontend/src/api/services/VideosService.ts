@@ -38,14 +38,18 @@ export class VideosService {
     }
     /**
      * List Videos
-     * Get all videos for the current user with optional filters.
-     * @param skip
+     * Get the current user's videos, newest first, with optional filters.
+     * Pass the returned next_cursor as `cursor` to fetch the next page;
+     * `skip` is ignored when a cursor is passed.
+     * @param skip Rows to skip; ignored when cursor is passed
      * @param limit
      * @param channelId
      * @param isDraft
      * @param isUploaded
      * @param sourceType Filter by source type (youtube, manual, or test)
      * @param isSynthetic Filter by whether the video is synthetic
+     * @param cursor next_cursor of the previous page; replaces skip
+     * @param includeTotal Count all matching rows; skip on later pages
      * @returns VideoListResponse Successful Response
      * @throws ApiError
      */
@@ -57,6 +61,8 @@ export class VideosService {
         isUploaded?: (boolean | null),
         sourceType?: (VideoSourceType | null),
         isSynthetic?: (boolean | null),
+        cursor?: (string | null),
+        includeTotal: boolean = true,
     ): CancelablePromise<VideoListResponse> {
         return __request(OpenAPI, {
             method: 'GET',
@@ -69,6 +75,8 @@ export class VideosService {
                 'is_uploaded': isUploaded,
                 'source_type': sourceType,
                 'is_synthetic': isSynthetic,
+                'cursor': cursor,
+                'include_total': includeTotal,
             },
             errors: {
                 422: `Validation Error`,
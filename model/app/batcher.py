@@ -0,0 +1,126 @@
+"""
+Micro-batching of concurrent single-video forecasts.
+
+Requests for the same (horizon, video_type) bundle that arrive within a
+short window are coalesced and scored together on the inference executor,
+then each awaiting handler receives its own result. A batch is flushed when
+it reaches `max_batch` requests or `max_wait_ms` after its first request.
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Dict, Hashable, List, Set
+
+from app.executor import InferenceExecutor, summarize
+
+MICROBATCH_ENABLED = os.getenv("MICROBATCH_ENABLED", "false").lower() in ("1", "true", "yes")
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", 2))
+MICROBATCH_MAX_BATCH = int(os.getenv("MICROBATCH_MAX_BATCH", 32))
+
+_SAMPLE_WINDOW = 2048
+
+
+@dataclass
+class BatchTiming:
+    batch_size: int
+    batch_wait_ms: float  # latency added by waiting for the batch to fill
+    queue_wait_ms: float
+    compute_ms: float
+
+
+class MicroBatcher:
+    """
+    `score_fn(key, payloads)` scores one batch and returns a list aligned with
+    `payloads`; an Exception entry is raised to that payload's caller only.
+    """
+
+    def __init__(self, score_fn: Callable[[Hashable, List[Any]], List[Any]], executor: InferenceExecutor,
+                 max_wait_ms: float = MICROBATCH_MAX_WAIT_MS, max_batch: int = MICROBATCH_MAX_BATCH):
+        self.score_fn = score_fn
+        self.executor = executor
+        self.max_wait_ms = max_wait_ms
+        self.max_batch = max(max_batch, 1)
+        # Pending batches and their flush timers are only touched on the event loop
+        self._pending: Dict[Hashable, list] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        # The loop only holds weak references to tasks; keep in-flight batches alive
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.flushed_full = 0
+        self.flushed_timeout = 0
+        self._batch_sizes = deque(maxlen=_SAMPLE_WINDOW)
+        self._batch_wait_ms = deque(maxlen=_SAMPLE_WINDOW)
+
+    async def submit(self, key: Hashable, payload: Any):
+        """Queue `payload` for the `key` batch and return (result, BatchTiming)."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((payload, future, perf_counter()))
+        if len(batch) >= self.max_batch:
+            self._flush(key, full=True)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.max_wait_ms / 1000, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable, full: bool = False):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._run(key, batch, full))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Hashable, batch: list, full: bool):
+        flushed = perf_counter()
+        waits = [(flushed - enqueued) * 1000 for _, _, enqueued in batch]
+        with self._lock:
+            self.batches += 1
+            self.requests += len(batch)
+            if full:
+                self.flushed_full += 1
+            else:
+                self.flushed_timeout += 1
+            self._batch_sizes.append(len(batch))
+            self._batch_wait_ms.extend(waits)
+
+        try:
+            results, timing = await self.executor.run(self.score_fn, key, [p for p, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result, wait in zip(batch, results, waits):
+            if future.done():  # the caller went away
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result((result, BatchTiming(
+                    batch_size=len(batch),
+                    batch_wait_ms=wait,
+                    queue_wait_ms=timing.queue_wait_ms,
+                    compute_ms=timing.compute_ms,
+                )))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_wait_ms": self.max_wait_ms,
+                "max_batch": self.max_batch,
+                "batches": self.batches,
+                "requests": self.requests,
+                "flushed_full": self.flushed_full,
+                "flushed_timeout": self.flushed_timeout,
+                "batch_size": summarize(self._batch_sizes),
+                "batch_wait_ms": summarize(self._batch_wait_ms),
+            }
@@ -0,0 +1,264 @@
+"""
+Offline bulk scoring of a video catalogue, without the HTTP service.
+
+    python -m app.bulk videos.parquet predictions.parquet [--workers 4] [--chunk-size 20000]
+
+The input is read in chunks and each chunk is scored on a process pool
+through the columnar feature path (app.columnar) and
+HybridPredictor.predict_columns. Predictions are written chunk by chunk, in
+input order, as soon as each chunk is done (within a chunk they are grouped
+by bundle), to Parquet, CSV or an Arrow stream, selected by the output file
+extension. Throughput is reported on stderr.
+
+Two input layouts are accepted:
+
+    wide   (Parquet or Arrow) one row per video with list columns, exactly
+           the /predict/arrow upload format
+    long   (CSV, Parquet or Arrow) one row per video and day, with scalar
+           `day`, `views`, `likes` and `comments` columns and the video's
+           static columns repeated on each row. Rows must be grouped by
+           video_id and sorted by day. A video split across two chunks is
+           carried over to the next chunk. `current_day` defaults to the
+           number of observed days.
+
+Requires pyarrow.
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Iterator, Optional
+
+import numpy as np
+
+from app import columnar
+from app.columnar import ColumnarInputError, pa, pc
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 20_000))
+# Seconds between progress lines
+PROGRESS_INTERVAL_S = 5.0
+
+LONG_LIST_COLUMNS = ("day", "views", "likes", "comments")
+
+
+def read_chunks(path: str, chunk_size: int = BULK_CHUNK_SIZE) -> Iterator:
+    """Record batches of about `chunk_size` rows from a CSV, Parquet or Arrow file."""
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".parquet":
+        yield from pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+    elif suffix in (".arrow", ".arrows", ".feather", ".ipc"):
+        with pa.memory_map(path) as source:
+            try:
+                reader = pa.ipc.open_file(source)
+                batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            except pa.ArrowInvalid:
+                source.seek(0)
+                batches = pa.ipc.open_stream(source)
+            for batch in batches:
+                yield from pa.Table.from_batches([batch]).to_batches(max_chunksize=chunk_size)
+    elif suffix == ".csv":
+        # Types inferred from the first block apply to the whole stream; ids must stay strings
+        convert = pacsv.ConvertOptions(column_types={
+            "video_id": pa.string(), "horizon": pa.string(), "video_type": pa.string(),
+        })
+        # Rows per block are not fixed for CSV; aim for chunk_size rows of about 200 bytes
+        read = pacsv.ReadOptions(block_size=max(chunk_size * 200, 1 << 20))
+        with pacsv.open_csv(path, read_options=read, convert_options=convert) as reader:
+            yield from reader
+    else:
+        raise ColumnarInputError(f"Unsupported input file type: {path}")
+
+
+def is_long_format(schema) -> bool:
+    if "day" not in schema.names:
+        return False
+    if "views" not in schema.names:
+        raise ColumnarInputError("Missing columns: views")
+    return not pa.types.is_list(schema.field("views").type)
+
+
+def long_to_wide(batch):
+    """One row per video from a long-format batch whose rows are grouped by video_id and sorted by day."""
+    n = batch.num_rows
+    ids = batch.column("video_id")
+    starts = np.flatnonzero(
+        np.concatenate(([True], pc.not_equal(ids[1:], ids[:-1]).to_numpy(zero_copy_only=False)))
+    ) if n else np.zeros(0, dtype=np.int64)
+    offsets = pa.array(np.append(starts, n).astype(np.int32))
+    first_rows = pa.array(starts)
+
+    columns = {}
+    for name in batch.schema.names:
+        if name in LONG_LIST_COLUMNS:
+            columns["days" if name == "day" else name] = pa.ListArray.from_arrays(
+                offsets, batch.column(name).cast(pa.int64())
+            )
+        elif name != "current_day":
+            columns[name] = batch.column(name).take(first_rows)
+    if "current_day" in batch.schema.names:
+        columns["current_day"] = batch.column("current_day").take(first_rows)
+    else:
+        columns["current_day"] = pa.array(np.diff(np.append(starts, n)))
+    return pa.RecordBatch.from_pydict(columns)
+
+
+def video_chunks(batches, chunk_size: int = BULK_CHUNK_SIZE) -> Iterator:
+    """
+    Wide (one row per video) record batches from wide or long input batches.
+
+    Long input is regrouped per video; the last video of each batch may
+    continue in the next one, so its rows are carried over.
+    """
+    carry = None
+    for batch in batches:
+        if not is_long_format(batch.schema):
+            yield batch
+            continue
+        if carry is not None:
+            batch = pa.Table.from_batches([carry, batch.cast(carry.schema)]).combine_chunks().to_batches()[0]
+        if batch.num_rows == 0:
+            continue
+        ids = batch.column("video_id")
+        last = ids[batch.num_rows - 1]
+        # Rows of the last video, which may be incomplete
+        tail = int(pc.sum(pc.equal(ids, last)).as_py())
+        complete, carry = batch.slice(0, batch.num_rows - tail), batch.slice(batch.num_rows - tail)
+        if complete.num_rows:
+            yield long_to_wide(complete)
+    if carry is not None and carry.num_rows:
+        yield long_to_wide(carry)
+
+
+_worker_predictor = None
+
+
+def _init_worker(model_dir: str, backend: str):
+    global _worker_predictor
+    from app.predictor import HybridPredictor
+    from app.registry import ModelRegistry
+
+    # Processes provide the parallelism, so each booster call uses one thread
+    _worker_predictor = HybridPredictor(
+        registry=ModelRegistry(model_dir).load(), backend=backend, booster_threads=1
+    )
+
+
+def _score_chunk(batch, horizon: Optional[str], video_type: Optional[str]):
+    out = list(columnar.score_batch(_worker_predictor, batch, horizon=horizon, video_type=video_type))
+    return batch.num_rows, pa.Table.from_batches(out, schema=columnar.output_schema())
+
+
+class PredictionWriter:
+    """Incremental writer of prediction tables to Parquet, CSV or an Arrow stream."""
+
+    def __init__(self, path: str):
+        import pyarrow.csv as pacsv
+        import pyarrow.parquet as pq
+
+        schema = columnar.output_schema()
+        suffix = os.path.splitext(path)[1].lower()
+        if suffix == ".parquet":
+            self._writer = pq.ParquetWriter(path, schema)
+        elif suffix == ".csv":
+            self._writer = pacsv.CSVWriter(path, schema)
+        elif suffix in (".arrow", ".arrows", ".ipc"):
+            self._sink = pa.OSFile(path, "wb")
+            self._writer = pa.ipc.new_stream(self._sink, schema)
+        else:
+            raise ColumnarInputError(f"Unsupported output file type: {path}")
+
+    def write(self, table):
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+        if hasattr(self, "_sink"):
+            self._sink.close()
+
+
+def score_file(input_path: str, output_path: str, model_dir: str = "models/", workers: int = 0,
+               chunk_size: int = BULK_CHUNK_SIZE, horizon: Optional[str] = None,
+               video_type: Optional[str] = None, backend: str = "native", progress=sys.stderr):
+    """
+    Score every video of `input_path` into `output_path`. With `workers` 0
+    chunks are scored in this process. Returns the totals: videos,
+    predictions, failed videos, seconds and videos per second.
+    """
+    totals = {"videos": 0, "predictions": 0, "failed": 0}
+    start = last_report = perf_counter()
+
+    def record(result):
+        nonlocal last_report
+        n_videos, table = result
+        writer.write(table)
+        totals["videos"] += n_videos
+        totals["failed"] += table.num_rows - table.column("day").drop_null().length()
+        totals["predictions"] += table.column("day").drop_null().length()
+        now = perf_counter()
+        if progress is not None and now - last_report >= PROGRESS_INTERVAL_S:
+            last_report = now
+            print(f"✅ {totals['videos']} videos scored ({totals['videos'] / (now - start):.0f} videos/s)",
+                  file=progress)
+
+    chunks = video_chunks(read_chunks(input_path, chunk_size), chunk_size)
+    writer = PredictionWriter(output_path)
+    try:
+        if workers <= 0:
+            _init_worker(model_dir, backend)
+            for batch in chunks:
+                record(_score_chunk(batch, horizon, video_type))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(model_dir, backend)) as pool:
+                # A few chunks in flight per worker; results are written in input order
+                pending = deque()
+                for batch in chunks:
+                    pending.append(pool.submit(_score_chunk, batch, horizon, video_type))
+                    while len(pending) >= 2 * workers:
+                        record(pending.popleft().result())
+                while pending:
+                    record(pending.popleft().result())
+    finally:
+        writer.close()
+
+    elapsed = perf_counter() - start
+    totals["seconds"] = elapsed
+    totals["videos_per_s"] = totals["videos"] / elapsed if elapsed else 0.0
+    totals["predictions_per_s"] = totals["predictions"] / elapsed if elapsed else 0.0
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV, Parquet or Arrow file of videos")
+    parser.add_argument("output", help="Predictions file: .parquet, .csv or .arrow")
+    parser.add_argument("--model-dir", default=os.getenv("MODELS_DIR", "models/"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Scoring processes; 0 scores in this process")
+    parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE, help="Input rows per chunk")
+    parser.add_argument("--horizon", choices=["7d", "30d"], help="For rows without a horizon column")
+    parser.add_argument("--video-type", choices=["all", "short", "long"], help="For rows without a video_type column")
+    parser.add_argument("--backend", default=os.getenv("INFERENCE_BACKEND", "native"), choices=["native", "compiled"])
+    args = parser.parse_args(argv)
+
+    if not columnar.available():
+        parser.error("pyarrow is required for bulk scoring")
+    try:
+        totals = score_file(args.input, args.output, args.model_dir, args.workers, args.chunk_size,
+                            args.horizon, args.video_type, args.backend)
+    except ColumnarInputError as e:
+        print(f"⚠️ {e}", file=sys.stderr)
+        return 1
+    print(f"✅ Scored {totals['videos']} videos ({totals['failed']} failed) into {totals['predictions']} "
+          f"predictions in {totals['seconds']:.1f}s: {totals['videos_per_s']:.0f} videos/s, "
+          f"{totals['predictions_per_s']:.0f} predictions/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
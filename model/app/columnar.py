@@ -0,0 +1,345 @@
+"""
+Columnar (Apache Arrow) batch scoring for bulk re-forecasts.
+
+The input is an Arrow IPC stream or file, or a Parquet file, with one row
+per video:
+
+    video_id              string
+    current_day           integer, last observed day
+    published_at          timestamp (weekday/hour use the column's time zone)
+    views, likes,
+    comments              list<integer>, cumulative metrics of the observed days
+    duration_seconds      integer
+    channel_subscribers,
+    channel_total_views,
+    channel_total_videos  integer
+    horizon, video_type   string, optional when given for the whole upload
+    days                  list<integer>, optional sorted day numbers (default 1..n)
+    title_pca2, sharpness,
+    colorfulness          float, optional; null rows are scored as missing
+
+The features of each video's last observed day are computed for a whole
+record batch at once with array ops over the flattened list buffers, which
+NumPy reads from the Arrow memory without copying, and go to
+HybridPredictor.predict_columns. They match build_feature_block on the
+equivalent PredictionRequest. The result is an Arrow stream in long format,
+one row per video and future day; videos that cannot be scored get one row
+with a null day and an `error`.
+
+pyarrow is optional: without it `available()` is False.
+"""
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pc = pq = None
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+REQUIRED_COLUMNS = (
+    "video_id", "current_day", "published_at", "views", "likes", "comments",
+    "duration_seconds", "channel_subscribers", "channel_total_views", "channel_total_videos",
+)
+# Optional enrichment columns; an absent column scores as 0, like an absent request section
+ENRICHMENT_COLUMNS = ("title_pca2", "sharpness", "colorfulness")
+
+
+class ColumnarInputError(ValueError):
+    """The upload is not a readable table with the expected columns."""
+
+
+def available() -> bool:
+    return pa is not None
+
+
+def output_schema():
+    return pa.schema([
+        ("video_id", pa.string()),
+        ("horizon", pa.string()),
+        ("video_type", pa.string()),
+        ("day", pa.int32()),
+        ("predicted_views", pa.float64()),
+        ("confidence_interval_lower", pa.float64()),
+        ("confidence_interval_upper", pa.float64()),
+        ("model_used", pa.string()),
+        ("error", pa.string()),
+    ])
+
+
+def record_batches(body: bytes, media_type: str = ARROW_STREAM_MEDIA_TYPE) -> Iterator:
+    """Record batches of an uploaded Arrow stream/file or Parquet file, read from `body` in place."""
+    try:
+        if media_type == PARQUET_MEDIA_TYPE:
+            yield from pq.ParquetFile(pa.BufferReader(body)).iter_batches()
+        elif media_type == ARROW_FILE_MEDIA_TYPE:
+            reader = pa.ipc.open_file(pa.py_buffer(body))
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+        else:
+            yield from pa.ipc.open_stream(pa.py_buffer(body))
+    except pa.ArrowInvalid as e:
+        raise ColumnarInputError(f"Could not read the upload as {media_type}: {e}") from e
+
+
+def _cast(array, name: str, dtype) -> np.ndarray:
+    """The values of a numeric Arrow array as `dtype`; ColumnarInputError naming `name` otherwise."""
+    if not (pa.types.is_integer(array.type) or pa.types.is_floating(array.type)):
+        raise ColumnarInputError(f"{name} must be numeric, not {array.type}")
+    try:
+        return array.to_numpy(zero_copy_only=False).astype(dtype, copy=False)
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        raise ColumnarInputError(f"{name} could not be read as {np.dtype(dtype).name}: {e}") from e
+
+
+def _numbers(batch, name: str, dtype) -> np.ndarray:
+    column = batch.column(name)
+    if column.null_count:
+        raise ColumnarInputError(f"{name} has null values")
+    return _cast(column, name, dtype)
+
+
+def _nullable(batch, name: str):
+    """A masked float array for an optional column, or 0 when the column is absent."""
+    if name not in batch.schema.names:
+        return 0
+    column = batch.column(name)
+    values = _cast(column, name, np.float64)
+    if column.null_count:
+        return np.ma.masked_array(values, mask=column.is_null().to_numpy(zero_copy_only=False))
+    return values
+
+
+def _lists(batch, name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Flattened int64 values of a list column and the offsets of each row's list into them."""
+    column = batch.column(name)
+    if not pa.types.is_list(column.type) and not pa.types.is_large_list(column.type):
+        raise ColumnarInputError(f"{name} must be a list column")
+    if column.null_count:
+        raise ColumnarInputError(f"{name} has null lists")
+    values = column.flatten()
+    if values.null_count:
+        raise ColumnarInputError(f"{name} has null entries")
+    offsets = column.offsets.to_numpy()
+    return _cast(values, name, np.int64), (offsets - offsets[0]).astype(np.int64)
+
+
+def _labels(batch, name: str, default: Optional[str]) -> np.ndarray:
+    if name in batch.schema.names:
+        return np.asarray(batch.column(name).fill_null(default or "").to_pylist(), dtype=object)
+    if default is None:
+        raise ColumnarInputError(f"{name} must be a column or given for the whole upload")
+    return np.full(batch.num_rows, default, dtype=object)
+
+
+def daily_base(views, likes, comments, days, offsets, rows, current_days) -> Dict[str, np.ndarray]:
+    """
+    Daily features of the `current_days`-th observed day of each row in
+    `rows`, computed like build_feature_block over the flattened histories
+    of all rows (`offsets` delimits them).
+    """
+    list_starts = offsets[:-1][np.diff(offsets) > 0]
+    starts = offsets[rows]
+    p = starts + current_days - 1  # flat index of each row's base day
+    d = days[p]
+
+    # has_diff[j]: day j and the previous day were both observed (see build_feature_block)
+    has_diff = np.zeros(days.size, dtype=bool)
+    has_diff[1:] = days[1:] - days[:-1] == 1
+    has_diff[list_starts] = False
+    has_diff &= days >= 2
+    diffs = np.zeros(days.size, dtype=np.int64)
+    diffs[1:] = np.maximum(views[1:] - views[:-1], 0)
+    diffs[~has_diff] = 0
+
+    # Mean of the available gains on days d-2..d
+    window_sum = np.zeros(p.size, dtype=np.int64)
+    window_count = np.zeros(p.size, dtype=np.int64)
+    for back in range(3):
+        j = p - back
+        inside = j >= starts
+        j = np.where(inside, j, p)
+        take = inside & (days[j] >= d - 2) & has_diff[j]
+        window_sum += np.where(take, diffs[j], 0)
+        window_count += take
+    last3_mean = np.divide(
+        window_sum, window_count,
+        out=np.zeros(p.size, dtype=np.float64),
+        where=window_count > 0,
+    )
+
+    first_views = np.where(days[starts] == 1, views[starts], 1)
+    return {
+        "t": d,
+        "views_cml_t": views[p],
+        "likes_cml_t": likes[p],
+        "comments_cml_t": comments[p],
+        "views_dif_last1": diffs[p],
+        "views_dif_last3_mean": last3_mean,
+        "growth_ratio_t": views[p] / np.maximum(first_views, 1).astype(np.float64),
+    }
+
+
+def prepare_batch(batch, horizon: Optional[str] = None, video_type: Optional[str] = None):
+    """
+    Validate one record batch and compute the base features of its videos.
+
+    Returns (rows, base, errors): `rows` are the indices of the scorable
+    rows, `base` maps feature name -> array aligned with `rows` (plus the
+    "current_day", "horizon" and "video_type" of each), and `errors` holds
+    a message or None for every row of the batch.
+    """
+    missing = [name for name in REQUIRED_COLUMNS if name not in batch.schema.names]
+    if missing:
+        raise ColumnarInputError(f"Missing columns: {', '.join(missing)}")
+    published_at = batch.column("published_at")
+    if not pa.types.is_timestamp(published_at.type):
+        raise ColumnarInputError(f"published_at must be a timestamp, not {published_at.type}")
+    if published_at.null_count:
+        raise ColumnarInputError("published_at has null values")
+
+    horizons = _labels(batch, "horizon", horizon)
+    video_types = _labels(batch, "video_type", video_type or "all")
+    current_days = _numbers(batch, "current_day", np.int64)
+
+    views, offsets = _lists(batch, "views")
+    likes, likes_offsets = _lists(batch, "likes")
+    comments, comments_offsets = _lists(batch, "comments")
+    if not (np.array_equal(offsets, likes_offsets) and np.array_equal(offsets, comments_offsets)):
+        raise ColumnarInputError("views, likes and comments must have the same length in every row")
+    if min(views.min(initial=0), likes.min(initial=0), comments.min(initial=0)) < 0:
+        raise ColumnarInputError("Daily metrics must be non-negative")
+    lengths = np.diff(offsets)
+    if "days" in batch.schema.names:
+        days, days_offsets = _lists(batch, "days")
+        if not np.array_equal(offsets, days_offsets):
+            raise ColumnarInputError("days must have the same length as views in every row")
+    else:
+        days = np.arange(views.size, dtype=np.int64) - np.repeat(offsets[:-1], lengths) + 1
+
+    errors = np.full(batch.num_rows, None, dtype=object)
+    # Days must increase within each row (the nested format sorts them; here they arrive in order)
+    step_ok = np.ones(days.size, dtype=bool)
+    step_ok[1:] = days[1:] > days[:-1]
+    step_ok[offsets[:-1][lengths > 0]] = True
+    bad_steps = np.cumsum(np.concatenate(([0], ~step_ok)))
+    errors[bad_steps[offsets[1:]] > bad_steps[offsets[:-1]]] = "days must be strictly increasing"
+    errors[(current_days < 1) | (current_days > lengths)] = "current_day exceeds available feature days"
+    errors[~np.isin(horizons, ("7d", "30d"))] = "horizon must be 7d or 30d"
+    errors[~np.isin(video_types, ("all", "short", "long"))] = "video_type must be all, short or long"
+
+    rows = np.flatnonzero(errors == None)  # noqa: E711 - elementwise on an object array
+    base = daily_base(views, likes, comments, days, offsets, rows, current_days[rows])
+    base.update({
+        "weekday": pc.day_of_week(published_at).to_numpy()[rows].astype(np.int64),
+        "hour_bin": pc.hour(published_at).to_numpy()[rows].astype(np.int64) // 6,
+        "is_short": (video_types[rows] == "short").astype(np.int64),
+        "video_duration_seconds": _numbers(batch, "duration_seconds", np.int64)[rows],
+        "channel_subs": _numbers(batch, "channel_subscribers", np.int64)[rows],
+        "channel_total_views": _numbers(batch, "channel_total_views", np.int64)[rows],
+        "channel_no_of_videos": _numbers(batch, "channel_total_videos", np.int64)[rows],
+    })
+    for name in ENRICHMENT_COLUMNS:
+        values = _nullable(batch, name)
+        base[name] = np.zeros(rows.size) if np.isscalar(values) else values[rows]
+    base["current_day"] = current_days[rows]
+    base["horizon"] = horizons[rows]
+    base["video_type"] = video_types[rows]
+    return rows, base, errors
+
+
+def score_batch(predictor, batch, registry=None, horizon: Optional[str] = None,
+                video_type: Optional[str] = None) -> Iterator:
+    """Output record batches for one input record batch: one per (horizon, video_type) group."""
+    rows, base, errors = prepare_batch(batch, horizon, video_type)
+    video_ids = batch.column("video_id")
+    labels = {"current_day", "horizon", "video_type"}
+    features = {name: values for name, values in base.items() if name not in labels}
+
+    groups = {}
+    for i, key in enumerate(zip(base["horizon"], base["video_type"])):
+        groups.setdefault(key, []).append(i)
+    for (group_horizon, group_type), members in groups.items():
+        members = np.asarray(members)
+        try:
+            bundle, days, predicted, lower, upper = predictor.predict_columns(
+                {name: values[members] for name, values in features.items()},
+                base["current_day"][members],
+                group_horizon,
+                group_type,
+                registry=registry,
+            )
+        except ValueError as e:
+            errors[rows[members]] = str(e)
+            continue
+        horizon_days = days.size // members.size
+        owners = np.repeat(rows[members], horizon_days)
+        yield pa.RecordBatch.from_arrays([
+            video_ids.take(pa.array(owners)).cast(pa.string()),
+            pa.array(np.full(owners.size, group_horizon, dtype=object), pa.string()),
+            pa.array(np.full(owners.size, group_type, dtype=object), pa.string()),
+            pa.array(days.astype(np.int32)),
+            pa.array(predicted.astype(np.float64)),
+            pa.array(lower.astype(np.float64)) if lower is not None else pa.nulls(owners.size, pa.float64()),
+            pa.array(upper.astype(np.float64)) if upper is not None else pa.nulls(owners.size, pa.float64()),
+            pa.array(np.full(owners.size, bundle.model_id, dtype=object), pa.string()),
+            pa.nulls(owners.size, pa.string()),
+        ], schema=output_schema())
+
+    failed = np.flatnonzero(errors != None)  # noqa: E711
+    if failed.size:
+        yield pa.RecordBatch.from_arrays([
+            video_ids.take(pa.array(failed)).cast(pa.string()),
+            pa.array(_labels(batch, "horizon", horizon or "")[failed], pa.string()),
+            pa.array(_labels(batch, "video_type", video_type or "all")[failed], pa.string()),
+            pa.nulls(failed.size, pa.int32()),
+            pa.nulls(failed.size, pa.float64()),
+            pa.nulls(failed.size, pa.float64()),
+            pa.nulls(failed.size, pa.float64()),
+            pa.nulls(failed.size, pa.string()),
+            pa.array(errors[failed].tolist(), pa.string()),
+        ], schema=output_schema())
+
+
+def score_upload(predictor, body: bytes, media_type: str = ARROW_STREAM_MEDIA_TYPE, registry=None,
+                 horizon: Optional[str] = None, video_type: Optional[str] = None) -> bytes:
+    """Score every row of an uploaded table and return the predictions as an Arrow IPC stream."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, output_schema()) as writer:
+        for batch in record_batches(body, media_type):
+            for out in score_batch(predictor, batch, registry, horizon, video_type):
+                writer.write_batch(out)
+    return sink.getvalue().to_pybytes()
+
+
+def table_from_requests(requests):
+    """The columnar upload equivalent of a list of PredictionRequests (for clients and tests)."""
+    from app.features import daily_arrays
+
+    daily = [daily_arrays(request) for request in requests]
+    text = [request.text_features for request in requests]
+    thumb = [request.thumbnail_features for request in requests]
+    return pa.table({
+        "video_id": [request.video_id for request in requests],
+        "horizon": [request.horizon.value for request in requests],
+        "video_type": [request.video_type.value for request in requests],
+        "current_day": pa.array([request.current_day for request in requests], pa.int32()),
+        "published_at": [request.published_at for request in requests],
+        "days": [days.tolist() for days, _, _, _ in daily],
+        "views": [views.tolist() for _, views, _, _ in daily],
+        "likes": [likes.tolist() for _, _, likes, _ in daily],
+        "comments": [comments.tolist() for _, _, _, comments in daily],
+        "duration_seconds": [request.video_metadata.duration_seconds for request in requests],
+        "channel_subscribers": [request.channel_info.subscribers for request in requests],
+        "channel_total_views": [request.channel_info.total_views for request in requests],
+        "channel_total_videos": [request.channel_info.total_videos for request in requests],
+        "title_pca2": pa.array([t.title_pca2 if t else 0.0 for t in text], pa.float64()),
+        "sharpness": pa.array([t.sharpness if t else 0.0 for t in thumb], pa.float64()),
+        "colorfulness": pa.array([t.colorfulness if t else 0.0 for t in thumb], pa.float64()),
+    })
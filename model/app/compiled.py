@@ -0,0 +1,258 @@
+"""
+Optional compiled-tree inference backend.
+
+A bundle's LightGBM and XGBoost boosters are merged into one Treelite tree
+ensemble over the union of their features, with leaf values pre-scaled by
+the blend weights, so a single predict call returns the blended log-space
+prediction. When tl2cgen is installed the ensemble is compiled to a shared
+library (cached by bundle checksum); otherwise Treelite's GTIL interpreter
+runs it.
+
+Treelite/tl2cgen are optional: without them the service keeps the native
+LightGBM/XGBoost path.
+"""
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.feature_schema import FeatureSchema
+
+# Imported on first use (see _import_backends) so the native backend does not pay for them at startup
+treelite = model_builder = tl2cgen = None
+_imported = False
+
+COMPILED_MODELS_DIR = os.getenv("COMPILED_MODELS_DIR", "cache/compiled")
+
+# XGBoost objectives whose margin is the prediction itself
+_IDENTITY_OBJECTIVES = {
+    "reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror", "reg:quantileerror",
+}
+
+
+class CompilationError(Exception):
+    """The bundle uses a feature the compiled backend does not support."""
+
+
+def _import_backends():
+    global treelite, model_builder, tl2cgen, _imported
+    if _imported:
+        return
+    try:
+        import treelite
+        from treelite import model_builder
+    except ImportError:  # pragma: no cover - optional dependency
+        treelite = None
+    try:
+        import tl2cgen
+    except ImportError:  # pragma: no cover - optional dependency
+        tl2cgen = None
+    _imported = True
+
+
+def available() -> bool:
+    _import_backends()
+    return treelite is not None
+
+
+class CompiledEnsemble:
+    """The blended LightGBM + XGBoost ensemble of one bundle as a single Treelite model."""
+
+    def __init__(self, model, schema: FeatureSchema, checksum: str, library_path: Optional[str] = None,
+                 nthread: Optional[int] = None):
+        self.model = model
+        self.schema = schema
+        self.checksum = checksum
+        self.library_path = library_path
+        self.nthread = nthread
+        self._predictor = tl2cgen.Predictor(library_path, nthread=nthread) if library_path else None
+
+    @property
+    def engine(self) -> str:
+        return "tl2cgen" if self._predictor is not None else "gtil"
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Blended log-space predictions for rows packed with `self.schema`."""
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if self._predictor is not None:
+            out = self._predictor.predict(tl2cgen.DMatrix(X, dtype="float64"), pred_margin=True)
+        else:
+            out = treelite.gtil.predict(self.model, X, nthread=self.nthread or -1, pred_margin=True)
+        return np.asarray(out).reshape(-1)
+
+
+def _union_schema(bundle) -> FeatureSchema:
+    """One column layout covering both boosters' features."""
+    names, defaults = [], {}
+    for schema in (bundle.lgb_schema, bundle.xgb_schema):
+        if schema is None:
+            raise CompilationError(f"{bundle.name} has no feature list")
+        for name, default in zip(schema.names, schema.defaults):
+            if name not in defaults:
+                names.append(name)
+                defaults[name] = float(default)
+            elif defaults[name] != float(default):
+                raise CompilationError(f"{bundle.name}: boosters disagree on the default for {name}")
+    return FeatureSchema.build(names, defaults)
+
+
+def _lightgbm_trees(booster, index: Dict[str, int], weight: float) -> List[dict]:
+    dump = booster.dump_model()
+    if dump.get("average_output"):
+        raise CompilationError("LightGBM random-forest averaging is not supported")
+    names = dump["feature_names"]
+
+    trees = []
+    for info in dump["tree_info"]:
+        nodes = []
+
+        def visit(node):
+            key = len(nodes)
+            nodes.append(None)
+            if "leaf_value" in node:
+                nodes[key] = {"leaf": weight * node["leaf_value"]}
+                return key
+            if node["decision_type"] != "<=" or node["missing_type"] not in ("None", "NaN"):
+                raise CompilationError(
+                    f"LightGBM split {node['decision_type']}/{node['missing_type']} is not supported"
+                )
+            threshold = float(node["threshold"])
+            left = visit(node["left_child"])
+            right = visit(node["right_child"])
+            nodes[key] = {
+                "feature": index[names[node["split_feature"]]],
+                "threshold": threshold,
+                "op": "<=",
+                # missing_type None means LightGBM scores NaN as 0.0
+                "default_left": (
+                    bool(node["default_left"]) if node["missing_type"] == "NaN" else 0.0 <= threshold
+                ),
+                "left": left,
+                "right": right,
+            }
+            return key
+
+        visit(info["tree_structure"])
+        trees.append(nodes)
+    return trees
+
+
+def _xgboost_trees(booster, index: Dict[str, int], weight: float):
+    learner = json.loads(booster.save_raw("json"))["learner"]
+    objective = learner["objective"]["name"]
+    if objective not in _IDENTITY_OBJECTIVES:
+        raise CompilationError(f"XGBoost objective {objective} is not supported")
+    gbm = learner["gradient_booster"]
+    if gbm["name"] != "gbtree":
+        raise CompilationError(f"XGBoost booster {gbm['name']} is not supported")
+
+    names = booster.feature_names
+    base_score = float(str(learner["learner_model_param"]["base_score"]).strip("[]"))
+
+    trees = []
+    for tree in gbm["model"]["trees"]:
+        if any(tree.get("split_type", [])):
+            raise CompilationError("XGBoost categorical splits are not supported")
+        lefts, rights = tree["left_children"], tree["right_children"]
+        nodes = []
+        for nid in range(len(lefts)):
+            if lefts[nid] == -1:
+                nodes.append({"leaf": weight * tree["split_conditions"][nid]})
+            else:
+                nodes.append({
+                    "feature": index[names[tree["split_indices"][nid]]],
+                    "threshold": float(np.float32(tree["split_conditions"][nid])),
+                    "op": "<",
+                    "default_left": bool(tree["default_left"][nid]),
+                    "left": lefts[nid],
+                    "right": rights[nid],
+                })
+        trees.append(nodes)
+    return trees, weight * base_score
+
+
+def build_ensemble_model(bundle):
+    """Treelite model computing w_lgb * lightgbm + w_xgb * xgboost in one pass."""
+    _import_backends()
+    if treelite is None:
+        raise CompilationError("treelite is not installed")
+    if bundle.lgb_model is None or bundle.xgb_model is None:
+        raise CompilationError(f"{bundle.name} needs both a LightGBM and an XGBoost model")
+
+    schema = _union_schema(bundle)
+    trees = _lightgbm_trees(bundle.lgb_model, schema.index, bundle.weights["lightgbm"])
+    xgb_trees, bias = _xgboost_trees(bundle.xgb_model, schema.index, bundle.weights["xgboost"])
+    trees.extend(xgb_trees)
+
+    builder = model_builder.ModelBuilder(
+        threshold_type="float64",
+        leaf_output_type="float64",
+        metadata=model_builder.Metadata(
+            num_feature=schema.width,
+            task_type="kRegressor",
+            average_tree_output=False,
+            num_target=1,
+            num_class=[1],
+            leaf_vector_shape=(1, 1),
+        ),
+        tree_annotation=model_builder.TreeAnnotation(
+            num_tree=len(trees), target_id=[0] * len(trees), class_id=[0] * len(trees)
+        ),
+        postprocessor=model_builder.PostProcessorFunc(name="identity"),
+        base_scores=[bias],
+    )
+    for nodes in trees:
+        builder.start_tree()
+        for key, node in enumerate(nodes):
+            builder.start_node(key)
+            if "leaf" in node:
+                builder.leaf(node["leaf"])
+            else:
+                builder.numerical_test(
+                    node["feature"],
+                    node["threshold"],
+                    default_left=node["default_left"],
+                    opname=node["op"],
+                    left_child_key=node["left"],
+                    right_child_key=node["right"],
+                )
+            builder.end_node()
+        builder.end_tree()
+    return builder.commit(), schema
+
+
+def compile_bundle(bundle, cache_dir: Optional[str] = COMPILED_MODELS_DIR,
+                   compile_library: bool = True, nthread: Optional[int] = None) -> CompiledEnsemble:
+    """
+    Build the single-ensemble model for a bundle and, if tl2cgen is available,
+    compile it to a shared library cached under `cache_dir`.
+    """
+    model, schema = build_ensemble_model(bundle)
+    checksum = bundle.checksum
+
+    library_path = None
+    if compile_library and tl2cgen is not None and cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        library_path = os.path.join(cache_dir, f"{bundle.name}-{checksum[:16]}.so")
+        if not os.path.exists(library_path):
+            tmp_path = f"{library_path}.{os.getpid()}.tmp"
+            tl2cgen.export_lib(model, toolchain="gcc", libpath=tmp_path, params={"parallel_comp": 8})
+            os.replace(tmp_path, library_path)
+
+    return CompiledEnsemble(model, schema, checksum, library_path, nthread=nthread)
+
+
+if __name__ == "__main__":
+    # Build-time compilation: python -m app.compiled [model_dir]
+    import sys
+
+    from app.registry import ModelRegistry
+
+    registry = ModelRegistry(sys.argv[1] if len(sys.argv) > 1 else "models/").load()
+    for loaded in registry.bundles.values():
+        try:
+            ensemble = compile_bundle(loaded)
+            print(f"✅ Compiled {loaded.name} ({ensemble.engine}) -> {ensemble.library_path}")
+        except CompilationError as e:
+            print(f"⚠️ Skipped {loaded.name}: {e}")
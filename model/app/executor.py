@@ -0,0 +1,128 @@
+"""
+Bounded thread pool for CPU-bound inference.
+
+Scoring runs on a fixed number of worker threads instead of Starlette's
+default pool. Requests beyond the workers wait in a bounded queue; when the
+queue is full new work is rejected right away so the API can answer 503
+rather than pile up latency. Queue wait and compute time are recorded
+separately for every task.
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", min(4, os.cpu_count() or 1)))
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", 64))
+# OpenMP threads each booster may use per call; workers * threads should not exceed the cores
+INFERENCE_THREADS_PER_WORKER = int(os.getenv("INFERENCE_THREADS_PER_WORKER", 1))
+
+_SAMPLE_WINDOW = 2048
+
+
+class ExecutorSaturated(Exception):
+    """Every worker is busy and the wait queue is full."""
+
+
+@dataclass
+class TaskTiming:
+    queue_wait_ms: float
+    compute_ms: float
+
+
+def summarize(samples) -> Dict[str, float]:
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    values = np.fromiter(samples, dtype=np.float64, count=len(samples))
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"mean": float(values.mean()), "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+
+class InferenceExecutor:
+    def __init__(self, workers: int = INFERENCE_WORKERS, queue_size: int = INFERENCE_QUEUE_SIZE,
+                 threads_per_worker: int = INFERENCE_THREADS_PER_WORKER):
+        self.workers = max(workers, 1)
+        self.queue_size = max(queue_size, 0)
+        self.threads_per_worker = threads_per_worker
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._queue_wait_ms = deque(maxlen=_SAMPLE_WINDOW)
+        self._compute_ms = deque(maxlen=_SAMPLE_WINDOW)
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    def _reserve(self):
+        with self._lock:
+            if self._pending >= self.capacity:
+                self.rejected += 1
+                raise ExecutorSaturated(
+                    f"Inference queue is full ({self.workers} workers, {self.queue_size} queued)"
+                )
+            self._pending += 1
+
+    def _release(self, timing: Optional[TaskTiming]):
+        with self._lock:
+            self._pending -= 1
+            if timing is not None:
+                self.completed += 1
+                self._queue_wait_ms.append(timing.queue_wait_ms)
+                self._compute_ms.append(timing.compute_ms)
+
+    async def run(self, fn: Callable[..., Any], *args) -> "tuple[Any, TaskTiming]":
+        """
+        Run `fn(*args)` on a worker thread and return (result, timing).
+
+        Raises ExecutorSaturated without queueing if the executor is full.
+        """
+        self._reserve()
+        submitted = perf_counter()
+        timing = None
+
+        def task():
+            # The slot is released by the worker, so a cancelled caller
+            # cannot free it while the scoring is still running
+            nonlocal timing
+            started = perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                timing = TaskTiming(
+                    queue_wait_ms=(started - submitted) * 1000,
+                    compute_ms=(perf_counter() - started) * 1000,
+                )
+                self._release(timing)
+
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._pool, task)
+        except Exception:
+            self._release(None)
+            raise
+        result = await future
+        return result, timing
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "threads_per_worker": self.threads_per_worker,
+                "queue_size": self.queue_size,
+                "in_flight": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_ms": summarize(self._queue_wait_ms),
+                "compute_ms": summarize(self._compute_ms),
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,76 @@
+"""
+Precomputed feature layout for a single booster.
+
+A FeatureSchema is built once when a bundle is loaded and packs feature
+dicts or columns straight into a float32 matrix in the booster's column
+order, filling anything not supplied with the bundle's training medians.
+Features supplied as None (or masked) are packed as NaN, which both
+boosters treat as missing.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class FeatureSchema:
+    names: Tuple[str, ...]
+    index: Dict[str, int]
+    defaults: np.ndarray
+    dtype: type = np.float32
+
+    @classmethod
+    def build(cls, features: Sequence[str], medians: Optional[Mapping[str, float]] = None):
+        medians = medians or {}
+        names = tuple(features)
+        defaults = np.array([float(medians.get(f, 0) or 0) for f in names], dtype=np.float32)
+        defaults.setflags(write=False)
+        return cls(names=names, index={f: i for i, f in enumerate(names)}, defaults=defaults)
+
+    @property
+    def width(self) -> int:
+        return len(self.names)
+
+    def allocate(self, n_rows: int) -> np.ndarray:
+        """A C-contiguous (n_rows, width) buffer pre-filled with default values."""
+        out = np.empty((n_rows, self.width), dtype=self.dtype)
+        out[:] = self.defaults
+        return out
+
+    def pack(self, rows: Sequence[Mapping[str, float]], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Pack feature dicts into rows of a float32 matrix; None values become NaN."""
+        if out is None:
+            out = self.allocate(len(rows))
+        index = self.index
+        for r, feats in enumerate(rows):
+            for name, value in feats.items():
+                col = index.get(name)
+                if col is not None:
+                    out[r, col] = np.nan if value is None else value
+        return out
+
+    def pack_columns(self, columns: Mapping[str, object], n_rows: int,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Pack a column block (name -> array of n_rows, or scalar) into a float32
+        matrix. A None scalar and masked entries of a numpy.ma array become NaN.
+        """
+        if out is None:
+            out = self.allocate(n_rows)
+        for name, col in self.index.items():
+            if name not in columns:
+                continue
+            values = columns[name]
+            if values is None:
+                out[:, col] = np.nan
+            elif isinstance(values, np.ma.MaskedArray):
+                out[:, col] = np.where(np.ma.getmaskarray(values), np.nan, values.data)
+            else:
+                out[:, col] = values
+        return out
+
+    def missing(self, supplied: Iterable[str]) -> List[str]:
+        """Features this booster expects that are absent from `supplied`."""
+        supplied = set(supplied)
+        return [f for f in self.names if f not in supplied]
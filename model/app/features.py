@@ -0,0 +1,281 @@
+"""
+Feature pipeline shared by serving and training-time export.
+
+Every feature is a named, versioned FeatureDefinition. The daily cumulative
+metrics of a request are turned into NumPy arrays once and every per-day
+feature is computed with array ops over the whole history; video- and
+channel-level features are memoized on their inputs so repeated forecasts
+for the same video only recompute the daily part.
+
+Serving scores the raw SERVING_FEATURES as a column-oriented FeatureBlock;
+export_features applies each definition's log1p transform on top of the
+same values for training data.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from app.models import PredictionRequest
+
+
+@dataclass(frozen=True)
+class FeatureDefinition:
+    name: str
+    scope: str  # "daily", "video" or "channel"
+    version: int = 1
+    log1p: bool = False  # applied by export_features only
+    description: str = ""
+
+
+FEATURE_DEFINITIONS = [
+    FeatureDefinition("t", "daily", description="Day index since publishing"),
+    FeatureDefinition("views_cml_t", "daily", log1p=True, description="Cumulative views"),
+    FeatureDefinition("likes_cml_t", "daily", log1p=True, description="Cumulative likes"),
+    FeatureDefinition("comments_cml_t", "daily", log1p=True, description="Cumulative comments"),
+    FeatureDefinition("views_dif_last1", "daily", log1p=True,
+                      description="Views gained since the previous day (0 if that day is missing)"),
+    FeatureDefinition("views_dif_last3_mean", "daily", log1p=True,
+                      description="Mean of the available daily gains over the last 3 days"),
+    FeatureDefinition("growth_ratio_t", "daily", log1p=True,
+                      description="Cumulative views relative to day-1 views"),
+    FeatureDefinition("likes_comments_views_t", "daily", log1p=True,
+                      description="(likes + comments) per cumulative view"),
+    FeatureDefinition("weekday", "video", description="Publishing weekday (0 = Monday)"),
+    FeatureDefinition("hour_bin", "video", description="Publishing hour // 6 (4 bins)"),
+    FeatureDefinition("is_short", "video", description="1 for short-form videos"),
+    FeatureDefinition("video_duration_seconds", "video", description="Video duration"),
+    FeatureDefinition("title_pca2", "video", description="2nd PCA component of the title embedding"),
+    FeatureDefinition("sharpness", "video", description="Thumbnail variance of Laplacian"),
+    FeatureDefinition("colorfulness", "video", description="Thumbnail color vibrancy"),
+    FeatureDefinition("channel_subs", "channel", description="Channel subscribers"),
+    FeatureDefinition("channel_total_views", "channel", description="Channel lifetime views"),
+    FeatureDefinition("channel_no_of_videos", "channel", description="Channel video count"),
+    FeatureDefinition("virality_t", "channel", log1p=True,
+                      description="Channel reach relative to the category leader"),
+]
+DEFINITIONS = {d.name: d for d in FEATURE_DEFINITIONS}
+
+# Features the forecast service feeds to the boosters
+SERVING_FEATURES = (
+    "t", "views_cml_t", "likes_cml_t", "comments_cml_t",
+    "views_dif_last1", "views_dif_last3_mean", "growth_ratio_t",
+    "weekday", "hour_bin", "is_short",
+    "video_duration_seconds", "title_pca2", "sharpness", "colorfulness",
+    "channel_subs", "channel_total_views", "channel_no_of_videos",
+)
+# Features written by the training-time export
+EXPORT_FEATURES = tuple(d.name for d in FEATURE_DEFINITIONS)
+
+FEATURE_SET_VERSION = "v1:" + ",".join(f"{d.name}@{d.version}" for d in FEATURE_DEFINITIONS)
+
+
+@dataclass
+class FeatureBlock:
+    """
+    Features for consecutive observed days, one entry per column.
+
+    Per-day features are 1-D arrays aligned with `days`; features that are the
+    same for every day (time context, metadata, channel) are stored as scalars.
+    """
+    days: np.ndarray
+    columns: Dict[str, object] = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.days)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns.keys())
+
+    def row(self, i: int) -> Dict[str, object]:
+        """Scalar features of the i-th observed day (0-based position)."""
+        return {
+            name: (values[i] if isinstance(values, np.ndarray) else values)
+            for name, values in self.columns.items()
+        }
+
+    def to_rows(self) -> List[Dict[str, object]]:
+        """One plain-Python feature dict per observed day."""
+        n = len(self.days)
+        expanded = {
+            name: (values.tolist() if isinstance(values, np.ndarray) else [values] * n)
+            for name, values in self.columns.items()
+        }
+        return [
+            {name: values[i] for name, values in expanded.items()}
+            for i in range(n)
+        ]
+
+
+def daily_arrays(request: PredictionRequest):
+    """Sorted day numbers and cumulative views/likes/comments as int64 arrays."""
+    if request.daily_series is not None:
+        return request.daily_series.arrays()
+
+    daily = {}
+    for k, v in (request.daily_metrics or {}).items():
+        try:
+            day = int(k)
+        except Exception:
+            # if the key is not coercible, skip it
+            continue
+        daily[day] = v
+
+    days = np.fromiter(sorted(daily), dtype=np.int64, count=len(daily))
+    views = np.fromiter((int(daily[d].views or 0) for d in days), dtype=np.int64, count=len(days))
+    likes = np.fromiter((int(daily[d].likes or 0) for d in days), dtype=np.int64, count=len(days))
+    comments = np.fromiter((int(daily[d].comments or 0) for d in days), dtype=np.int64, count=len(days))
+    return days, views, likes, comments
+
+
+@lru_cache(maxsize=4096)
+def video_static_features(video_type: str, published_at, duration_seconds,
+                          title_pca2, sharpness, colorfulness) -> Dict[str, object]:
+    """Features that are fixed for a video; memoized on their inputs."""
+    return {
+        # time context (published_at should already be parsed to datetime)
+        "weekday": published_at.weekday() if published_at is not None else 0,
+        "hour_bin": int(published_at.hour // 6) if published_at is not None else 0,
+        "is_short": 1 if video_type == "short" else 0,
+        "video_duration_seconds": duration_seconds,
+        "title_pca2": title_pca2,
+        "sharpness": sharpness,
+        "colorfulness": colorfulness,
+    }
+
+
+@lru_cache(maxsize=4096)
+def channel_features(subscribers, total_views, total_videos, leader=None) -> Dict[str, object]:
+    """
+    Channel context and virality factor; memoized on their inputs.
+
+    `leader` is (subscribers, total_views, total_videos) of the category leader.
+    """
+    if leader is not None:
+        leader_subs, leader_views, leader_videos = leader
+        subs_factor = ((subscribers + 1) / (total_views + 1)) / (
+            (leader_subs + 1) / (leader_views + 1)
+        )
+        video_factor = max(total_videos, 1) / leader_videos
+    else:
+        subs_factor = 1.0
+        video_factor = 1.0
+
+    return {
+        "channel_subs": subscribers,
+        "channel_total_views": total_views,
+        "channel_no_of_videos": total_videos,
+        "virality_t": subs_factor ** 4 * video_factor ** -3,
+    }
+
+
+def _static_columns(request: PredictionRequest) -> Dict[str, object]:
+    text = request.text_features
+    thumb = request.thumbnail_features
+    columns = dict(video_static_features(
+        request.video_type.value,
+        request.published_at,
+        # optional/enrichment features (safely default)
+        getattr(request.video_metadata, "duration_seconds", 0),
+        getattr(text, "title_pca2", 0) if text else 0,
+        getattr(thumb, "sharpness", 0) if thumb else 0,
+        getattr(thumb, "colorfulness", 0) if thumb else 0,
+    ))
+
+    channel = request.channel_info
+    leader = request.category_leader
+    columns.update(channel_features(
+        getattr(channel, "subscribers", 0),
+        getattr(channel, "total_views", 0),
+        getattr(channel, "total_videos", 0),
+        (leader.subscribers, leader.total_views, leader.total_videos) if leader else None,
+    ))
+    return columns
+
+
+def build_feature_block(request: PredictionRequest,
+                        names: Sequence[str] = SERVING_FEATURES) -> FeatureBlock:
+    """
+    Compute the raw per-day feature block for a request, restricted to `names`.
+    """
+    days, views, likes, comments = daily_arrays(request)
+    if days.size == 0:
+        return FeatureBlock(days=days)
+
+    # Lay the observed days out on a dense grid so gaps are explicit
+    lo, hi = days[0], days[-1]
+    grid_days = np.arange(lo, hi + 1)
+    pos = days - lo
+    present = np.zeros(grid_days.size, dtype=bool)
+    present[pos] = True
+    grid_views = np.zeros(grid_days.size, dtype=np.int64)
+    grid_views[pos] = views
+
+    # A daily gain exists for day d >= 2 only if days d and d-1 were both observed
+    has_diff = np.zeros(grid_days.size, dtype=bool)
+    has_diff[1:] = present[1:] & present[:-1]
+    has_diff &= grid_days >= 2
+    diffs = np.zeros(grid_days.size, dtype=np.int64)
+    diffs[1:] = np.maximum(grid_views[1:] - grid_views[:-1], 0)
+    diffs[~has_diff] = 0
+
+    # Rolling 3-day sums of gains and of how many gains were available
+    diff_csum = np.concatenate(([0], np.cumsum(diffs)))
+    count_csum = np.concatenate(([0], np.cumsum(has_diff)))
+    lower = np.maximum(np.arange(grid_days.size) - 2, 0)
+    upper = np.arange(1, grid_days.size + 1)
+    window_sum = diff_csum[upper] - diff_csum[lower]
+    window_count = count_csum[upper] - count_csum[lower]
+    last3_mean = np.divide(
+        window_sum, window_count,
+        out=np.zeros(grid_days.size, dtype=np.float64),
+        where=window_count > 0,
+    )
+
+    # growth_ratio_t: views_cml_t / max(day1_views, 1)
+    day1_views = int(views[0]) if days[0] == 1 else None
+    denom = max(day1_views or 1, 1)
+
+    columns = {
+        "t": days,
+        "views_cml_t": views,
+        "likes_cml_t": likes,
+        "comments_cml_t": comments,
+        "views_dif_last1": diffs[pos],
+        "views_dif_last3_mean": last3_mean[pos],
+        "growth_ratio_t": views / float(denom),
+        "likes_comments_views_t": (likes + comments) / np.maximum(views, 1),
+    }
+    columns.update(_static_columns(request))
+    return FeatureBlock(days=days, columns={name: columns[name] for name in names})
+
+
+def export_features(request: PredictionRequest,
+                    names: Sequence[str] = EXPORT_FEATURES) -> Dict[str, float]:
+    """
+    Training-time feature row for `request.current_day`, with each
+    definition's log1p transform applied.
+    """
+    block = build_feature_block(request, names)
+    matches = np.flatnonzero(block.days == request.current_day)
+    if matches.size == 0:
+        raise ValueError(f"No daily metrics for current_day {request.current_day}")
+
+    row = block.row(int(matches[0]))
+    return {
+        name: (
+            float(np.log1p(value)) if DEFINITIONS[name].log1p
+            else value.item() if isinstance(value, np.generic) else value
+        )
+        for name, value in row.items()
+    }
+
+
+def feature_cache_info() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters of the memoized video and channel feature stages."""
+    return {
+        "video_static": video_static_features.cache_info()._asdict(),
+        "channel": channel_features.cache_info()._asdict(),
+    }
@@ -0,0 +1,157 @@
+"""
+Horizon simulation: the future feature grid a forecast is scored on.
+
+The last observed day of every video is stacked into column arrays, and the
+rows for all future offsets of all videos are generated at once: day
+indices are offset, cumulative counts are scaled by the video type's growth
+curve, and every other feature is carried forward.
+
+By default the whole horizon is extrapolated open-loop from the last
+observed day. With a rollout step, the horizon is instead simulated in
+blocks of `step` days. After each block the predicted views are fed back as
+the new cumulative views, with likes and comments scaled to match and the
+daily-gain and growth features recomputed, before the next block is
+generated.
+"""
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+CUMULATIVE_FEATURES = ("views_cml_t", "likes_cml_t", "comments_cml_t")
+
+# Days per autoregressive rollout block; 0 extrapolates the whole horizon open-loop
+HORIZON_ROLLOUT_STEP = int(os.getenv("HORIZON_ROLLOUT_STEP", 0))
+
+Columns = Dict[str, object]
+GrowthCurve = Callable[[np.ndarray], np.ndarray]
+
+
+@dataclass(frozen=True)
+class CompoundGrowth:
+    """Cumulative counts grow by a fixed daily rate: (1 + rate) ** offset."""
+    daily_rate: float = 0.02
+
+    def __call__(self, offsets: np.ndarray) -> np.ndarray:
+        return (1.0 + self.daily_rate) ** offsets
+
+
+DEFAULT_GROWTH = CompoundGrowth()
+GROWTH_CURVES: Dict[str, GrowthCurve] = {
+    "all": DEFAULT_GROWTH,
+    "short": DEFAULT_GROWTH,
+    "long": DEFAULT_GROWTH,
+}
+
+
+def register_growth_curve(video_type: str, curve: GrowthCurve):
+    """Use `curve(offsets) -> multipliers` to extrapolate cumulative counts for `video_type`."""
+    GROWTH_CURVES[video_type] = curve
+
+
+def growth_curve(video_type: str) -> GrowthCurve:
+    return GROWTH_CURVES.get(video_type, DEFAULT_GROWTH)
+
+
+def stack_bases(bases: Sequence[Mapping[str, object]]) -> Dict[str, np.ndarray]:
+    """
+    Column arrays (one entry per video) from per-video base feature dicts.
+
+    Features that are None for some videos become masked entries, which the
+    feature schema packs as NaN (missing) like a None in a feature dict.
+    """
+    stacked = {}
+    for name in bases[0]:
+        values = [base.get(name) for base in bases]
+        missing = [v is None for v in values]
+        if any(missing):
+            filled = np.array([0 if v is None else v for v in values])
+            stacked[name] = np.ma.masked_array(filled, mask=missing)
+        else:
+            stacked[name] = np.array(values)
+    return stacked
+
+
+def future_grid(base: Mapping[str, np.ndarray], current_days: np.ndarray, horizon_days: int,
+                curve: GrowthCurve = DEFAULT_GROWTH) -> Tuple[Columns, int]:
+    """
+    Feature columns for days current_day+1 .. current_day+horizon_days of every
+    video in `base`, video-major (all days of the first video, then the next).
+
+    Returns (columns, n_rows). With a single video, carried-forward features
+    stay scalars and are broadcast when packed.
+    """
+    n = len(current_days)
+    offsets = np.arange(1, horizon_days + 1)
+    growth = curve(offsets)
+
+    columns: Columns = {}
+    for name, values in base.items():
+        if name in CUMULATIVE_FEATURES:
+            columns[name] = (values[:, None] * growth).reshape(-1)
+        elif n == 1 and not np.ma.is_masked(values):
+            columns[name] = values[0]
+        else:
+            columns[name] = values.repeat(horizon_days)
+    columns["t"] = (np.asarray(current_days)[:, None] + offsets).reshape(-1)
+    return columns, n * horizon_days
+
+
+def _feed_back(base: Dict[str, np.ndarray], predicted_views: np.ndarray):
+    """Advance each video's base features to the last day of a scored block."""
+    last_views = base["views_cml_t"].astype(np.float64)
+    new_views = np.maximum(predicted_views[:, -1], last_views)  # cumulative views never drop
+    ratio = np.divide(new_views, last_views, out=np.ones_like(new_views), where=last_views > 0)
+
+    if "growth_ratio_t" in base:
+        growth_ratio = base["growth_ratio_t"].astype(np.float64)
+        day1_views = np.divide(last_views, growth_ratio, out=np.ones_like(last_views), where=growth_ratio > 0)
+        base["growth_ratio_t"] = new_views / np.maximum(day1_views, 1.0)
+    for name in ("likes_cml_t", "comments_cml_t"):
+        if name in base:
+            base[name] = base[name] * ratio
+
+    path = np.maximum.accumulate(np.column_stack([last_views, predicted_views]), axis=1)
+    gains = np.diff(path, axis=1)
+    if "views_dif_last1" in base:
+        base["views_dif_last1"] = gains[:, -1]
+    if "views_dif_last3_mean" in base:
+        base["views_dif_last3_mean"] = gains[:, -3:].mean(axis=1)
+    base["views_cml_t"] = new_views
+
+
+def rollout(score: Callable[[Columns, int], tuple], base: Mapping[str, np.ndarray],
+            current_days: np.ndarray, horizon_days: int, step: int,
+            curve: GrowthCurve = DEFAULT_GROWTH) -> tuple:
+    """
+    Score the horizon in blocks of `step` days, feeding predictions back.
+
+    `score(columns, n_rows)` returns a tuple of log-space prediction arrays
+    (entries may be None); the result has the same shape, with all
+    horizon_days rows of each video in order, video-major.
+    """
+    base = {name: values.copy() for name, values in base.items()}
+    days = np.asarray(current_days)
+    n = len(days)
+    blocks: List[tuple] = []
+    done = 0
+    while done < horizon_days:
+        k = min(step, horizon_days - done)
+        columns, rows = future_grid(base, days, k, curve)
+        scores = score(columns, rows)
+        if scores[0] is None:
+            return scores
+        blocks.append(scores)
+        done += k
+        if done < horizon_days and "views_cml_t" in base:
+            _feed_back(base, np.expm1(scores[0]).reshape(n, k))
+        days = days + k
+
+    def join(i) -> Optional[np.ndarray]:
+        parts = [b[i] for b in blocks]
+        if any(p is None for p in parts):
+            return None
+        return np.concatenate([p.reshape(n, -1) for p in parts], axis=1).reshape(-1)
+
+    return tuple(join(i) for i in range(len(blocks[0])))
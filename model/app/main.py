@@ -1,15 +1,42 @@
-from fastapi import FastAPI, HTTPException
+# Import time of the service modules is reported by /ready
+from time import perf_counter
+_import_start = perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from collections import defaultdict
 from datetime import datetime
+from typing import Optional
 from app.models import (
-    PredictionRequest, PredictionResponse, PredictionResult,
-    HealthResponse
+    Horizon, VideoType, PredictionRequest, PredictionResponse, PredictionResult,
+    BatchPredictionRequest, BatchGroupResult, BatchItemError,
+    HealthResponse, ReloadResponse, StartupReport
 )
-from app.feature_engineer import FeatureEngineer
+from app import columnar, metrics
+from app.batcher import MICROBATCH_ENABLED, MicroBatcher
+from app.cache import PredictionCache, request_fingerprint
+from app.executor import ExecutorSaturated, InferenceExecutor
+from app.features import FeatureBlock, build_feature_block
 from app.predictor import HybridPredictor
-import numpy as np
+from app.profiling import maybe_profile
+from app.reloader import ADMIN_TOKEN, ModelReloader
+from app.startup import StartupState
+from app.utils import current_memory_usage
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so /health answers while /ready is still 503
+    warm_task = asyncio.create_task(startup.run(predictor, inference_executor))
+    reloader.start_watching()
+    yield
+    reloader.stop_watching()
+    warm_task.cancel()
 
-app = FastAPI(title="ViewTrendSL - Forecast API", version="1.0.0")
+app = FastAPI(title="ViewTrendSL - Forecast API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,8 +45,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics.StageTimingMiddleware)
 
-predictor = HybridPredictor()
+inference_executor = InferenceExecutor()
+predictor = HybridPredictor(booster_threads=inference_executor.threads_per_worker)
+prediction_cache = PredictionCache()
+reloader = ModelReloader(predictor)
+startup = StartupState(import_ms=(perf_counter() - _import_start) * 1000)
 
 @app.get("/health", response_model=HealthResponse)
 def health():
@@ -27,124 +59,299 @@ def health():
         status="ok",
         message="Service is running",
         timestamp=datetime.utcnow(),
-        models_status={f"{k[0]}_{k[1]}": True for k in predictor.models.keys()}
+        models_status=predictor.registry.status(),
+        models_errors=predictor.registry.errors(),
+        models_info=predictor.registry.info(),
+        process_memory=current_memory_usage(),
+        cache=prediction_cache.stats(),
+        executor=inference_executor.stats(),
+        micro_batching=micro_batcher.stats() if micro_batcher else None,
+        registry={
+            "generation": predictor.registry.generation,
+            "model_dir": predictor.registry.model_dir,
+            "created_at": predictor.registry.created_at,
+            "last_reload": reloader.last_reload,
+        },
+        startup=startup.report()
     )
 
+@app.get("/ready", response_model=StartupReport, responses={503: {"model": StartupReport}})
+def ready():
+    """Readiness probe: 503 until every bundle has been loaded and warmed."""
+    report = startup.report()
+    if not report["ready"]:
+        return JSONResponse(status_code=503, content=StartupReport(**report).model_dump(mode="json"))
+    return report
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Per-stage and end-to-end forecast latency histograms in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.post("/admin/reload", response_model=ReloadResponse)
+async def reload_models(force: bool = False, x_admin_token: str = Header(None)):
+    """
+    Load the model directory into a new registry, warm it and swap it in.
+    Disabled unless ADMIN_TOKEN is set.
+    """
+    if not ADMIN_TOKEN or x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    result = await run_in_threadpool(reloader.reload, force)
+    if result["status"] == "failed":
+        raise HTTPException(status_code=500, detail=result["detail"])
+    return result
+
 @app.post("/predict", response_model=PredictionResponse)
-def predict_views(request: PredictionRequest):
-    predictor = HybridPredictor("models/")
+async def predict_views(request: PredictionRequest, response: Response, http_request: Request):
+    labels = (request.horizon.value, request.video_type.value)
+    # Serialization and the end-to-end time are observed by metrics.StageTimingMiddleware
+    http_request.state.stage_labels = labels
+    metrics.observe_stage("parse", *labels, metrics.parse_seconds(http_request))
 
-    # Convert your request.daily_metrics (dict of day → DailyMetrics)
-    # into a list of feature dictionaries (one per day)
-    daily_features_list = build_features_series(request)
+    # The whole request uses one registry snapshot, even if a reload swaps it meanwhile
+    registry = predictor.registry
 
-    preds = predictor.predict_series(
-        daily_features_list,
-        horizon=request.horizon.value,
-        video_type=request.video_type.value,
-        current_day=request.current_day
+    # Identical requests against the same bundle version reuse the cached forecast.
+    # A bundle that is not loaded yet is loaded on the inference pool, uncached,
+    # so the load never blocks the event loop
+    bundle = registry.loaded(request.horizon.value, request.video_type.value)
+    cache_key = None
+    if bundle is not None and prediction_cache.enabled:
+        cache_key = request_fingerprint(request, bundle)
+        cached = prediction_cache.get(cache_key)
+        if cached is not None:
+            response.headers["X-Cache"] = "HIT"
+            http_request.state.handled_at = perf_counter()
+            return cached
+
+    # Scoring is CPU-bound: run it on the bounded inference pool, off the event loop,
+    # coalesced with concurrent requests for the same bundle when micro-batching is on
+    try:
+        if micro_batcher is not None:
+            result, timing = await micro_batcher.submit(
+                (registry, request.horizon.value, request.video_type.value), request
+            )
+            response.headers["X-Batch-Size"] = str(timing.batch_size)
+            response.headers["X-Batch-Wait-Ms"] = f"{timing.batch_wait_ms:.3f}"
+        else:
+            result, timing = await inference_executor.run(forecast, request, registry)
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    response.headers["X-Queue-Wait-Ms"] = f"{timing.queue_wait_ms:.3f}"
+    response.headers["X-Compute-Ms"] = f"{timing.compute_ms:.3f}"
+    metrics.observe_stage("queue", *labels, timing.queue_wait_ms / 1000)
+
+    if cache_key is not None:
+        prediction_cache.put(cache_key, result)
+        response.headers["X-Cache"] = "MISS"
+    http_request.state.handled_at = perf_counter()
+    return result
+
+def forecast(request: PredictionRequest, registry) -> PredictionResponse:
+    with maybe_profile("predict"):
+        # Convert request.daily_metrics (dict of day → DailyMetrics)
+        # into a column-oriented block of per-day features
+        with metrics.stage("features", request.horizon.value, request.video_type.value):
+            feature_block = build_feature_block(request)
+
+        preds = predictor.predict_series(
+            feature_block,
+            horizon=request.horizon.value,
+            video_type=request.video_type.value,
+            current_day=request.current_day,
+            registry=registry
+        )
+
+        return to_response(request, preds, feature_block, registry)
+
+def forecast_group(key, requests):
+    """Score micro-batched requests for one bundle; per-request failures are returned, not raised."""
+    registry, horizon, video_type = key
+    with maybe_profile("predict-microbatch"):
+        with metrics.stage("features", horizon, video_type):
+            blocks = [build_feature_block(request) for request in requests]
+        outputs = predictor.predict_batch(
+            [(block, request.current_day) for block, request in zip(blocks, requests)],
+            horizon=horizon,
+            video_type=video_type,
+            registry=registry,
+        )
+        return [
+            preds if isinstance(preds, Exception) else to_response(request, preds, block, registry)
+            for request, block, preds in zip(requests, blocks, outputs)
+        ]
+
+micro_batcher = MicroBatcher(forecast_group, inference_executor) if MICROBATCH_ENABLED else None
+
+@app.post(
+    "/predict/batch",
+    response_class=StreamingResponse,
+    responses={200: {
+        "model": BatchGroupResult,
+        "description": "Newline-delimited JSON, one BatchGroupResult per (horizon, video_type) group",
+    }},
+)
+async def predict_views_batch(batch: BatchPredictionRequest):
+    """
+    Score many videos at once. Requests are grouped by model bundle, and each
+    group is scored with one feature matrix; groups are streamed back as NDJSON
+    lines as soon as they are done.
+
+    Groups are scored on the bounded inference pool like /predict: the batch
+    is answered 503 if the pool is full when its first group is submitted,
+    and a later group that finds it full is streamed back with every item
+    as an error.
+    """
+    registry = predictor.registry
+    groups = defaultdict(list)
+    for index, request in enumerate(batch.requests):
+        groups[(request.horizon.value, request.video_type.value)].append((index, request))
+    pending = iter(groups.items())
+
+    async def run_group(horizon, video_type, members) -> BatchGroupResult:
+        group, timing = await inference_executor.run(score_group, horizon, video_type, members, registry)
+        metrics.observe_stage("queue", horizon, video_type, timing.queue_wait_ms / 1000)
+        return group
+
+    def serialize(group: BatchGroupResult) -> str:
+        with metrics.stage("serialize", group.horizon, group.video_type):
+            return group.model_dump_json() + "\n"
+
+    # The first group is scored before answering, so a saturated pool is still a 503
+    (horizon, video_type), members = next(pending)
+    try:
+        first = await run_group(horizon, video_type, members)
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+    async def stream():
+        yield serialize(first)
+        for (horizon, video_type), members in pending:
+            try:
+                group = await run_group(horizon, video_type, members)
+            except ExecutorSaturated as e:
+                group = unscored_group(horizon, video_type, members, str(e))
+            yield serialize(group)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post(
+    "/predict/arrow",
+    response_class=Response,
+    responses={
+        200: {
+            "content": {columnar.ARROW_STREAM_MEDIA_TYPE: {}},
+            "description": "Arrow IPC stream, one row per video and forecast day (see app.columnar)",
+        },
+        422: {"description": "The upload is not a table with the expected columns"},
+        501: {"description": "pyarrow is not installed"},
+    },
+)
+async def predict_views_arrow(http_request: Request, horizon: Optional[Horizon] = None,
+                              video_type: Optional[VideoType] = None):
+    """
+    Bulk forecasting from a columnar upload: an Arrow IPC stream (default) or
+    file, or a Parquet file, selected by Content-Type, with one row per
+    video. `horizon` and `video_type` apply to rows without those columns.
+    """
+    if not columnar.available():
+        raise HTTPException(status_code=501, detail="pyarrow is not installed")
+    body = await http_request.body()
+    media_type = http_request.headers.get("content-type", columnar.ARROW_STREAM_MEDIA_TYPE).split(";")[0].strip()
+    try:
+        payload, timing = await inference_executor.run(
+            score_arrow, body, media_type, predictor.registry,
+            horizon.value if horizon else None, video_type.value if video_type else None,
+        )
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except columnar.ColumnarInputError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return Response(
+        payload,
+        media_type=columnar.ARROW_STREAM_MEDIA_TYPE,
+        headers={"X-Queue-Wait-Ms": f"{timing.queue_wait_ms:.3f}", "X-Compute-Ms": f"{timing.compute_ms:.3f}"},
     )
 
+def score_arrow(body: bytes, media_type: str, registry, horizon: Optional[str], video_type: Optional[str]) -> bytes:
+    with maybe_profile("predict-arrow"):
+        return columnar.score_upload(predictor, body, media_type, registry, horizon, video_type)
+
+def score_group(horizon: str, video_type: str, members, registry) -> BatchGroupResult:
+    """Score one bundle's worth of (index, PredictionRequest) pairs together."""
+    with maybe_profile("predict-batch"):
+        start = perf_counter()
+        items = [(build_feature_block(request), request.current_day) for _, request in members]
+        feature_ms = (perf_counter() - start) * 1000
+        metrics.observe_stage("features", horizon, video_type, feature_ms / 1000)
+
+        start = perf_counter()
+        errors = []
+        try:
+            outputs = predictor.predict_batch(items, horizon=horizon, video_type=video_type, registry=registry)
+        except ValueError as e:
+            outputs = [e] * len(members)
+        inference_ms = (perf_counter() - start) * 1000
+
+        predictions = []
+        for (index, request), (feature_block, _), preds in zip(members, items, outputs):
+            if isinstance(preds, Exception):
+                errors.append(BatchItemError(index=index, video_id=request.video_id, detail=str(preds)))
+            else:
+                predictions.append(to_response(request, preds, feature_block, registry))
+
+        return BatchGroupResult(
+            horizon=horizon,
+            video_type=video_type,
+            size=len(members),
+            feature_ms=feature_ms,
+            inference_ms=inference_ms,
+            predictions=predictions,
+            errors=errors,
+        )
+
+def unscored_group(horizon: str, video_type: str, members, detail: str) -> BatchGroupResult:
+    """A group whose (index, PredictionRequest) pairs all failed with `detail`."""
+    return BatchGroupResult(
+        horizon=horizon,
+        video_type=video_type,
+        size=len(members),
+        feature_ms=0.0,
+        inference_ms=0.0,
+        predictions=[],
+        errors=[BatchItemError(index=index, video_id=request.video_id, detail=detail) for index, request in members],
+    )
+
+def to_response(request: PredictionRequest, preds, feature_block: FeatureBlock, registry) -> PredictionResponse:
+    bundle = registry.get(request.horizon.value, request.video_type.value)
+    supplied = feature_block.names if len(feature_block) else ()
     return PredictionResponse(
         video_id=request.video_id,
         horizon=request.horizon.value,
         video_type=request.video_type.value,
         current_day=request.current_day,
         predictions=[
-            PredictionResult(day=p["day"], predicted_views=p["predicted"])
+            PredictionResult(
+                day=p["day"],
+                predicted_views=p["predicted"],
+                confidence_interval_lower=p["lower"],
+                confidence_interval_upper=p["upper"],
+            )
             for p in preds
         ],
-        model_used=f"hybrid_{request.horizon.value}_{request.video_type.value}",
+        model_used=(
+            bundle.model_id if bundle else f"hybrid_{request.horizon.value}_{request.video_type.value}"
+        ),
         hybrid_weights=preds[-1]["weights"] if preds else None,
+        missing_features=bundle.feature_report(supplied) if bundle else None,
         processing_time_ms=sum(p["elapsed_ms"] for p in preds)
     )
 
 def build_features_series(request: PredictionRequest):
     """
     Convert Pydantic request into a list of per-day feature dicts (ordered by day).
-    - Handles JSON keys (strings) by coercing to int.
-    - Computes diffs / last-3-mean robustly.
-    - Uses hour_bin = hour // 6 (4 bins). Change divisor to 3 if you want 3-hour bins.
+
+    Kept for callers that want row dicts; the service itself scores the
+    column-oriented block from app.features.build_feature_block.
     """
-    # normalize daily_metrics keys to int (some clients send JSON keys as strings)
-    raw_daily = request.daily_metrics or {}
-    daily_metrics = {}
-    for k, v in raw_daily.items():
-        try:
-            dk = int(k)
-        except Exception:
-            # if the key is not coercible, skip it
-            continue
-        daily_metrics[dk] = v
-
-    if not daily_metrics:
-        return []
-
-    # ensure we have day 1 baseline if possible
-    day1_views = daily_metrics.get(1).views if 1 in daily_metrics else None
-
-    features_list = []
-    days_sorted = sorted(daily_metrics.keys())
-
-    for day in days_sorted:
-        metrics = daily_metrics[day]
-        views_t = int(metrics.views or 0)
-        likes_t = int(metrics.likes or 0)
-        comments_t = int(metrics.comments or 0)
-
-        # views_dif_last1
-        if day > 1 and (day - 1) in daily_metrics:
-            prev_views = int(daily_metrics[day - 1].views or 0)
-            views_dif_last1 = max(views_t - prev_views, 0)
-        else:
-            views_dif_last1 = 0
-
-        # views_dif_last3_mean: mean of up to last-3 diffs ending at 'day'
-        diffs = []
-        start = max(2, day - 2)  # start day for diffs (day 2..day)
-        for d in range(start, day + 1):
-            if d in daily_metrics and (d - 1) in daily_metrics:
-                cur = int(daily_metrics[d].views or 0)
-                prev = int(daily_metrics[d - 1].views or 0)
-                diffs.append(max(cur - prev, 0))
-        views_dif_last3_mean = float(np.mean(diffs)) if diffs else 0.0
-
-        # growth_ratio_t: views_cml_t / max(day1_views, 1)
-        denom = max(day1_views or 1, 1)
-        growth_ratio_t = float(views_t) / float(denom)
-
-        # time context (published_at should already be parsed to datetime)
-        pub = request.published_at
-        weekday = pub.weekday() if pub is not None else 0
-
-        # hour_bin: 4 bins (0..3) by 6-hour blocks. Change to //3 for 3-hour bins.
-        hour_bin = int(pub.hour // 6) if pub is not None else 0
-
-        # is_short: infer or use provided
-        is_short_flag = 1 if request.video_type.value == "short" else 0
-
-        feats = {
-            "t": day,
-            "views_cml_t": views_t,
-            "likes_cml_t": likes_t,
-            "comments_cml_t": comments_t,
-            "views_dif_last1": views_dif_last1,
-            "views_dif_last3_mean": views_dif_last3_mean,
-            "growth_ratio_t": growth_ratio_t,
-            "weekday": weekday,
-            "hour_bin": hour_bin,
-            "is_short": is_short_flag,
-            # optional/enrichment features (safely default)
-            "video_duration_seconds": getattr(request.video_metadata, "duration_seconds", 0),
-            "title_pca2": getattr(request.text_features, "title_pca2", 0) if request.text_features else 0,
-            "sharpness": getattr(request.thumbnail_features, "sharpness", 0) if request.thumbnail_features else 0,
-            "colorfulness": getattr(request.thumbnail_features, "colorfulness", 0) if request.thumbnail_features else 0,
-            # channel/context fields (if you want to include them; safe defaults)
-            "channel_subs": getattr(request.channel_info, "subscribers", 0),
-            "channel_total_views": getattr(request.channel_info, "total_views", 0),
-            "channel_no_of_videos": getattr(request.channel_info, "total_videos", 0),
-        }
-
-        features_list.append(feats)
-
-    return features_list
+    return build_feature_block(request).to_rows()
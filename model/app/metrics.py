@@ -0,0 +1,144 @@
+"""
+Per-stage latency histograms in the Prometheus text format.
+
+Every stage of a forecast (request parsing, inference queue wait, feature
+building, matrix packing, each model call, blending, response
+serialization) is observed into `forecast_stage_seconds`, labelled with the
+stage and the bundle's horizon and video_type; whole /predict requests go
+into `forecast_request_seconds`. Stages inside the predictor are observed
+once per scoring pass, so a micro-batch or a rollout block counts once.
+
+The histograms are kept in-process and rendered by `render()` for the
+/metrics endpoint, so no client library is needed.
+"""
+import os
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterable, List, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Upper bounds in seconds; single-request stages are sub-millisecond, big batches take seconds
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """A labelled Prometheus histogram with fixed buckets."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str],
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labels: str):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += seconds
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total!r}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+STAGE_SECONDS = Histogram(
+    "forecast_stage_seconds",
+    "Time spent in each forecast stage.",
+    ("stage", "horizon", "video_type"),
+)
+REQUEST_SECONDS = Histogram(
+    "forecast_request_seconds",
+    "End-to-end /predict latency, from receiving the request to the start of the response.",
+    ("horizon", "video_type"),
+)
+
+
+def observe_stage(stage: str, horizon: str, video_type: str, seconds: float):
+    if METRICS_ENABLED:
+        STAGE_SECONDS.observe(seconds, stage, horizon, video_type)
+
+
+@contextmanager
+def stage(name: str, horizon: str, video_type: str):
+    """Time the enclosed block as one observation of stage `name`."""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(name, horizon, video_type, perf_counter() - start)
+
+
+def render() -> str:
+    return "\n".join(STAGE_SECONDS.render() + REQUEST_SECONDS.render()) + "\n"
+
+
+class StageTimingMiddleware:
+    """
+    ASGI middleware that times the parts of a request outside the handler.
+
+    It stores the arrival time in the request state. A handler that sets
+    `request.state.stage_labels = (horizon, video_type)` and
+    `request.state.handled_at` gets its parse/validate stage (arrival to
+    handler entry, see `parse_seconds`), its serialize stage (handler return
+    to response start) and the whole request observed under those labels.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+
+        state = scope.setdefault("state", {})
+        state["received_at"] = perf_counter()
+
+        async def send_timed(message):
+            if message["type"] == "http.response.start" and "stage_labels" in state:
+                now = perf_counter()
+                labels = state["stage_labels"]
+                if "handled_at" in state:
+                    observe_stage("serialize", *labels, now - state["handled_at"])
+                REQUEST_SECONDS.observe(now - state["received_at"], *labels)
+            await send(message)
+
+        await self.app(scope, receive, send_timed)
+
+
+def parse_seconds(request) -> float:
+    """Time between the request arriving and the handler running (body read and validation)."""
+    received_at = getattr(request.state, "received_at", None)
+    return perf_counter() - received_at if received_at is not None else 0.0
@@ -0,0 +1,141 @@
+"""
+Native on-disk format for hybrid bundles.
+
+`export_bundle` turns a hybrid_{horizon}_{video_type}.joblib pickle into a
+directory of the same name holding the boosters in their own formats plus
+the rest of the bundle as JSON:
+
+    hybrid_7d_all/
+        bundle.json      meta, blend, defaults, feature lists, medians
+        lightgbm.txt     LightGBM model text
+        xgboost.ubj      XGBoost UBJSON model
+        quantile_0.1.txt optional quantile models, one per alpha
+
+LightGBM and XGBoost read these files in native code straight into their
+own (C++) heaps, so no pickled copy of the boosters ever lives on the
+Python heap. Those pages are not touched by Python reference counting,
+which keeps them shared copy-on-write when the bundles are loaded in a
+parent process before workers fork (gunicorn --preload, MODELS_PRELOAD).
+
+Export with: python -m app.model_store [model_dir] [out_dir]
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict
+
+import joblib
+import lightgbm as lgb
+import xgboost as xgb
+
+BUNDLE_FILE = "bundle.json"
+BOOSTER_FILES = {"lightgbm": "lightgbm.txt", "xgboost": "xgboost.ubj"}
+STORE_FORMAT_VERSION = 1
+
+
+def _json_default(obj):
+    # NumPy scalars in medians and scalers
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def export_bundle(joblib_path: str, out_dir: str) -> str:
+    """Write the native store directory for one joblib bundle and return its path."""
+    bundle = joblib.load(joblib_path)
+    name = os.path.splitext(os.path.basename(joblib_path))[0]
+    target = os.path.join(out_dir, name)
+    os.makedirs(target, exist_ok=True)
+
+    manifest: Dict[str, Any] = {"store_format": STORE_FORMAT_VERSION}
+    for key, value in bundle.items():
+        if key in BOOSTER_FILES and isinstance(value, dict) and "booster" in value:
+            manifest[key] = _export_entry(value, target, BOOSTER_FILES[key])
+        elif key == "quantiles" and isinstance(value, dict):
+            manifest[key] = {
+                str(alpha): _export_entry(entry, target, f"quantile_{alpha}")
+                for alpha, entry in value.items()
+            }
+        else:
+            manifest[key] = value
+
+    # bundle.json is written last: its presence marks a complete export
+    tmp_path = os.path.join(target, f".tmp-{BUNDLE_FILE}")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, default=_json_default)
+    os.replace(tmp_path, os.path.join(target, BUNDLE_FILE))
+    return target
+
+
+def _export_entry(entry: Dict[str, Any], target: str, filename: str) -> Dict[str, Any]:
+    """Save entry["booster"] under `target` and return the entry with its file name instead."""
+    booster = entry["booster"]
+    if not filename.endswith((".txt", ".ubj")):
+        filename += ".ubj" if isinstance(booster, xgb.Booster) else ".txt"
+    # The suffix selects the save format, so keep it on the temporary name
+    tmp_path = os.path.join(target, f".tmp-{filename}")
+    booster.save_model(tmp_path)
+    os.replace(tmp_path, os.path.join(target, filename))
+    exported = {k: v for k, v in entry.items() if k != "booster"}
+    exported["model_file"] = filename
+    return exported
+
+
+def _load_entry(path: str, entry: Dict[str, Any]):
+    filename = entry.pop("model_file")
+    loader = _load_xgboost if filename.endswith(".ubj") else _load_lightgbm
+    entry["booster"] = loader(os.path.join(path, filename))
+
+
+def is_native_bundle(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, BUNDLE_FILE))
+
+
+def load_native_bundle(path: str) -> Dict[str, Any]:
+    """Load a store directory into the same dict shape as the joblib bundle."""
+    with open(os.path.join(path, BUNDLE_FILE)) as f:
+        bundle = json.load(f)
+    bundle.pop("store_format", None)
+
+    entries = [bundle.get(key) for key in BOOSTER_FILES]
+    entries.extend((bundle.get("quantiles") or {}).values())
+    for entry in entries:
+        if isinstance(entry, dict) and "model_file" in entry:
+            _load_entry(path, entry)
+    return bundle
+
+
+def _load_lightgbm(path: str):
+    return lgb.Booster(model_file=path)
+
+
+def _load_xgboost(path: str):
+    booster = xgb.Booster()
+    booster.load_model(path)
+    return booster
+
+
+def native_checksum(path: str) -> str:
+    """SHA-256 over every file of a store directory, in name order."""
+    digest = hashlib.sha256()
+    for filename in sorted(os.listdir(path)):
+        if filename.startswith("."):
+            continue
+        digest.update(filename.encode())
+        with open(os.path.join(path, filename), "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+if __name__ == "__main__":
+    import sys
+
+    model_dir = sys.argv[1] if len(sys.argv) > 1 else "models/"
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else model_dir
+    for filename in sorted(os.listdir(model_dir)):
+        if filename.startswith("hybrid_") and filename.endswith(".joblib"):
+            try:
+                print(f"✅ Exported {filename} -> {export_bundle(os.path.join(model_dir, filename), out_dir)}")
+            except Exception as e:
+                print(f"⚠️ Failed to export {filename}: {e}")
@@ -1,11 +1,13 @@
 """
 Pydantic models for request/response validation
 """
-from pydantic import BaseModel, Field, validator
-from typing import Optional, Dict, List
+from pydantic import BaseModel, Field, model_validator, validator
+from typing import Annotated, Optional, Dict, List
 from datetime import datetime
 from enum import Enum
 
+import numpy as np
+
 
 class VideoType(str, Enum):
     ALL = "all"
@@ -25,6 +27,40 @@ class DailyMetrics(BaseModel):
     comments: int = Field(..., ge=0, description="Cumulative comments")
 
 
+class DailySeries(BaseModel):
+    """
+    Daily cumulative metrics as parallel arrays: the compact alternative to
+    daily_metrics. The arrays are validated by pydantic-core without a
+    model per day and are scored straight from NumPy.
+    """
+    days: Optional[List[Annotated[int, Field(ge=1)]]] = Field(
+        None, description="Day numbers (1-indexed); defaults to 1..len(views)"
+    )
+    views: List[Annotated[int, Field(ge=0)]] = Field(..., description="Cumulative views per day")
+    likes: List[Annotated[int, Field(ge=0)]] = Field(..., description="Cumulative likes per day")
+    comments: List[Annotated[int, Field(ge=0)]] = Field(..., description="Cumulative comments per day")
+
+    @model_validator(mode="after")
+    def check_lengths(self):
+        n = len(self.views)
+        if len(self.likes) != n or len(self.comments) != n or (self.days is not None and len(self.days) != n):
+            raise ValueError("days, views, likes and comments must have the same length")
+        if self.days is not None and len(set(self.days)) != n:
+            raise ValueError("days must be unique")
+        return self
+
+    def arrays(self):
+        """Day numbers and views/likes/comments as int64 arrays, sorted by day."""
+        views = np.asarray(self.views, dtype=np.int64)
+        likes = np.asarray(self.likes, dtype=np.int64)
+        comments = np.asarray(self.comments, dtype=np.int64)
+        if self.days is None:
+            return np.arange(1, views.size + 1, dtype=np.int64), views, likes, comments
+        days = np.asarray(self.days, dtype=np.int64)
+        order = np.argsort(days, kind="stable")
+        return days[order], views[order], likes[order], comments[order]
+
+
 class ChannelInfo(BaseModel):
     """Channel metadata"""
     channel_id: str
@@ -91,10 +127,14 @@ class PredictionRequest(BaseModel):
     # Channel info
     channel_info: ChannelInfo
 
-    # Daily metrics (days 1 to current_day)
-    daily_metrics: Dict[int, DailyMetrics] = Field(
-        ...,
-        description="Daily metrics keyed by day number (1-indexed)"
+    # Daily metrics (days 1 to current_day), as a nested dict or as parallel arrays
+    daily_metrics: Optional[Dict[int, DailyMetrics]] = Field(
+        None,
+        description="Daily metrics keyed by day number (1-indexed); required unless daily_series is set"
+    )
+    daily_series: Optional[DailySeries] = Field(
+        None,
+        description="Compact alternative to daily_metrics: parallel per-day arrays"
     )
 
     # Optional enrichment features
@@ -139,13 +179,23 @@ class PredictionRequest(BaseModel):
 
         return VideoType.ALL
 
+    @model_validator(mode="after")
+    def check_daily_format(self):
+        if (self.daily_metrics is None) == (self.daily_series is None):
+            raise ValueError("Provide exactly one of daily_metrics or daily_series")
+        return self
+
 
 class PredictionResult(BaseModel):
     """Single day prediction result"""
     day: int
     predicted_views: float
-    confidence_interval_lower: Optional[float] = None
-    confidence_interval_upper: Optional[float] = None
+    confidence_interval_lower: Optional[float] = Field(
+        None, description="Lower quantile forecast; set when the bundle has quantile models"
+    )
+    confidence_interval_upper: Optional[float] = Field(
+        None, description="Upper quantile forecast; set when the bundle has quantile models"
+    )
 
 
 class PredictionResponse(BaseModel):
@@ -157,19 +207,151 @@ class PredictionResponse(BaseModel):
     predictions: List[PredictionResult]
 
     # Model diagnostics
-    model_used: str
+    model_used: str = Field(..., description="Bundle that scored the request: name@version:checksum prefix")
     lgb_prediction: Optional[float] = None
     xgb_prediction: Optional[float] = None
     hybrid_weights: Optional[Dict[str, float]] = None
+    missing_features: Optional[Dict[str, List[str]]] = Field(
+        None, description="Per-model features not supplied by the request (filled with training medians)"
+    )
 
     # Metadata
     predicted_at: datetime = Field(default_factory=datetime.utcnow)
     processing_time_ms: Optional[float] = None
 
 
+class BatchPredictionRequest(BaseModel):
+    """Many prediction requests scored together"""
+    requests: List[PredictionRequest] = Field(..., min_length=1)
+
+
+class BatchItemError(BaseModel):
+    """A batch item that could not be scored"""
+    index: int = Field(..., description="Position of the item in the batch request")
+    video_id: str
+    detail: str
+
+
+class BatchGroupResult(BaseModel):
+    """Results for all batch items sharing one (horizon, video_type) bundle"""
+    horizon: str
+    video_type: str
+    size: int
+    feature_ms: float = Field(..., description="Time spent building features for the group")
+    inference_ms: float = Field(..., description="Time spent scoring the group's feature matrix")
+    predictions: List[PredictionResponse]
+    errors: List[BatchItemError] = Field(default_factory=list)
+
+
+class BundleInfo(BaseModel):
+    """Load statistics for one hybrid model bundle"""
+    path: str
+    model_id: str = Field(..., description="name@version:checksum prefix, as in PredictionResponse.model_used")
+    storage: str = Field("joblib", description="joblib pickle or native model store directory")
+    version: str
+    checksum: str = Field(..., description="SHA-256 of the bundle file")
+    load_ms: float
+    file_size_bytes: int
+    memory_bytes: Optional[int] = Field(None, description="RSS growth while loading the bundle")
+    backend: str = Field("native", description="native, or the compiled engine (tl2cgen/gtil)")
+    interval: Optional[List[float]] = Field(None, description="Quantiles of the prediction interval, if any")
+
+
+class CacheStats(BaseModel):
+    """Forecast result cache counters"""
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class PercentileSummary(BaseModel):
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+
+
+class ExecutorStats(BaseModel):
+    """Inference worker pool state; latencies cover the most recent tasks"""
+    workers: int
+    threads_per_worker: int
+    queue_size: int
+    in_flight: int
+    completed: int
+    rejected: int
+    queue_wait_ms: PercentileSummary
+    compute_ms: PercentileSummary
+
+
+class MicroBatchStats(BaseModel):
+    """Micro-batcher counters; summaries cover the most recent batches"""
+    max_wait_ms: float
+    max_batch: int
+    batches: int
+    requests: int
+    flushed_full: int
+    flushed_timeout: int
+    batch_size: PercentileSummary
+    batch_wait_ms: PercentileSummary = Field(..., description="Latency added by waiting for a batch")
+
+
+class ProcessMemory(BaseModel):
+    rss_bytes: int
+    shared_bytes: int
+
+
+class ReloadResponse(BaseModel):
+    """Outcome of a model registry reload"""
+    status: str = Field(..., description="reloaded, unchanged or failed")
+    generation: int = Field(..., description="Registry generation serving after this reload")
+    at: datetime
+    bundles: Dict[str, str] = Field(default_factory=dict, description="Bundle name to model id")
+    load_ms: Optional[float] = None
+    warm_ms: Optional[float] = None
+    detail: Optional[str] = None
+
+
+class RegistryStatus(BaseModel):
+    generation: int
+    model_dir: str
+    created_at: datetime
+    last_reload: Optional[ReloadResponse] = None
+
+
+class StartupReport(BaseModel):
+    """Startup phase timings; ready flips once every bundle is loaded and warmed"""
+    ready: bool
+    ready_at: Optional[datetime] = None
+    import_ms: float = Field(..., description="Time to import the service modules")
+    load_ms: Optional[float] = Field(None, description="Time to load every bundle")
+    warm_ms: Optional[float] = Field(None, description="Time to score the warm-up forecasts")
+    bundles_warm_ms: Dict[str, float] = Field(
+        default_factory=dict, description="Slowest warm-up forecast per bundle (the cold first call)"
+    )
+    detail: Optional[str] = None
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str
     message: str
     timestamp: datetime
-    models_status: Optional[Dict[str, bool]] = None
\ No newline at end of file
+    models_status: Optional[Dict[str, bool]] = Field(
+        None, description="True for each loaded bundle, False for each that failed to load"
+    )
+    models_errors: Optional[Dict[str, str]] = Field(
+        None, description="Load error of each bundle that failed to load"
+    )
+    models_info: Optional[Dict[str, BundleInfo]] = Field(
+        None, description="Bundles loaded so far; others load on first use"
+    )
+    process_memory: Optional[ProcessMemory] = None
+    registry: Optional[RegistryStatus] = None
+    startup: Optional[StartupReport] = None
+    cache: Optional[CacheStats] = None
+    executor: Optional[ExecutorStats] = None
+    micro_batching: Optional[MicroBatchStats] = None
\ No newline at end of file
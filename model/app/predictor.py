@@ -1,121 +1,334 @@
-import joblib
 import numpy as np
 import os
 from time import perf_counter
+from typing import Optional
 import xgboost as xgb
 
+from app import compiled
+from app.metrics import stage
+from app.feature_schema import FeatureSchema
+from app.features import FeatureBlock
+from app.horizon import HORIZON_ROLLOUT_STEP, future_grid, growth_curve, rollout, stack_bases
+from app.registry import DEFAULT_MODEL_DIR, ModelRegistry, get_registry
+
+
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "native")
+
+
 class HybridPredictor:
-    def __init__(self, model_dir: str = "models/"):
-        self.models = {}
-        for horizon in ["7d", "30d"]:
-            for vtype in ["all", "short", "long"]:
-                name = f"hybrid_{horizon}_{vtype}.joblib"
-                path = os.path.join(model_dir, name)
-                if os.path.exists(path):
-                    try:
-                        self.models[(horizon, vtype)] = joblib.load(path)
-                        print(f"✅ Loaded {name}")
-                    except Exception as e:
-                        print(f"⚠️ Failed to load {name}: {e}")
-        print(f"✅ Total {len(self.models)} hybrid models loaded")
-
-    def _unwrap_model(self, bundle, key):
-        obj = bundle.get(key)
-        if isinstance(obj, dict):
-            if "booster" in obj:
-                return obj["booster"], obj.get("features")
-            if "model" in obj:
-                return obj["model"], obj.get("features")
-        return obj, None
-
-    def _prepare_input(self, features_dict, expected_features):
-        if not expected_features:
-            expected_features = sorted(features_dict.keys())
-        row = [features_dict.get(f, 0) for f in expected_features]
-        return np.array(row).reshape(1, -1)
-
-    def predict_series(self, daily_features_list, horizon: str, video_type: str, current_day: int):
+    def __init__(self, model_dir: str = DEFAULT_MODEL_DIR, registry: ModelRegistry = None,
+                 backend: str = INFERENCE_BACKEND, booster_threads: Optional[int] = None,
+                 rollout_step: int = HORIZON_ROLLOUT_STEP):
+        # Bundles are loaded once per process and shared by every predictor
+        self.registry = registry or get_registry(model_dir)
+        self.backend = backend
+        # OpenMP threads each LightGBM/XGBoost predict call may use, so several
+        # inference workers do not oversubscribe the cores
+        self.booster_threads = booster_threads or None
+        # Days per autoregressive rollout block (app.horizon); 0 extrapolates open-loop
+        self.rollout_step = rollout_step
+        if backend == "compiled" and not compiled.available():
+            print("⚠️ INFERENCE_BACKEND=compiled but treelite is not installed, using native boosters")
+        # Bundles may load lazily, so each one is prepared as it is loaded
+        self.registry.add_load_hook(self.prepare_bundle)
+
+    def prepare_bundle(self, bundle):
+        """Apply the booster thread cap and, for the compiled backend, compile the bundle."""
+        if self.booster_threads and bundle.xgb_model is not None and hasattr(bundle.xgb_model, "set_param"):
+            bundle.xgb_model.set_param({"nthread": self.booster_threads})
+
+        if self.backend != "compiled" or not compiled.available() or bundle.compiled is not None:
+            return
+        try:
+            bundle.compiled = compiled.compile_bundle(bundle, nthread=self.booster_threads)
+            print(f"✅ Compiled {bundle.name} ({bundle.compiled.engine})")
+        except Exception as e:
+            print(f"⚠️ Failed to compile {bundle.name}, using native boosters: {e}")
+
+    @property
+    def models(self):
+        """Raw dicts of the bundles loaded so far."""
+        return {key: bundle.raw for key, bundle in self.registry.bundles.items()}
+
+    @staticmethod
+    def _prepare_matrix(blocks, schema: FeatureSchema):
+        """Pack (columns, n_rows) blocks into one contiguous float32 matrix."""
+        if schema is None:
+            # Bundles without a feature list fall back to sorted feature names
+            schema = FeatureSchema.build(sorted(blocks[0][0].keys()))
+        out = schema.allocate(sum(n for _, n in blocks))
+        start = 0
+        for columns, n in blocks:
+            schema.pack_columns(columns, n, out=out[start:start + n])
+            start += n
+        return out
+
+    @staticmethod
+    def _base_features(features, current_day: int):
+        """Scalar features of the last observed day from a FeatureBlock or list of dicts."""
+        if current_day > len(features):
+            raise ValueError("current_day exceeds available feature days")
+        if isinstance(features, FeatureBlock):
+            return features.row(current_day - 1)
+        return features[current_day - 1]
+
+    def _forecast(self, bundle, base, current_days, horizon_days: int, video_type: str):
+        """
+        Log-space scores (see _score_blocks) for horizon_days future days of
+        every video in `base` (stacked columns, see app.horizon.stack_bases),
+        horizon_days rows per video in order.
+        """
+        current_days = np.asarray(current_days)
+        curve = growth_curve(video_type)
+
+        def score(columns, n_rows):
+            return self._score_blocks(bundle, [(columns, n_rows)])
+
+        if self.rollout_step and self.rollout_step < horizon_days:
+            return rollout(score, base, current_days, horizon_days, self.rollout_step, curve)
+        return score(*future_grid(base, current_days, horizon_days, curve))
+
+    def _score_blocks(self, bundle, blocks):
+        """
+        Scores all blocks in one pass: a single call into the compiled
+        ensemble, or one LightGBM call and one XGBoost call, plus one call per
+        interval quantile model. Each feature layout is packed only once, so
+        quantile models trained on the LightGBM features reuse its matrix.
+
+        Returns (final_log, lgb_preds, xgb_preds, lower_log, upper_log) in log
+        space. The per-model predictions are None if that model is missing or
+        failed, or if the compiled ensemble produced the blend directly; the
+        interval bounds are None unless the bundle has quantile models;
+        final_log is None if nothing could be scored.
+        """
+        matrices = {}
+
+        def matrix(schema):
+            if id(schema) not in matrices:
+                with stage("pack", bundle.horizon, bundle.video_type):
+                    matrices[id(schema)] = self._prepare_matrix(blocks, schema)
+            return matrices[id(schema)]
+
+        return self._score_point(bundle, matrix) + self._score_interval(bundle, matrix)
+
+    def _lgb_params(self):
+        return {"num_threads": self.booster_threads} if self.booster_threads else {}
+
+    def _score_point(self, bundle, matrix):
+        if bundle.compiled is not None:
+            try:
+                X = matrix(bundle.compiled.schema)
+                with stage("compiled", bundle.horizon, bundle.video_type):
+                    return bundle.compiled.predict(X), None, None
+            except Exception as e:
+                print(f"⚠️ Compiled ensemble failed for {bundle.name}, using native boosters: {e}")
+
+        lgb_preds = xgb_preds = None
+
+        # --- LightGBM prediction ---
+        if bundle.lgb_model is not None:
+            try:
+                X_lgb = matrix(bundle.lgb_schema)
+                with stage("lightgbm", bundle.horizon, bundle.video_type):
+                    lgb_preds = np.asarray(bundle.lgb_model.predict(X_lgb, **self._lgb_params()))
+            except Exception as e:
+                print(f"⚠️ LightGBM failed for {bundle.name}: {e}")
+
+        # --- XGBoost prediction ---
+        if bundle.xgb_model is not None:
+            try:
+                X_xgb = matrix(bundle.xgb_schema)
+                with stage("xgboost", bundle.horizon, bundle.video_type):
+                    dmatrix = xgb.DMatrix(X_xgb, feature_names=bundle.xgb_features)
+                    xgb_preds = np.asarray(bundle.xgb_model.predict(dmatrix))
+            except Exception as e:
+                print(f"⚠️ XGBoost failed for {bundle.name}: {e}")
+
+        if lgb_preds is None:
+            final_log = xgb_preds
+        elif xgb_preds is None:
+            final_log = lgb_preds
+        else:
+            final_log = bundle.weights["lightgbm"] * lgb_preds + bundle.weights["xgboost"] * xgb_preds
+
+        return final_log, lgb_preds, xgb_preds
+
+    def _score_interval(self, bundle, matrix):
+        """(lower_log, upper_log) from the bundle's outermost quantile models."""
+        if bundle.interval is None:
+            return None, None
+        bounds = []
+        for alpha in bundle.interval:
+            model, schema = bundle.quantile_models[alpha]
+            try:
+                X = matrix(schema)
+                with stage("interval", bundle.horizon, bundle.video_type):
+                    if isinstance(model, xgb.Booster):
+                        preds = model.predict(xgb.DMatrix(X, feature_names=list(schema.names) if schema else None))
+                    else:
+                        preds = model.predict(X, **self._lgb_params())
+                bounds.append(np.asarray(preds))
+            except Exception as e:
+                print(f"⚠️ Quantile {alpha} model failed for {bundle.name}: {e}")
+                return None, None
+        lower, upper = bounds
+        # Independently trained quantiles can cross
+        return np.minimum(lower, upper), np.maximum(lower, upper)
+
+    @staticmethod
+    def _blend_results(bundle, days, scores, elapsed_ms):
+        """Per-day result dicts from the log-space scores of _score_blocks."""
+        final_log, lgb_preds, xgb_preds, lower_log, upper_log = scores
+        if final_log is None:
+            return []
+
+        final = np.expm1(final_log)
+        lgb_out = np.expm1(lgb_preds) if lgb_preds is not None else None
+        xgb_out = np.expm1(xgb_preds) if xgb_preds is not None else None
+        lower = np.expm1(lower_log) if lower_log is not None else None
+        upper = np.expm1(upper_log) if upper_log is not None else None
+        per_day_ms = elapsed_ms / len(days) if len(days) else 0.0
+        weights = {"lightgbm": bundle.weights["lightgbm"], "xgboost": bundle.weights["xgboost"]}
+
+        return [
+            {
+                "day": int(day),
+                "predicted": float(final[i]),
+                "lgb_pred": float(lgb_out[i]) if lgb_out is not None else None,
+                "xgb_pred": float(xgb_out[i]) if xgb_out is not None else None,
+                "lower": float(lower[i]) if lower is not None else None,
+                "upper": float(upper[i]) if upper is not None else None,
+                "weights": weights,
+                "elapsed_ms": per_day_ms,
+            }
+            for i, day in enumerate(days)
+        ]
+
+    def predict_series(self, daily_features, horizon: str, video_type: str, current_day: int,
+                       registry: ModelRegistry = None):
         """
         Predicts the next (future) days beyond `current_day` up to horizon.
 
+        All future days are scored together: one feature matrix and one call
+        into each model (or into the compiled ensemble) per request, or one
+        per block when autoregressive rollout is enabled (see app.horizon).
+
         Args:
-            daily_features_list: list of dicts, each containing features up to that day (1..current_day)
+            daily_features: FeatureBlock, or list of dicts each containing features up to that day (1..current_day)
             horizon: '7d' or '30d'
             video_type: 'all', 'short', or 'long'
             current_day: last observed day (e.g., 3 means we have data till day 3)
+            registry: registry snapshot to score with (defaults to the current one)
 
         Returns:
-            list of dicts [{day, predicted, lgb_pred, xgb_pred, weights, elapsed_ms}, ...]
+            list of dicts [{day, predicted, lgb_pred, xgb_pred, lower, upper, weights, elapsed_ms}, ...]
+            where lower/upper are the prediction interval (None without quantile models) and
+            elapsed_ms is the batch scoring time split evenly across days
         """
-        model_bundle = self.models.get((horizon, video_type))
-        if model_bundle is None:
+        bundle = (registry or self.registry).get(horizon, video_type)
+        if bundle is None:
             raise ValueError(f"No model found for {horizon}/{video_type}")
 
-        lgb_model, lgb_features = self._unwrap_model(model_bundle, "lightgbm")
-        xgb_model, xgb_features = self._unwrap_model(model_bundle, "xgboost")
-        blend_weights = model_bundle.get("blend", {"lightgbm": 0.5, "xgboost": 0.5})
-        w_lgb = blend_weights.get("lightgbm", 0.5)
-        w_xgb = blend_weights.get("xgboost", 0.5)
+        # Identify base features (latest day we have) and simulate progression
+        base_feats = self._base_features(daily_features, current_day)
+        horizon_days = int(horizon.replace("d", ""))
 
-        # Identify base features (latest day we have)
-        if current_day > len(daily_features_list):
-            raise ValueError("current_day exceeds available feature days")
+        start = perf_counter()
+        scores = self._forecast(bundle, stack_bases([base_feats]), [current_day], horizon_days, video_type)
+        elapsed = (perf_counter() - start) * 1000
+
+        days = current_day + np.arange(1, horizon_days + 1)
+        with stage("blend", horizon, video_type):
+            return self._blend_results(bundle, days, scores, elapsed)
+
+    def predict_batch(self, items, horizon: str, video_type: str, registry: ModelRegistry = None):
+        """
+        Predicts the future days of many videos that share one model bundle.
+
+        Every video's future rows are stacked into one matrix and scored with
+        a single LightGBM call and a single XGBoost call.
+
+        Args:
+            items: list of (daily_features, current_day) tuples, where
+                daily_features is a FeatureBlock or a list of per-day dicts
+            horizon: '7d' or '30d'
+            video_type: 'all', 'short', or 'long'
+            registry: registry snapshot to score with (defaults to the current one)
+
+        Returns:
+            list aligned with `items`; each entry is the predict_series-style
+            result list, or a ValueError if that item could not be scored
+        """
+        bundle = (registry or self.registry).get(horizon, video_type)
+        if bundle is None:
+            raise ValueError(f"No model found for {horizon}/{video_type}")
 
-        base_feats = daily_features_list[current_day - 1].copy()
-
-        results = []
-        # Predict future days (simulate progression)
-        for offset in range(1, int(horizon.replace("d", "")) + 1):
-            future_day = current_day + offset
-            feats = base_feats.copy()
-            feats["t"] = future_day
-
-            # (Optional) naive extrapolation for cumulative fields
-            for key in ["views_cml_t", "likes_cml_t", "comments_cml_t"]:
-                if key in feats:
-                    growth = feats[key] * (1.02 ** offset)  # +2% daily compounding
-                    feats[key] = float(growth)
-
-            start = perf_counter()
-            lgb_pred = xgb_pred = None
-
-            # --- LightGBM prediction ---
-            if lgb_model is not None:
-                try:
-                    X_lgb = self._prepare_input(feats, lgb_features)
-                    lgb_pred = lgb_model.predict(X_lgb)[0]
-                except Exception as e:
-                    print(f"⚠️ LightGBM failed on day {future_day}: {e}")
-
-            # --- XGBoost prediction ---
-            if xgb_model is not None:
-                try:
-                    X_xgb = self._prepare_input(feats, xgb_features)
-                    dmatrix = xgb.DMatrix(X_xgb, feature_names=xgb_features)
-                    xgb_pred = xgb_model.predict(dmatrix)[0]
-                except Exception as e:
-                    print(f"⚠️ XGBoost failed on day {future_day}: {e}")
-
-            if lgb_pred is None and xgb_pred is None:
+        horizon_days = int(horizon.replace("d", ""))
+        outputs = [None] * len(items)
+        bases, current_days, owners = [], [], []
+        for i, (daily_features, current_day) in enumerate(items):
+            try:
+                bases.append(self._base_features(daily_features, current_day))
+            except ValueError as e:
+                outputs[i] = e
                 continue
+            current_days.append(current_day)
+            owners.append(i)
+
+        if not bases:
+            return outputs
+
+        start = perf_counter()
+        scores = self._forecast(bundle, stack_bases(bases), current_days, horizon_days, video_type)
+        elapsed = (perf_counter() - start) * 1000
+        per_item_ms = elapsed / len(owners)
+
+        offsets = np.arange(1, horizon_days + 1)
+        with stage("blend", horizon, video_type):
+            for n, (i, current_day) in enumerate(zip(owners, current_days)):
+                block = slice(n * horizon_days, (n + 1) * horizon_days)
+                item_scores = tuple(p[block] if p is not None else None for p in scores)
+                outputs[i] = self._blend_results(bundle, current_day + offsets, item_scores, per_item_ms)
+        return outputs
+
+    def predict_columns(self, base, current_days, horizon: str, video_type: str,
+                        registry: ModelRegistry = None):
+        """
+        Predicts the future days of many videos whose last-observed-day
+        features are already column arrays (see app.columnar), without
+        building a result dict per day.
+
+        Args:
+            base: feature name -> array with one entry per video; masked
+                entries are scored as missing (NaN), and features absent
+                from `base` fall back to the feature schema's defaults
+            current_days: last observed day of each video
+            horizon: '7d' or '30d'
+            video_type: 'all', 'short', or 'long'
+            registry: registry snapshot to score with (defaults to the current one)
+
+        Returns:
+            (bundle, days, predicted, lower, upper): arrays with horizon_days
+            entries per video, video-major; lower/upper are None without
+            quantile models
+        """
+        bundle = (registry or self.registry).get(horizon, video_type)
+        if bundle is None:
+            raise ValueError(f"No model found for {horizon}/{video_type}")
+
+        horizon_days = int(horizon.replace("d", ""))
+        current_days = np.asarray(current_days)
+        final_log, _, _, lower_log, upper_log = self._forecast(
+            bundle, base, current_days, horizon_days, video_type
+        )
+        if final_log is None:
+            raise ValueError(f"No model could score {bundle.name}")
 
-            if lgb_pred is None:
-                final_log_pred = xgb_pred
-            elif xgb_pred is None:
-                final_log_pred = lgb_pred
-            else:
-                final_log_pred = w_lgb * lgb_pred + w_xgb * xgb_pred
-
-            final_pred = float(np.expm1(final_log_pred))
-            elapsed = (perf_counter() - start) * 1000
-
-            results.append({
-                "day": future_day,
-                "predicted": final_pred,
-                "lgb_pred": float(np.expm1(lgb_pred)) if lgb_pred is not None else None,
-                "xgb_pred": float(np.expm1(xgb_pred)) if xgb_pred is not None else None,
-                "weights": {"lightgbm": w_lgb, "xgboost": w_xgb},
-                "elapsed_ms": elapsed
-            })
-
-        return results
+        days = (current_days[:, None] + np.arange(1, horizon_days + 1)).reshape(-1)
+        return (
+            bundle,
+            days,
+            np.expm1(final_log),
+            np.expm1(lower_log) if lower_log is not None else None,
+            np.expm1(upper_log) if upper_log is not None else None,
+        )
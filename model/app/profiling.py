@@ -0,0 +1,62 @@
+"""
+Optional sampling profiler for inference work.
+
+With PROFILE_SAMPLE_RATE > 0 that fraction of scoring calls runs under
+pyinstrument's sampling profiler, in the inference worker thread where the
+CPU time is spent, and each profile is written as HTML to PROFILE_DIR.
+pyinstrument is optional: without it the hook stays off.
+"""
+import os
+import random
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "logs/profiles")
+# Sampling interval of the profiler in seconds
+PROFILE_INTERVAL_S = float(os.getenv("PROFILE_INTERVAL_S", 0.0005))
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pragma: no cover - optional dependency
+    Profiler = None
+
+_warned = False
+_warn_lock = threading.Lock()
+
+
+def _enabled(rate: float) -> bool:
+    global _warned
+    if rate <= 0:
+        return False
+    if Profiler is None:
+        with _warn_lock:
+            if not _warned:
+                print("⚠️ PROFILE_SAMPLE_RATE is set but pyinstrument is not installed, profiling is off")
+                _warned = True
+        return False
+    return random.random() < rate
+
+
+@contextmanager
+def maybe_profile(name: str, rate: float = PROFILE_SAMPLE_RATE, out_dir: str = PROFILE_DIR):
+    """Profile the enclosed block for a sampled `rate` of calls and save the report as `name`-*.html."""
+    if not _enabled(rate):
+        yield
+        return
+
+    profiler = Profiler(interval=PROFILE_INTERVAL_S, async_mode="disabled")
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+            stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+            path = os.path.join(out_dir, f"{name}-{stamp}-{threading.get_ident()}.html")
+            with open(path, "w") as f:
+                f.write(profiler.output_html())
+        except OSError as e:
+            print(f"⚠️ Failed to write profile {name}: {e}")
@@ -0,0 +1,345 @@
+"""
+Process-wide registry of hybrid model bundles.
+
+Each (horizon, video_type) bundle is loaded at most once per process (on
+first use, unless preloaded) and its boosters are unwrapped up front, so
+every request shares the same objects.
+"""
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+from app import model_store
+from app.feature_schema import FeatureSchema
+from app.utils import current_rss_bytes
+
+HORIZONS = ["7d", "30d"]
+VIDEO_TYPES = ["all", "short", "long"]
+DEFAULT_MODEL_DIR = os.getenv("MODELS_DIR", "models/")
+# Load every bundle at startup instead of on first use; combine with
+# gunicorn --preload so forked workers share the loaded boosters
+MODELS_PRELOAD = os.getenv("MODELS_PRELOAD", "false").lower() in ("1", "true", "yes")
+
+
+def _unwrap_model(bundle, key):
+    obj = bundle.get(key)
+    if isinstance(obj, dict):
+        if "booster" in obj:
+            return obj["booster"], obj.get("features")
+        if "model" in obj:
+            return obj["model"], obj.get("features")
+    return obj, None
+
+
+def _file_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _storage_size(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    return os.path.getsize(path)
+
+
+def _feature_schema(bundle, key, features) -> Optional[FeatureSchema]:
+    return _entry_schema(bundle.get(key), features)
+
+
+def _entry_schema(obj, features) -> Optional[FeatureSchema]:
+    if not features:
+        return None
+    medians = obj.get("medians") if isinstance(obj, dict) else None
+    return FeatureSchema.build(features, medians)
+
+
+def _quantile_models(bundle, lgb_schema) -> Dict[float, Tuple[Any, Optional[FeatureSchema]]]:
+    """
+    Optional quantile boosters: bundle["quantiles"] maps alpha (e.g. 0.1, 0.9)
+    to a booster entry like bundle["lightgbm"]. Entries without their own
+    feature list use the LightGBM layout, and share its packed matrix.
+    """
+    models = {}
+    for alpha, entry in (bundle.get("quantiles") or {}).items():
+        model, features = _unwrap_model({"q": entry}, "q")
+        schema = _entry_schema(entry, features)
+        if schema is None or (
+            lgb_schema is not None and schema.names == lgb_schema.names
+            and np.array_equal(schema.defaults, lgb_schema.defaults)
+        ):
+            schema = lgb_schema
+        models[float(alpha)] = (model, schema)
+    return models
+
+
+@dataclass
+class LoadedBundle:
+    """A hybrid bundle with its boosters unwrapped and load statistics attached."""
+    horizon: str
+    video_type: str
+    path: str
+    raw: Dict[str, Any]
+    lgb_model: Any
+    lgb_features: Optional[List[str]]
+    xgb_model: Any
+    xgb_features: Optional[List[str]]
+    lgb_schema: Optional[FeatureSchema] = None
+    xgb_schema: Optional[FeatureSchema] = None
+    weights: Dict[str, float] = field(default_factory=dict)
+    # alpha -> (booster, schema) of optional quantile models
+    quantile_models: Dict[float, Tuple[Any, Optional[FeatureSchema]]] = field(default_factory=dict)
+    load_ms: float = 0.0
+    storage: str = "joblib"  # or "native" (app.model_store directory)
+    file_size_bytes: int = 0
+    checksum: str = ""
+    memory_bytes: Optional[int] = None
+    compiled: Any = None  # app.compiled.CompiledEnsemble when that backend is enabled
+
+    @property
+    def name(self) -> str:
+        return f"hybrid_{self.horizon}_{self.video_type}"
+
+    @property
+    def version(self) -> str:
+        return str(self.raw.get("meta", {}).get("version", "unversioned"))
+
+    @property
+    def interval(self) -> Optional[Tuple[float, float]]:
+        """(lower, upper) quantiles of the prediction interval, if the bundle has them."""
+        if len(self.quantile_models) < 2:
+            return None
+        return min(self.quantile_models), max(self.quantile_models)
+
+    @property
+    def model_id(self) -> str:
+        """Name, bundle version and checksum prefix, e.g. hybrid_7d_all@v1.0:3f2a9c01b4d2."""
+        return f"{self.name}@{self.version}:{self.checksum[:12]}"
+
+    def feature_report(self, supplied) -> Dict[str, List[str]]:
+        """Features each booster expects that were not supplied (filled with defaults)."""
+        supplied = set(supplied)
+        report = {}
+        if self.lgb_model is not None and self.lgb_schema is not None:
+            report["lightgbm"] = self.lgb_schema.missing(supplied)
+        if self.xgb_model is not None and self.xgb_schema is not None:
+            report["xgboost"] = self.xgb_schema.missing(supplied)
+        return report
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "model_id": self.model_id,
+            "version": self.version,
+            "checksum": self.checksum,
+            "storage": self.storage,
+            "load_ms": round(self.load_ms, 3),
+            "file_size_bytes": self.file_size_bytes,
+            "memory_bytes": self.memory_bytes,
+            "backend": self.compiled.engine if self.compiled is not None else "native",
+            "interval": list(self.interval) if self.interval else None,
+        }
+
+
+class ModelRegistry:
+    """
+    Hybrid bundles found in `model_dir`, each loaded at most once.
+
+    A bundle is either a native store directory (see app.model_store), which
+    takes precedence, or a joblib pickle. With `lazy=True`, `load()` only
+    discovers the bundles and each one is loaded on its first `get()`.
+    """
+
+    def __init__(self, model_dir: str = DEFAULT_MODEL_DIR, lazy: bool = False, generation: int = 0):
+        self.model_dir = model_dir
+        self.lazy = lazy
+        # Incremented by every hot reload (app.reloader) that replaces this registry
+        self.generation = generation
+        self.created_at = datetime.utcnow()
+        self.source_fingerprint = model_dir_fingerprint(model_dir)
+        self.bundles: Dict[Tuple[str, str], LoadedBundle] = {}
+        self.paths: Dict[Tuple[str, str], str] = {}
+        # Error message of every bundle that failed to load; it is not retried
+        self.load_errors: Dict[Tuple[str, str], str] = {}
+        self._load_hooks: List[Callable[[LoadedBundle], None]] = []
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self):
+        with self._lock:
+            if self._loaded:
+                return self
+            for horizon in HORIZONS:
+                for vtype in VIDEO_TYPES:
+                    name = f"hybrid_{horizon}_{vtype}"
+                    for path in (os.path.join(self.model_dir, name),
+                                 os.path.join(self.model_dir, f"{name}.joblib")):
+                        if model_store.is_native_bundle(path) or os.path.isfile(path):
+                            self.paths[(horizon, vtype)] = path
+                            break
+            if not self.lazy:
+                for key in self.paths:
+                    self._load_locked(key)
+            self._loaded = True
+        if self.lazy:
+            print(f"✅ Found {len(self.paths)} hybrid models (loaded on first use)")
+        else:
+            print(f"✅ Total {len(self.bundles)} hybrid models loaded")
+        return self
+
+    def preload(self):
+        """Load every discovered bundle now, e.g. before forking workers."""
+        self.load()
+        with self._lock:
+            for key in self.paths:
+                self._load_locked(key)
+        print(f"✅ Total {len(self.bundles)} hybrid models loaded")
+        return self
+
+    def add_load_hook(self, hook: Callable[[LoadedBundle], None]):
+        """Call `hook(bundle)` for every bundle already loaded and every one loaded later."""
+        with self._lock:
+            self._load_hooks.append(hook)
+            loaded = list(self.bundles.values())
+        for bundle in loaded:
+            hook(bundle)
+
+    def _load_locked(self, key: Tuple[str, str]) -> Optional[LoadedBundle]:
+        if key in self.bundles or key in self.load_errors:
+            return self.bundles.get(key)
+        path = self.paths[key]
+        name = os.path.basename(path)
+        try:
+            bundle = self._load_bundle(path, *key)
+            for hook in self._load_hooks:
+                hook(bundle)
+        except Exception as e:
+            self.load_errors[key] = f"{type(e).__name__}: {e}"
+            print(f"⚠️ Failed to load {name}: {e}")
+            return None
+        self.bundles[key] = bundle
+        print(f"✅ Loaded {name}")
+        return bundle
+
+    @staticmethod
+    def _load_bundle(path: str, horizon: str, vtype: str) -> LoadedBundle:
+        native = model_store.is_native_bundle(path)
+        rss_before = current_rss_bytes()
+        start = perf_counter()
+        bundle = model_store.load_native_bundle(path) if native else joblib.load(path)
+        load_ms = (perf_counter() - start) * 1000
+        rss_after = current_rss_bytes()
+
+        lgb_model, lgb_features = _unwrap_model(bundle, "lightgbm")
+        xgb_model, xgb_features = _unwrap_model(bundle, "xgboost")
+        blend_weights = bundle.get("blend", {"lightgbm": 0.5, "xgboost": 0.5})
+        lgb_schema = _feature_schema(bundle, "lightgbm", lgb_features)
+
+        return LoadedBundle(
+            horizon=horizon,
+            video_type=vtype,
+            path=path,
+            raw=bundle,
+            lgb_model=lgb_model,
+            lgb_features=lgb_features,
+            xgb_model=xgb_model,
+            xgb_features=xgb_features,
+            lgb_schema=lgb_schema,
+            xgb_schema=_feature_schema(bundle, "xgboost", xgb_features),
+            weights={
+                "lightgbm": blend_weights.get("lightgbm", 0.5),
+                "xgboost": blend_weights.get("xgboost", 0.5),
+            },
+            quantile_models=_quantile_models(bundle, lgb_schema),
+            load_ms=load_ms,
+            storage="native" if native else "joblib",
+            file_size_bytes=_storage_size(path),
+            checksum=model_store.native_checksum(path) if native else _file_checksum(path),
+            memory_bytes=(
+                max(rss_after - rss_before, 0)
+                if rss_before is not None and rss_after is not None else None
+            ),
+        )
+
+    def get(self, horizon: str, video_type: str) -> Optional[LoadedBundle]:
+        key = (horizon, video_type)
+        bundle = self.bundles.get(key)
+        if bundle is None and key in self.paths:
+            with self._lock:
+                bundle = self._load_locked(key)
+        return bundle
+
+    def loaded(self, horizon: str, video_type: str) -> Optional[LoadedBundle]:
+        """The bundle if it is already loaded; never loads it, so it is safe on the event loop."""
+        return self.bundles.get((horizon, video_type))
+
+    def keys(self):
+        """Every available bundle, loaded or not."""
+        return self.paths.keys()
+
+    def status(self) -> Dict[str, bool]:
+        """
+        Whether each bundle can serve: True once loaded, False if it failed
+        to load. Bundles that have not been loaded yet are left out.
+        """
+        with self._lock:
+            status = {f"hybrid_{h}_{v}": False for h, v in self.load_errors}
+            status.update({b.name: True for b in self.bundles.values()})
+        return status
+
+    def errors(self) -> Dict[str, str]:
+        """Load error of every bundle that failed to load."""
+        with self._lock:
+            return {f"hybrid_{h}_{v}": error for (h, v), error in self.load_errors.items()}
+
+    def info(self) -> Dict[str, Dict[str, Any]]:
+        return {b.name: b.info() for b in self.bundles.values()}
+
+
+def model_dir_fingerprint(model_dir: str) -> Tuple:
+    """Names, sizes and mtimes of every hybrid bundle file; changes when a bundle is replaced."""
+    entries = []
+    if not os.path.isdir(model_dir):
+        return ()
+    for entry in os.scandir(model_dir):
+        if not entry.name.startswith("hybrid_"):
+            continue
+        paths = [entry.path]
+        if entry.is_dir():
+            paths = sorted(os.path.join(entry.path, name) for name in os.listdir(entry.path))
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # replaced while scanning
+                continue
+            entries.append((os.path.relpath(path, model_dir), stat.st_size, stat.st_mtime_ns))
+    return tuple(sorted(entries))
+
+
+_registries: Dict[str, ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def replace_registry(registry: ModelRegistry):
+    """Make `registry` the process-wide registry for its model_dir (used by hot reload)."""
+    with _registries_lock:
+        _registries[os.path.abspath(registry.model_dir)] = registry
+
+
+def get_registry(model_dir: str = DEFAULT_MODEL_DIR, lazy: bool = not MODELS_PRELOAD) -> ModelRegistry:
+    """Return the loaded registry for `model_dir`, creating it on first use."""
+    key = os.path.abspath(model_dir)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = ModelRegistry(model_dir, lazy=lazy)
+    return registry.load()
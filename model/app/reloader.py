@@ -0,0 +1,115 @@
+"""
+Hot reload of the model registry.
+
+A reload builds a complete new ModelRegistry from the model directory in
+the background, warms every bundle with a synthetic forecast and only then
+swaps it into the predictor. Requests hold on to the registry snapshot they
+started with, so in-flight forecasts finish on the old bundles while new
+requests see the new ones. A reload that fails to load or warm any bundle
+is discarded and the current registry keeps serving.
+"""
+import os
+import threading
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+from app.registry import ModelRegistry, model_dir_fingerprint, replace_registry
+from app.warmup import warm_up
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# Poll the model directory every N seconds and reload on change; 0 disables the watcher
+MODELS_WATCH_INTERVAL_S = float(os.getenv("MODELS_WATCH_INTERVAL_S", 0))
+
+
+class ModelReloader:
+    def __init__(self, predictor, watch_interval_s: float = MODELS_WATCH_INTERVAL_S):
+        self.predictor = predictor
+        self.watch_interval_s = watch_interval_s
+        self.last_reload: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def reload(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Load, warm and swap in the current contents of the model directory.
+
+        Unless `force` is set, nothing is reloaded if the bundle files have
+        not changed since the current registry was built.
+        """
+        with self._lock:
+            current = self.predictor.registry
+            fingerprint = model_dir_fingerprint(current.model_dir)
+            if not force and fingerprint == current.source_fingerprint:
+                return self._record("unchanged", current)
+
+            start = perf_counter()
+            try:
+                candidate = ModelRegistry(current.model_dir, lazy=True, generation=current.generation + 1)
+                candidate.add_load_hook(self.predictor.prepare_bundle)
+                candidate.preload()
+                missing = set(candidate.keys()) - set(candidate.bundles)
+                if missing or not candidate.bundles:
+                    raise RuntimeError(
+                        "failed to load " + ", ".join(f"hybrid_{h}_{v}" for h, v in sorted(missing))
+                        if missing else "no bundles found"
+                    )
+                load_ms = (perf_counter() - start) * 1000
+
+                start = perf_counter()
+                warm_up(self.predictor, candidate)
+                warm_ms = (perf_counter() - start) * 1000
+            except Exception as e:
+                print(f"⚠️ Model reload failed, keeping generation {current.generation}: {e}")
+                return self._record("failed", current, detail=str(e))
+
+            # Attribute assignment is atomic; in-flight requests keep their snapshot
+            self.predictor.registry = candidate
+            replace_registry(candidate)
+            print(f"✅ Reloaded models as generation {candidate.generation}")
+            return self._record("reloaded", candidate, load_ms=load_ms, warm_ms=warm_ms)
+
+    def _record(self, status: str, registry: ModelRegistry, **extra) -> Dict[str, Any]:
+        result = {
+            "status": status,
+            "generation": registry.generation,
+            "at": datetime.utcnow(),
+            "bundles": {b.name: b.model_id for b in registry.bundles.values()},
+            "load_ms": None,
+            "warm_ms": None,
+            "detail": None,
+        }
+        result.update(extra)
+        if status != "unchanged":
+            self.last_reload = result
+        return result
+
+    def start_watching(self):
+        if self.watch_interval_s <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self):
+        # Reload only once a change has been stable for a full interval, so a
+        # bundle still being copied in is not picked up, and do not retry a
+        # change that already failed
+        previous = failed = None
+        while not self._stop.wait(self.watch_interval_s):
+            try:
+                fingerprint = model_dir_fingerprint(self.predictor.registry.model_dir)
+                if (fingerprint != self.predictor.registry.source_fingerprint
+                        and fingerprint == previous and fingerprint != failed):
+                    if self.reload()["status"] == "failed":
+                        failed = fingerprint
+                previous = fingerprint
+            except Exception as e:  # keep watching
+                print(f"⚠️ Model directory watch failed: {e}")
@@ -0,0 +1,87 @@
+"""
+Startup phase of the forecast service.
+
+After the app is imported, every bundle is loaded and a synthetic forecast
+is scored with each one on every inference worker thread. That pays the
+first-call costs (booster initialization, OpenMP thread spin-up, NumPy code
+paths) before real traffic arrives. /ready only reports ready once this has
+finished, so a load balancer never routes requests to a cold replica.
+"""
+import asyncio
+import os
+import threading
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+from app.warmup import warm_up
+
+# Set to false to skip warm-up and keep bundles loading lazily on first use
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+# How long a worker waits for the others to pick up their warm-up task
+WARMUP_BARRIER_TIMEOUT_S = float(os.getenv("WARMUP_BARRIER_TIMEOUT_S", 30))
+
+
+class StartupState:
+    def __init__(self, import_ms: float):
+        self.import_ms = import_ms
+        self.load_ms: Optional[float] = None
+        self.warm_ms: Optional[float] = None
+        self.bundles: Dict[str, float] = {}
+        self.ready = False
+        self.ready_at: Optional[datetime] = None
+        self.detail: Optional[str] = None
+
+    async def run(self, predictor, executor, warm: bool = WARMUP_ON_STARTUP):
+        """Load and warm every bundle on the inference workers, then mark the service ready."""
+        try:
+            if warm:
+                registry = predictor.registry
+                start = perf_counter()
+                await executor.run(registry.preload)
+                self.load_ms = (perf_counter() - start) * 1000
+
+                # One warm-up per worker so each worker thread starts its own OpenMP team
+                start = perf_counter()
+                barrier = threading.Barrier(executor.workers)
+
+                def warm_worker():
+                    # Each task holds its thread until every worker has one,
+                    # so no thread can take two
+                    try:
+                        barrier.wait(WARMUP_BARRIER_TIMEOUT_S)
+                    except threading.BrokenBarrierError:
+                        pass
+                    return warm_up(predictor, registry)
+
+                try:
+                    results = await asyncio.gather(*(
+                        executor.run(warm_worker) for _ in range(executor.workers)
+                    ))
+                except BaseException:
+                    barrier.abort()
+                    raise
+                self.warm_ms = (perf_counter() - start) * 1000
+                for timings, _ in results:
+                    for name, ms in timings.items():
+                        self.bundles[name] = max(ms, self.bundles.get(name, 0.0))
+        except Exception as e:
+            self.detail = f"warm-up failed: {e}"
+            print(f"⚠️ Startup {self.detail}; /ready stays unavailable")
+            return
+
+        self.ready = True
+        self.ready_at = datetime.utcnow()
+        print(f"✅ Ready: import {self.import_ms:.0f} ms, load {self.load_ms or 0:.0f} ms, "
+              f"warm-up {self.warm_ms or 0:.0f} ms")
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "ready_at": self.ready_at,
+            "import_ms": self.import_ms,
+            "load_ms": self.load_ms,
+            "warm_ms": self.warm_ms,
+            "bundles_warm_ms": self.bundles,
+            "detail": self.detail,
+        }
@@ -0,0 +1,28 @@
+"""
+Small process-level helpers shared by the forecast service
+"""
+import os
+
+
+def current_rss_bytes():
+    """Resident set size of this process in bytes, or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def current_memory_usage():
+    """
+    Resident and shared (file-backed or copy-on-write) bytes of this process,
+    or None if unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            fields = f.read().split()
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        return {"rss_bytes": int(fields[1]) * page_size, "shared_bytes": int(fields[2]) * page_size}
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
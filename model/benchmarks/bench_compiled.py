@@ -0,0 +1,71 @@
+"""
+Microbenchmark: native LightGBM + XGBoost scoring vs the compiled ensemble.
+
+Run from model/:
+    python -m benchmarks.bench_compiled [--repeat 500] [--bundle 30d_all]
+"""
+import argparse
+import json
+from time import perf_counter
+
+import numpy as np
+
+from app import compiled
+from app.predictor import HybridPredictor
+from app.registry import ModelRegistry
+
+ROW_COUNTS = (1, 30)
+
+
+def _time_us(fn, repeat):
+    for _ in range(min(repeat, 20)):
+        fn()
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        start = perf_counter()
+        fn()
+        samples[i] = (perf_counter() - start) * 1e6
+    return {"p50_us": float(np.percentile(samples, 50)), "p95_us": float(np.percentile(samples, 95))}
+
+
+def bench_bundle(predictor, bundle, repeat):
+    ensemble = bundle.compiled
+    results = {}
+    for n in ROW_COUNTS:
+        blocks = [({"t": np.arange(1, n + 1)}, n)]
+        bundle.compiled = None
+        native_stats = _time_us(lambda: predictor._score_blocks(bundle, blocks), repeat)
+        bundle.compiled = ensemble
+        compiled_stats = _time_us(lambda: predictor._score_blocks(bundle, blocks), repeat)
+        results[f"{n}_rows"] = {
+            "native": native_stats,
+            ensemble.engine: compiled_stats,
+            "speedup_p50": native_stats["p50_us"] / compiled_stats["p50_us"],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-dir", default="models/")
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--bundle", help="Only benchmark one bundle, e.g. 30d_all")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.model_dir).load()
+    predictor = HybridPredictor(registry=registry, backend="native")
+    report = {}
+    for bundle in registry.bundles.values():
+        if args.bundle and bundle.name != f"hybrid_{args.bundle}":
+            continue
+        bundle.compiled = compiled.compile_bundle(bundle)
+        report[bundle.name] = bench_bundle(predictor, bundle, args.repeat)
+        for rows, stats in report[bundle.name].items():
+            print(f"{bundle.name:>18} {rows:>8}: native p50 {stats['native']['p50_us']:8.1f}us, "
+                  f"{bundle.compiled.engine} p50 {stats[bundle.compiled.engine]['p50_us']:8.1f}us "
+                  f"({stats['speedup_p50']:.1f}x)")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Added cost of prediction intervals: predict_series with and without a pair
+of quantile boosters in the bundle.
+
+The repo's bundles ship without quantile models, so this trains synthetic
+LightGBM quantile models (same features and tree count as the bundle's
+point LightGBM model) on the point model's own predictions plus noise.
+
+Run from model/:
+    python -m benchmarks.bench_quantiles [--repeat 500] [--bundle 30d_all]
+"""
+import argparse
+import json
+from time import perf_counter
+
+import lightgbm as lgb
+import numpy as np
+
+from app.features import build_feature_block
+from app.predictor import HybridPredictor
+from app.registry import ModelRegistry, _quantile_models
+from app.warmup import synthetic_request
+
+ALPHAS = (0.1, 0.9)
+
+
+def train_quantile_models(bundle, alphas=ALPHAS, n_rows=5000, seed=0):
+    """alpha -> {"booster", "features"} entries mimicking the bundle's LightGBM model."""
+    schema = bundle.lgb_schema
+    rng = np.random.default_rng(seed)
+    X = schema.allocate(n_rows)
+    X[:] = np.abs(rng.standard_normal(X.shape)) * rng.choice([1, 10, 1_000, 100_000], size=X.shape)
+    X[:, schema.index["t"]] = rng.integers(1, 60, n_rows)
+    y = bundle.lgb_model.predict(X) + rng.normal(0, 0.3, n_rows)
+
+    rounds = bundle.lgb_model.num_trees()
+    models = {}
+    for alpha in alphas:
+        params = {"objective": "quantile", "alpha": alpha, "verbose": -1, "num_leaves": 31}
+        booster = lgb.train(params, lgb.Dataset(X, y, feature_name=list(schema.names)), num_boost_round=rounds)
+        models[alpha] = {"booster": booster, "features": list(schema.names)}
+    return models
+
+
+def _time_ms(fn, repeat):
+    for _ in range(min(repeat, 20)):
+        fn()
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        start = perf_counter()
+        fn()
+        samples[i] = (perf_counter() - start) * 1000
+    return {"p50_ms": float(np.percentile(samples, 50)), "p95_ms": float(np.percentile(samples, 95))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-dir", default="models/")
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--bundle", help="Only benchmark one bundle, e.g. 30d_all")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.model_dir).load()
+    predictor = HybridPredictor(registry=registry, backend="native")
+    report = {}
+    for (horizon, video_type), bundle in registry.bundles.items():
+        if args.bundle and bundle.name != f"hybrid_{args.bundle}":
+            continue
+        request = synthetic_request(horizon, video_type)
+        block = build_feature_block(request)
+
+        def forecast():
+            return predictor.predict_series(block, horizon, video_type, request.current_day)
+
+        point = _time_ms(forecast, args.repeat)
+        bundle.quantile_models = _quantile_models({"quantiles": train_quantile_models(bundle)}, bundle.lgb_schema)
+        interval = _time_ms(forecast, args.repeat)
+        bundle.quantile_models = {}
+
+        report[bundle.name] = {
+            "point": point,
+            "with_interval": interval,
+            "added_p50_ms": interval["p50_ms"] - point["p50_ms"],
+            "trees_per_quantile": bundle.lgb_model.num_trees(),
+        }
+        print(f"{bundle.name:>18}: point p50 {point['p50_ms']:.3f} ms, "
+              f"with interval p50 {interval['p50_ms']:.3f} ms "
+              f"(+{report[bundle.name]['added_p50_ms']:.3f} ms)")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Benchmark suite for the forecast hot path.
+
+Cases:
+    parse/*               PredictionRequest validation of a JSON body, nested vs compact daily metrics
+    features/*            build_feature_block and build_features_series per request
+    predict_series/<name> HybridPredictor.predict_series for every bundle in models/
+    asgi/predict          POST /predict through an in-process ASGI client
+    batch/<n>             one /predict/batch group of n videos (features, scoring, responses)
+    arrow/<n>             the same n videos as an Arrow upload to /predict/arrow (needs pyarrow)
+
+Every case reports latency percentiles in ms and throughput (requests or
+videos per second) as JSON. `--check` compares p50 latencies with a stored
+baseline and exits non-zero on a regression; cases missing from the
+baseline are listed as unchecked. Baselines are only comparable on the
+machine that recorded them, and the arrow cases are only recorded where
+pyarrow is installed.
+
+Run from model/:
+    python -m benchmarks.suite [--repeat 200] [--out results.json]
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --check benchmarks/baseline.json [--tolerance 0.25]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import sys
+from time import perf_counter
+from typing import Callable, Dict
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_requests
+
+BATCH_SIZES = (1, 10, 100, 1000)
+BATCH_BUNDLE = ("30d", "all")
+DEFAULT_TOLERANCE = 0.25
+# Requests cycled through by the per-request cases
+REQUEST_POOL = 64
+
+
+def measure(fn: Callable[[], None], repeat: int, items: int = 1, warmup: int = 5) -> Dict[str, float]:
+    """Latency percentiles of `fn` in ms and throughput in items per second."""
+    for _ in range(warmup):
+        fn()
+    gc.collect()
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        start = perf_counter()
+        fn()
+        samples[i] = (perf_counter() - start) * 1000
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "repeat": repeat,
+        "items": items,
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "throughput_per_s": float(items * 1000 / samples.mean()),
+    }
+
+
+def cycle(values):
+    """A zero-argument function returning the next value of `values` on each call."""
+    state = {"i": -1}
+
+    def next_value():
+        state["i"] = (state["i"] + 1) % len(values)
+        return values[state["i"]]
+    return next_value
+
+
+def bench_parse(repeat: int) -> Dict[str, dict]:
+    from app.models import PredictionRequest
+
+    results = {}
+    for name, compact in (("nested", False), ("compact", True)):
+        requests = synthetic_requests(REQUEST_POOL, seed=1, compact=compact)
+        next_body = cycle([r.model_dump_json(exclude_none=True) for r in requests])
+        results[f"parse/{name}"] = measure(lambda: PredictionRequest.model_validate_json(next_body()), repeat)
+    return results
+
+
+def bench_features(repeat: int) -> Dict[str, dict]:
+    from app.features import build_feature_block
+    from app.main import build_features_series
+
+    next_request = cycle(synthetic_requests(REQUEST_POOL, seed=1))
+    return {
+        "features/build_feature_block": measure(lambda: build_feature_block(next_request()), repeat),
+        "features/build_features_series": measure(lambda: build_features_series(next_request()), repeat),
+    }
+
+
+def bench_predict_series(predictor, repeat: int) -> Dict[str, dict]:
+    from app.features import build_feature_block
+
+    results = {}
+    for horizon, video_type in sorted(predictor.registry.keys()):
+        requests = synthetic_requests(REQUEST_POOL, horizon, video_type, seed=2)
+        next_item = cycle([(build_feature_block(r), r.current_day) for r in requests])
+
+        def run():
+            block, current_day = next_item()
+            predictor.predict_series(block, horizon, video_type, current_day)
+        results[f"predict_series/hybrid_{horizon}_{video_type}"] = measure(run, repeat)
+    return results
+
+
+def bench_asgi(main, repeat: int) -> Dict[str, dict]:
+    import httpx
+
+    bodies = [r.model_dump_json() for r in synthetic_requests(REQUEST_POOL, seed=3)]
+    next_body = cycle(bodies)
+    headers = {"content-type": "application/json"}
+
+    async def run_all():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def post():
+                response = await client.post("/predict", content=next_body(), headers=headers)
+                response.raise_for_status()
+
+            for _ in range(5):
+                await post()
+            gc.collect()
+            samples = np.empty(repeat)
+            for i in range(repeat):
+                start = perf_counter()
+                await post()
+                samples[i] = (perf_counter() - start) * 1000
+            return samples
+
+    samples = asyncio.run(run_all())
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {"asgi/predict": {
+        "repeat": repeat,
+        "items": 1,
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "throughput_per_s": float(1000 / samples.mean()),
+    }}
+
+
+def bench_batch(main, registry, repeat: int) -> Dict[str, dict]:
+    horizon, video_type = BATCH_BUNDLE
+    results = {}
+    for size in BATCH_SIZES:
+        members = list(enumerate(synthetic_requests(size, horizon, video_type, seed=4)))
+        # Keep the large batches to a few seconds in total
+        runs = max(3, min(repeat, 2000 // size))
+        results[f"batch/{size}"] = measure(
+            lambda: main.score_group(horizon, video_type, members, registry), runs, items=size, warmup=2
+        )
+    return results
+
+
+def bench_arrow(main, registry, repeat: int) -> Dict[str, dict]:
+    from app import columnar
+    if not columnar.available():
+        return {}
+    import pyarrow as pa
+
+    horizon, video_type = BATCH_BUNDLE
+    results = {}
+    for size in BATCH_SIZES:
+        table = columnar.table_from_requests(synthetic_requests(size, horizon, video_type, seed=4))
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        body = sink.getvalue().to_pybytes()
+        runs = max(3, min(repeat, 2000 // size))
+        results[f"arrow/{size}"] = measure(
+            lambda: main.score_arrow(body, columnar.ARROW_STREAM_MEDIA_TYPE, registry, None, None),
+            runs, items=size, warmup=2,
+        )
+    return results
+
+
+def environment() -> Dict[str, str]:
+    import lightgbm
+    import xgboost
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "lightgbm": lightgbm.__version__,
+        "xgboost": xgboost.__version__,
+    }
+
+
+def run_suite(repeat: int, only=None) -> Dict[str, dict]:
+    # Every request must be scored, not served from the response cache
+    os.environ["PREDICTION_CACHE_SIZE"] = "0"
+    from app import main
+
+    # The service's registry, fully loaded so no case pays for a lazy load
+    registry = main.predictor.registry.preload()
+    cases = {}
+    suites = {
+        "parse": lambda: bench_parse(repeat),
+        "features": lambda: bench_features(repeat),
+        "predict_series": lambda: bench_predict_series(main.predictor, repeat),
+        "asgi": lambda: bench_asgi(main, repeat),
+        "batch": lambda: bench_batch(main, registry, repeat),
+        "arrow": lambda: bench_arrow(main, registry, repeat),
+    }
+    for name, run in suites.items():
+        if only and name not in only:
+            continue
+        cases.update(run())
+    return cases
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = DEFAULT_TOLERANCE):
+    """(case, baseline p50, current p50, ratio) for every case whose p50 exceeds baseline by > tolerance."""
+    regressions = []
+    for case, stats in results.items():
+        base = baseline.get(case)
+        if base is None or base["p50_ms"] <= 0:
+            continue
+        ratio = stats["p50_ms"] / base["p50_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append((case, base["p50_ms"], stats["p50_ms"], ratio))
+    return regressions
+
+
+def unchecked(results: Dict[str, dict], baseline: Dict[str, dict]):
+    """Cases that `compare` cannot check because the baseline has no entry for them."""
+    return [case for case in results if case not in baseline]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--only", nargs="+", choices=["parse", "features", "predict_series", "asgi", "batch", "arrow"])
+    parser.add_argument("--out", help="Write the JSON report to this file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Store the results as the baseline")
+    parser.add_argument("--check", metavar="PATH", help="Compare with this baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative p50 slowdown before --check fails (default 0.25)")
+    args = parser.parse_args()
+
+    report = {"environment": environment(), "cases": run_suite(args.repeat, args.only)}
+    for case, stats in report["cases"].items():
+        print(f"{case:>36}: p50 {stats['p50_ms']:9.3f}ms  p95 {stats['p95_ms']:9.3f}ms  "
+              f"p99 {stats['p99_ms']:9.3f}ms  {stats['throughput_per_s']:10.1f}/s", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                f.write(text + "\n")
+    if not args.out:
+        print(text)
+
+    if args.check:
+        with open(args.check) as f:
+            baseline = json.load(f)
+        regressions = compare(report["cases"], baseline["cases"], args.tolerance)
+        for case, before, after, ratio in regressions:
+            print(f"⚠️ {case}: p50 {before:.3f}ms -> {after:.3f}ms ({ratio:.2f}x)", file=sys.stderr)
+        missing = unchecked(report["cases"], baseline["cases"])
+        if missing:
+            print(f"⚠️ Not in the baseline, so not checked: {', '.join(missing)}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No p50 regression beyond {args.tolerance:.0%} of the baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Seeded generator of realistic PredictionRequests for benchmarks.
+
+Videos get a random channel size, publish date, observed-day count and a
+cumulative view curve that grows with diminishing daily gains; shorts and
+long videos get matching metadata. Optional enrichment (text, thumbnail,
+category leader) is present on about half of them, so both the supplied and
+the defaulted feature paths are exercised. With `compact=True` the daily
+metrics are sent as daily_series arrays instead of the nested dict.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import numpy as np
+
+from app.models import PredictionRequest
+
+HORIZONS = ("7d", "30d")
+VIDEO_TYPES = ("all", "short", "long")
+
+
+def random_request(rng: np.random.Generator, horizon: str, video_type: str, index: int = 0,
+                   compact: bool = False) -> PredictionRequest:
+    short = video_type == "short" or (video_type == "all" and rng.random() < 0.4)
+    current_day = int(rng.integers(1, 15))
+    published_at = datetime(2024, 1, 1) + timedelta(days=int(rng.integers(0, 365)), hours=int(rng.integers(0, 24)))
+    subscribers = int(10 ** rng.uniform(2, 7))
+
+    # Cumulative views: large day-one gain, decaying afterwards
+    first_day = subscribers * rng.uniform(0.01, 0.5)
+    gains = first_day * rng.uniform(0.3, 0.9) ** np.arange(current_day)
+    views = np.cumsum(gains).astype(np.int64) + 1
+    like_rate, comment_rate = rng.uniform(0.01, 0.08), rng.uniform(0.001, 0.01)
+
+    likes, comments = (views * like_rate).astype(np.int64), (views * comment_rate).astype(np.int64)
+    if compact:
+        daily = {"daily_series": {"views": views.tolist(), "likes": likes.tolist(), "comments": comments.tolist()}}
+    else:
+        daily = {"daily_metrics": {
+            day: {"views": int(v), "likes": int(l), "comments": int(c)}
+            for day, (v, l, c) in enumerate(zip(views, likes, comments), start=1)
+        }}
+
+    enriched = rng.random() < 0.5
+    return PredictionRequest(
+        video_id=f"bench-{index:06d}",
+        category_id=int(rng.integers(1, 45)),
+        video_metadata={
+            "duration_seconds": int(rng.integers(10, 180)) if short else int(rng.integers(181, 3600)),
+            "width": 1080 if short else 1920,
+            "height": 1920 if short else 1080,
+            "fps": float(rng.choice([24, 30, 60])),
+            "orientation": "portrait" if short else "landscape",
+            "resolution": "1080p",
+        },
+        published_at=published_at,
+        channel_info={
+            "channel_id": f"channel-{int(rng.integers(0, 1000))}",
+            "subscribers": subscribers,
+            "total_views": subscribers * int(rng.integers(10, 500)),
+            "total_videos": int(rng.integers(1, 2000)),
+            "created_at": published_at - timedelta(days=int(rng.integers(30, 4000))),
+        },
+        **daily,
+        text_features={"title": "Benchmark video", "title_pca2": float(rng.normal())} if enriched else None,
+        thumbnail_features=(
+            {"sharpness": float(rng.uniform(50, 2000)), "colorfulness": float(rng.uniform(0, 150))}
+            if enriched else None
+        ),
+        category_leader={
+            "subscribers": 10_000_000,
+            "total_views": 5_000_000_000,
+            "total_videos": 3000,
+            "age_days": 3650.0,
+            "avg_views_per_video_per_day": 450.0,
+        } if enriched else None,
+        current_day=current_day,
+        horizon=horizon,
+        video_type=video_type,
+    )
+
+
+def synthetic_requests(n: int, horizon: Optional[str] = None, video_type: Optional[str] = None,
+                       seed: int = 0, compact: bool = False) -> List[PredictionRequest]:
+    """`n` requests for one bundle, or spread over every bundle when horizon/video_type are None."""
+    rng = np.random.default_rng(seed)
+    return [
+        random_request(
+            rng,
+            horizon or HORIZONS[i % len(HORIZONS)],
+            video_type or VIDEO_TYPES[(i // len(HORIZONS)) % len(VIDEO_TYPES)],
+            index=i,
+            compact=compact,
+        )
+        for i in range(n)
+    ]
@@ -0,0 +1,100 @@
+"""Tests for the /predict/batch endpoint."""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.executor import ExecutorSaturated, InferenceExecutor
+from app.features import build_feature_block
+from app.warmup import synthetic_request
+
+
+class LimitedExecutor(InferenceExecutor):
+    """Admits `free` tasks, then reports the queue as full."""
+
+    def __init__(self, free):
+        super().__init__(workers=1, queue_size=0)
+        self.free = free
+
+    def _reserve(self):
+        if self.free == 0:
+            self.rejected += 1
+            raise ExecutorSaturated("Inference queue is full (1 workers, 0 queued)")
+        self.free -= 1
+        super()._reserve()
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def batch_item(video_id, horizon, video_type, current_day=3):
+    request = synthetic_request(horizon, video_type).model_copy(update={"video_id": video_id})
+    return {**json.loads(request.model_dump_json()), "current_day": current_day}
+
+
+def post_batch(client, items):
+    response = client.post("/predict/batch", json={"requests": items})
+    lines = [json.loads(line) for line in response.text.splitlines()] if response.status_code == 200 else None
+    return response, lines
+
+
+def test_groups_by_bundle_and_keeps_request_order(client, monkeypatch):
+    executor = InferenceExecutor(workers=2, queue_size=2)
+    monkeypatch.setattr(main, "inference_executor", executor)
+    items = [
+        batch_item("a", "7d", "all"),
+        batch_item("b", "30d", "short"),
+        # Only days 1..3 are observed
+        batch_item("c", "7d", "all", current_day=5),
+        batch_item("d", "30d", "short"),
+        batch_item("e", "7d", "all"),
+    ]
+
+    response, groups = post_batch(client, items)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    # Groups come back in order of first appearance, items in request order
+    assert [(g["horizon"], g["video_type"], g["size"]) for g in groups] == [("7d", "all", 3), ("30d", "short", 2)]
+    assert [p["video_id"] for p in groups[0]["predictions"]] == ["a", "e"]
+    assert [p["video_id"] for p in groups[1]["predictions"]] == ["b", "d"]
+    # The invalid item fails alone
+    assert [(e["index"], e["video_id"]) for e in groups[0]["errors"]] == [(2, "c")]
+    assert "current_day" in groups[0]["errors"][0]["detail"]
+    assert groups[1]["errors"] == []
+
+    for group in groups:
+        expected = main.predictor.predict_series(
+            build_feature_block(synthetic_request(group["horizon"], group["video_type"])),
+            group["horizon"], group["video_type"], 3,
+        )
+        for prediction in group["predictions"]:
+            assert len(prediction["predictions"]) == int(group["horizon"][:-1])
+            assert [p["predicted_views"] for p in prediction["predictions"]] == [p["predicted"] for p in expected]
+    # Every group ran on the bounded inference pool
+    assert executor.stats()["completed"] == 2
+
+
+def test_rejected_when_inference_pool_is_full(client, monkeypatch):
+    monkeypatch.setattr(main, "inference_executor", LimitedExecutor(free=0))
+
+    response, _ = post_batch(client, [batch_item("a", "7d", "all")])
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_group_that_finds_pool_full_is_reported_per_item(client, monkeypatch):
+    monkeypatch.setattr(main, "inference_executor", LimitedExecutor(free=1))
+    items = [batch_item("a", "7d", "all"), batch_item("b", "7d", "long"), batch_item("c", "7d", "long")]
+
+    response, groups = post_batch(client, items)
+
+    assert response.status_code == 200
+    assert [p["video_id"] for p in groups[0]["predictions"]] == ["a"]
+    assert groups[1]["predictions"] == []
+    assert [(e["index"], e["video_id"]) for e in groups[1]["errors"]] == [(1, "b"), (2, "c")]
+    assert "queue is full" in groups[1]["errors"][0]["detail"]
@@ -0,0 +1,92 @@
+"""Tests for the micro-batching request coalescer."""
+import asyncio
+import threading
+
+from app.batcher import MicroBatcher
+from app.executor import InferenceExecutor
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, key, payloads):
+        self.calls.append((key, list(payloads)))
+        return [ValueError(p) if p == "bad" else (key, p * 2) for p in payloads]
+
+def test_full_batch_is_scored_in_one_call():
+    score = Recorder()
+    batcher = MicroBatcher(score, InferenceExecutor(workers=1, queue_size=4), max_wait_ms=1000, max_batch=4)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.submit("7d_all", i) for i in range(4)))
+
+    results = asyncio.run(scenario())
+    assert [r for r, _ in results] == [("7d_all", i * 2) for i in range(4)]
+    assert all(timing.batch_size == 4 for _, timing in results)
+    assert score.calls == [("7d_all", [0, 1, 2, 3])]
+    assert batcher.stats()["flushed_full"] == 1
+
+def test_partial_batches_flush_after_max_wait_per_bundle():
+    score = Recorder()
+    batcher = MicroBatcher(score, InferenceExecutor(workers=1, queue_size=4), max_wait_ms=5, max_batch=8)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit("7d_all", 1), batcher.submit("30d_all", 2), batcher.submit("7d_all", 3)
+        )
+
+    results = asyncio.run(scenario())
+    assert [r for r, _ in results] == [("7d_all", 2), ("30d_all", 4), ("7d_all", 6)]
+    assert sorted(score.calls) == [("30d_all", [2]), ("7d_all", [1, 3])]
+    stats = batcher.stats()
+    assert stats["flushed_timeout"] == 2
+    assert stats["requests"] == 3
+    assert stats["batch_wait_ms"]["p50"] >= 0
+
+def test_item_errors_only_reach_their_caller():
+    batcher = MicroBatcher(Recorder(), InferenceExecutor(workers=1, queue_size=4), max_wait_ms=5, max_batch=2)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit("7d_all", "bad"), batcher.submit("7d_all", "ok"), return_exceptions=True
+        )
+
+    bad, ok = asyncio.run(scenario())
+    assert isinstance(bad, ValueError)
+    assert ok[0] == ("7d_all", "okok")
+
+def test_batch_failure_reaches_every_caller():
+    def broken(key, payloads):
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher(broken, InferenceExecutor(workers=1, queue_size=4), max_wait_ms=5, max_batch=2)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit("7d_all", 1), batcher.submit("7d_all", 2), return_exceptions=True
+        )
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(scenario()))
+
+def test_in_flight_batches_are_referenced_until_done():
+    release = threading.Event()
+
+    def blocked(key, payloads):
+        release.wait(5)
+        return [(key, p) for p in payloads]
+
+    batcher = MicroBatcher(blocked, InferenceExecutor(workers=1, queue_size=4), max_wait_ms=1000, max_batch=1)
+
+    async def scenario():
+        pending = asyncio.ensure_future(batcher.submit("7d_all", 1))
+        await asyncio.sleep(0.01)
+        in_flight = len(batcher._tasks)
+        release.set()
+        result, _ = await pending
+        await asyncio.sleep(0)
+        return in_flight, result
+
+    in_flight, result = asyncio.run(scenario())
+    assert in_flight == 1
+    assert result == ("7d_all", 1)
+    assert not batcher._tasks
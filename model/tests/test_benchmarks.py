@@ -0,0 +1,33 @@
+"""Tests for the benchmark suite's request generator and regression check."""
+from app.features import build_feature_block
+from benchmarks.suite import compare, measure, unchecked
+from benchmarks.synthetic import synthetic_requests
+
+
+def test_synthetic_requests_are_valid_and_reproducible():
+    requests = synthetic_requests(12, seed=7)
+    assert {(r.horizon.value, r.video_type.value) for r in requests} == {
+        (h, v) for h in ("7d", "30d") for v in ("all", "short", "long")
+    }
+    for request in requests:
+        block = build_feature_block(request)
+        assert len(block) == request.current_day
+    assert [r.model_dump() for r in synthetic_requests(12, seed=7)] == [r.model_dump() for r in requests]
+
+
+def test_measure_reports_percentiles_and_throughput():
+    stats = measure(lambda: None, repeat=20, items=10, warmup=1)
+    assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+    assert stats["throughput_per_s"] > 0
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {"a": {"p50_ms": 1.0}, "b": {"p50_ms": 1.0}, "c": {"p50_ms": 1.0}}
+    results = {"a": {"p50_ms": 1.2}, "b": {"p50_ms": 1.5}, "c": {"p50_ms": 0.5}, "new": {"p50_ms": 9.0}}
+    assert compare(results, baseline, tolerance=0.25) == [("b", 1.0, 1.5, 1.5)]
+
+
+def test_cases_missing_from_the_baseline_are_reported_unchecked():
+    baseline = {"a": {"p50_ms": 1.0}}
+    results = {"a": {"p50_ms": 1.0}, "arrow/10": {"p50_ms": 9.0}}
+    assert unchecked(results, baseline) == ["arrow/10"]
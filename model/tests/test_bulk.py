@@ -0,0 +1,91 @@
+"""Tests for the offline bulk scorer."""
+import os
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pacsv = pytest.importorskip("pyarrow.csv")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from app import bulk, columnar  # noqa: E402
+from app.features import build_feature_block  # noqa: E402
+from app.predictor import HybridPredictor  # noqa: E402
+from app.registry import ModelRegistry  # noqa: E402
+from benchmarks.synthetic import synthetic_requests  # noqa: E402
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+
+
+def long_table(requests):
+    """One row per video and observed day, static columns repeated."""
+    rows = []
+    for request in requests:
+        for day in sorted(request.daily_metrics):
+            m = request.daily_metrics[day]
+            rows.append({
+                "video_id": request.video_id,
+                "horizon": request.horizon.value,
+                "video_type": request.video_type.value,
+                "published_at": request.published_at.isoformat(),
+                "day": day,
+                "views": m.views,
+                "likes": m.likes,
+                "comments": m.comments,
+                "duration_seconds": request.video_metadata.duration_seconds,
+                "channel_subscribers": request.channel_info.subscribers,
+                "channel_total_views": request.channel_info.total_views,
+                "channel_total_videos": request.channel_info.total_videos,
+            })
+    return pa.Table.from_pylist(rows)
+
+
+@pytest.fixture(scope="module")
+def expected():
+    requests = synthetic_requests(30, seed=9)
+    for request in requests:
+        # The long format only carries the core columns
+        request.text_features = request.thumbnail_features = request.category_leader = None
+        request.current_day = len(request.daily_metrics)
+    predictor = HybridPredictor(registry=ModelRegistry(MODEL_DIR).load())
+    forecasts = {}
+    for request in requests:
+        preds = predictor.predict_series(
+            build_feature_block(request), request.horizon.value, request.video_type.value, request.current_day
+        )
+        forecasts.update({(request.video_id, p["day"]): p["predicted"] for p in preds})
+    return requests, forecasts
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_long_csv_in_small_chunks(tmp_path, expected, workers):
+    requests, forecasts = expected
+    source, target = tmp_path / "videos.csv", tmp_path / "predictions.parquet"
+    pacsv.write_csv(long_table(requests), source)
+
+    # Chunks of ~7 rows split most videos, which must be carried over whole
+    totals = bulk.score_file(str(source), str(target), MODEL_DIR, workers=workers, chunk_size=7, progress=None)
+
+    rows = pq.read_table(target).to_pylist()
+    assert totals["videos"] == len(requests) and totals["failed"] == 0
+    assert totals["predictions"] == len(rows) == len(forecasts)
+    assert {(row["video_id"], row["day"]): row["predicted_views"] for row in rows} == pytest.approx(forecasts)
+
+
+def test_wide_parquet_to_csv(tmp_path, expected):
+    requests, forecasts = expected
+    source, target = tmp_path / "videos.parquet", tmp_path / "predictions.csv"
+    pq.write_table(columnar.table_from_requests(requests), source)
+
+    assert bulk.main([str(source), str(target), "--model-dir", MODEL_DIR, "--workers", "0",
+                      "--chunk-size", "8"]) == 0
+    rows = pacsv.read_csv(target).to_pylist()
+    assert {(row["video_id"], row["day"]): row["predicted_views"] for row in rows} == pytest.approx(forecasts)
+
+
+def test_long_input_without_views_is_an_input_error(tmp_path, expected, capsys):
+    requests, _ = expected
+    source, target = tmp_path / "videos.csv", tmp_path / "predictions.csv"
+    pacsv.write_csv(long_table(requests[:2]).drop_columns(["views"]), source)
+
+    assert bulk.main([str(source), str(target), "--model-dir", MODEL_DIR, "--workers", "0"]) == 1
+    assert "Missing columns: views" in capsys.readouterr().err
@@ -0,0 +1,73 @@
+"""Tests for the forecast result cache."""
+import json
+from types import SimpleNamespace
+
+from app import cache as cache_module
+from app.cache import PredictionCache, request_fingerprint
+from app.models import PredictionRequest
+
+REQUEST = {
+    "video_id": "abc123",
+    "category_id": 10,
+    "video_metadata": {
+        "duration_seconds": 120, "width": 1920, "height": 1080, "fps": 30,
+        "orientation": "landscape", "resolution": "1080p",
+    },
+    "published_at": "2024-01-01T12:00:00Z",
+    "channel_info": {
+        "channel_id": "c1", "subscribers": 1000, "total_views": 50000,
+        "total_videos": 20, "created_at": "2020-01-01T00:00:00Z",
+    },
+    "daily_metrics": {
+        "1": {"views": 100, "likes": 10, "comments": 1},
+        "2": {"views": 250, "likes": 20, "comments": 3},
+    },
+    "current_day": 2,
+    "horizon": "7d",
+}
+
+
+def bundle(checksum="a" * 64, version="v1.0"):
+    return SimpleNamespace(name="hybrid_7d_all", version=version, checksum=checksum)
+
+
+def test_lru_eviction_and_counters():
+    c = PredictionCache(max_entries=2, ttl_seconds=60)
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1  # "b" is now least recently used
+    c.put("c", 3)
+    assert c.get("b") is None
+    assert c.get("c") == 3
+    stats = c.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 1, 1, 2)
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module, "monotonic", lambda: now[0])
+    c = PredictionCache(max_entries=4, ttl_seconds=10)
+    c.put("a", 1)
+    now[0] += 11
+    assert c.get("a") is None
+    assert c.stats()["expirations"] == 1
+
+
+def test_disabled_cache_stores_nothing():
+    c = PredictionCache(max_entries=0)
+    c.put("a", 1)
+    assert not c.enabled
+    assert c.get("a") is None
+
+
+def test_fingerprint_normalizes_request_and_tracks_bundle():
+    reordered = dict(reversed(list(REQUEST.items())))
+    reordered["published_at"] = "2024-01-01T12:00:00+00:00"
+    a = PredictionRequest(**REQUEST)
+    b = PredictionRequest(**json.loads(json.dumps(reordered)))
+    assert request_fingerprint(a, bundle()) == request_fingerprint(b, bundle())
+
+    changed = PredictionRequest(**{**REQUEST, "current_day": 1})
+    assert request_fingerprint(a, bundle()) != request_fingerprint(changed, bundle())
+    assert request_fingerprint(a, bundle()) != request_fingerprint(a, bundle(checksum="b" * 64))
+    assert request_fingerprint(a, bundle()) != request_fingerprint(a, bundle(version="v1.1"))
@@ -0,0 +1,124 @@
+"""Tests for Arrow/Parquet batch scoring."""
+import io
+import os
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import columnar  # noqa: E402
+from app.features import build_feature_block  # noqa: E402
+from app.predictor import HybridPredictor  # noqa: E402
+from app.registry import ModelRegistry  # noqa: E402
+from benchmarks.synthetic import synthetic_requests  # noqa: E402
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return HybridPredictor(registry=ModelRegistry(MODEL_DIR).load(), backend="native")
+
+
+def stream_bytes(table, max_chunksize=None):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=max_chunksize)
+    return sink.getvalue().to_pybytes()
+
+
+def score(predictor, body, media_type=columnar.ARROW_STREAM_MEDIA_TYPE, **kwargs):
+    out = columnar.score_upload(predictor, body, media_type, **kwargs)
+    return pa.ipc.open_stream(out).read_all().to_pylist()
+
+
+def test_matches_per_request_forecasts(predictor):
+    requests = synthetic_requests(40, seed=5)
+    # Gaps in the observed days
+    for request in requests[::3]:
+        if request.current_day >= 4:
+            del request.daily_metrics[2]
+            request.current_day -= 1
+
+    rows = score(predictor, stream_bytes(columnar.table_from_requests(requests), max_chunksize=16))
+    got = {(row["video_id"], row["day"]): row for row in rows}
+    assert len(rows) == sum(int(r.horizon.value[:-1]) for r in requests)
+    for request in requests:
+        expected = predictor.predict_series(
+            build_feature_block(request), request.horizon.value, request.video_type.value, request.current_day
+        )
+        for p in expected:
+            row = got[(request.video_id, p["day"])]
+            assert row["predicted_views"] == p["predicted"]
+            assert row["error"] is None
+            assert row["model_used"].startswith(f"hybrid_{request.horizon.value}_{request.video_type.value}@")
+
+
+def test_unscorable_rows_are_reported_not_raised(predictor):
+    table = columnar.table_from_requests(synthetic_requests(3, "7d", "all", seed=1))
+    current_day = table.column("current_day").to_pylist()
+    current_day[1] = 99
+    table = table.set_column(table.schema.get_field_index("current_day"), "current_day",
+                             pa.array(current_day, pa.int32()))
+
+    rows = score(predictor, stream_bytes(table))
+    failed = [row for row in rows if row["error"]]
+    assert [row["video_id"] for row in failed] == ["bench-000001"]
+    assert failed[0]["day"] is None and "current_day" in failed[0]["error"]
+    assert len(rows) == 2 * 7 + 1
+
+
+def test_parquet_upload_and_upload_wide_labels(predictor):
+    table = columnar.table_from_requests(synthetic_requests(5, "30d", "short", seed=2))
+    table = table.drop_columns(["horizon", "video_type", "days", "title_pca2", "sharpness", "colorfulness"])
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+
+    rows = score(predictor, buffer.getvalue(), columnar.PARQUET_MEDIA_TYPE, horizon="30d", video_type="short")
+    assert len(rows) == 5 * 30
+    assert {(row["horizon"], row["video_type"]) for row in rows} == {("30d", "short")}
+
+
+def test_endpoint_rejects_missing_columns():
+    from app.main import app
+
+    client = TestClient(app)
+    table = columnar.table_from_requests(synthetic_requests(2, "7d", "all", seed=3))
+    response = client.post("/predict/arrow", content=stream_bytes(table.drop_columns(["views"])),
+                           headers={"content-type": columnar.ARROW_STREAM_MEDIA_TYPE})
+    assert response.status_code == 422 and "views" in response.json()["detail"]
+
+    response = client.post("/predict/arrow", content=stream_bytes(table),
+                           headers={"content-type": columnar.ARROW_STREAM_MEDIA_TYPE})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == columnar.ARROW_STREAM_MEDIA_TYPE
+    assert pa.ipc.open_stream(response.content).read_all().num_rows == 2 * 7
+
+
+@pytest.mark.parametrize("name,values", [
+    ("current_day", pa.array(["3", "three"])),
+    ("channel_subscribers", pa.array([True, False])),
+    ("title_pca2", pa.array(["0.1", None])),
+    ("views", pa.array([["1", "2"], ["3"]])),
+    ("published_at", pa.array(["2024-01-01", "2024-01-02"])),
+])
+def test_wrong_column_type_is_an_input_error(predictor, name, values):
+    table = columnar.table_from_requests(synthetic_requests(2, "7d", "all", seed=4))
+    table = table.set_column(table.schema.get_field_index(name), name, values)
+
+    with pytest.raises(columnar.ColumnarInputError, match=name):
+        score(predictor, stream_bytes(table))
+
+
+def test_endpoint_rejects_wrong_column_type():
+    from app.main import app
+
+    table = columnar.table_from_requests(synthetic_requests(2, "7d", "all", seed=3))
+    table = table.set_column(table.schema.get_field_index("duration_seconds"), "duration_seconds",
+                             pa.array(["long", "short"]))
+    response = TestClient(app).post("/predict/arrow", content=stream_bytes(table),
+                                    headers={"content-type": columnar.ARROW_STREAM_MEDIA_TYPE})
+    assert response.status_code == 422 and "duration_seconds" in response.json()["detail"]
@@ -0,0 +1,90 @@
+"""Parity tests for the compiled single-ensemble backend."""
+import os
+
+import numpy as np
+import pytest
+import xgboost as xgb
+
+pytest.importorskip("treelite")
+
+from app import compiled
+from app.predictor import HybridPredictor
+from app.registry import HORIZONS, VIDEO_TYPES, ModelRegistry
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+BUNDLE_KEYS = [(h, v) for h in HORIZONS for v in VIDEO_TYPES]
+
+
+@pytest.fixture(scope="module")
+def native_registry():
+    return ModelRegistry(MODEL_DIR).load()
+
+
+@pytest.fixture(scope="module")
+def compiled_registry():
+    registry = ModelRegistry(MODEL_DIR).load()
+    for bundle in registry.bundles.values():
+        bundle.compiled = compiled.compile_bundle(bundle, compile_library=False)
+    return registry
+
+
+def random_rows(schema, n, seed=0):
+    """Feature rows spanning the magnitudes seen in production."""
+    rng = np.random.default_rng(seed)
+    X = schema.allocate(n)
+    scale = rng.choice([1, 10, 1_000, 100_000], size=X.shape)
+    X[:] = np.abs(rng.standard_normal(X.shape)) * scale
+    X[:, schema.index["t"]] = rng.integers(1, 60, n)
+    return X
+
+
+def native_blend(bundle, X, schema):
+    lgb_cols = [schema.index[f] for f in bundle.lgb_schema.names]
+    xgb_cols = [schema.index[f] for f in bundle.xgb_schema.names]
+    lgb_pred = bundle.lgb_model.predict(X[:, lgb_cols])
+    dmatrix = xgb.DMatrix(np.ascontiguousarray(X[:, xgb_cols]), feature_names=bundle.xgb_features)
+    xgb_pred = bundle.xgb_model.predict(dmatrix)
+    return bundle.weights["lightgbm"] * lgb_pred + bundle.weights["xgboost"] * xgb_pred
+
+
+@pytest.mark.parametrize("key", BUNDLE_KEYS, ids=lambda k: f"{k[0]}_{k[1]}")
+def test_compiled_ensemble_matches_native_blend(compiled_registry, key):
+    bundle = compiled_registry.get(*key)
+    schema = bundle.compiled.schema
+    X = random_rows(schema, 500)
+
+    np.testing.assert_allclose(
+        bundle.compiled.predict(X), native_blend(bundle, X, schema), rtol=0, atol=1e-4
+    )
+
+
+def test_compiled_backend_matches_native_forecast(native_registry, compiled_registry):
+    base = {
+        "t": 5, "views_cml_t": 12_000, "likes_cml_t": 800, "comments_cml_t": 90,
+        "views_dif_last1": 1_500, "views_dif_last3_mean": 1_800.0, "growth_ratio_t": 4.2,
+        "weekday": 2, "hour_bin": 3, "is_short": 0, "video_duration_seconds": 640,
+        "title_pca2": 0.12, "sharpness": 80.0, "colorfulness": 35.0,
+    }
+    native = HybridPredictor(registry=native_registry)
+    fast = HybridPredictor(registry=compiled_registry)
+
+    for horizon, video_type in BUNDLE_KEYS:
+        expected = native.predict_series([base] * 5, horizon, video_type, current_day=5)
+        actual = fast.predict_series([base] * 5, horizon, video_type, current_day=5)
+
+        assert [p["day"] for p in actual] == [p["day"] for p in expected]
+        np.testing.assert_allclose(
+            [p["predicted"] for p in actual], [p["predicted"] for p in expected], rtol=1e-4
+        )
+
+
+@pytest.mark.slow
+def test_compiled_library_matches_interpreter(native_registry, tmp_path):
+    pytest.importorskip("tl2cgen")
+    bundle = native_registry.get("7d", "all")
+    library = compiled.compile_bundle(bundle, cache_dir=str(tmp_path))
+    interpreter = compiled.compile_bundle(bundle, compile_library=False)
+    assert library.engine == "tl2cgen"
+
+    X = random_rows(library.schema, 200, seed=1)
+    np.testing.assert_allclose(library.predict(X), interpreter.predict(X), rtol=0, atol=1e-9)
@@ -0,0 +1,70 @@
+"""Tests for the compact daily_series request format."""
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from app.features import build_feature_block, daily_arrays
+from app.models import PredictionRequest
+from app.predictor import HybridPredictor
+from app.registry import ModelRegistry
+from app.warmup import synthetic_request
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+
+
+def compact_payload(request, order=None):
+    """The request's payload with daily_metrics rewritten as daily_series arrays."""
+    payload = request.model_dump(exclude={"daily_metrics"})
+    days = order or sorted(request.daily_metrics)
+    metrics = [request.daily_metrics[d] for d in days]
+    payload["daily_series"] = {
+        "days": days,
+        "views": [m.views for m in metrics],
+        "likes": [m.likes for m in metrics],
+        "comments": [m.comments for m in metrics],
+    }
+    return payload
+
+
+def test_compact_format_scores_like_nested():
+    nested = synthetic_request("30d", "short", current_day=6)
+    compact = PredictionRequest(**compact_payload(nested, order=[4, 1, 6, 2, 5, 3]))
+    for left, right in zip(daily_arrays(nested), daily_arrays(compact)):
+        assert left.tolist() == right.tolist()
+
+    predictor = HybridPredictor(registry=ModelRegistry(MODEL_DIR).load())
+    expected, actual = (
+        predictor.predict_series(build_feature_block(r), "30d", "short", r.current_day) for r in (nested, compact)
+    )
+    assert [p["predicted"] for p in actual] == [p["predicted"] for p in expected]
+
+
+def test_days_default_to_consecutive_from_one():
+    payload = compact_payload(synthetic_request("7d", "all"))
+    del payload["daily_series"]["days"]
+    days, views, _, _ = daily_arrays(PredictionRequest(**payload))
+    assert days.tolist() == [1, 2, 3]
+    assert views.tolist() == [1000, 2000, 3000]
+
+
+@pytest.mark.parametrize("series", [
+    {"views": [1, 2], "likes": [1], "comments": [1, 2]},
+    {"views": [1], "likes": [1], "comments": [-1]},
+    {"days": [1, 1], "views": [1, 2], "likes": [1, 1], "comments": [1, 1]},
+    {"days": [0], "views": [1], "likes": [1], "comments": [1]},
+])
+def test_invalid_series_is_rejected(series):
+    payload = compact_payload(synthetic_request("7d", "all"))
+    payload["daily_series"] = series
+    with pytest.raises(ValidationError):
+        PredictionRequest(**payload)
+
+
+def test_exactly_one_daily_format_is_required():
+    request = synthetic_request("7d", "all")
+    both = dict(compact_payload(request), daily_metrics=request.model_dump()["daily_metrics"])
+    neither = request.model_dump(exclude={"daily_metrics"})
+    for payload in (both, neither):
+        with pytest.raises(ValidationError, match="exactly one of daily_metrics or daily_series"):
+            PredictionRequest(**payload)
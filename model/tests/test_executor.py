@@ -0,0 +1,51 @@
+"""Tests for the bounded inference executor."""
+import asyncio
+import threading
+
+import pytest
+
+from app.executor import ExecutorSaturated, InferenceExecutor
+
+
+def test_run_returns_result_and_timing():
+    executor = InferenceExecutor(workers=1, queue_size=0)
+    result, timing = asyncio.run(executor.run(sum, [1, 2, 3]))
+    assert result == 6
+    assert timing.queue_wait_ms >= 0 and timing.compute_ms >= 0
+    stats = executor.stats()
+    assert stats["completed"] == 1 and stats["in_flight"] == 0
+
+
+def test_rejects_when_workers_and_queue_are_full():
+    executor = InferenceExecutor(workers=1, queue_size=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait, 5))
+        queued = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(release.wait, 5)
+        release.set()
+        await asyncio.gather(running, queued)
+        _, timing = await queued
+        return timing
+
+    timing = asyncio.run(scenario())
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["in_flight"] == 0
+    assert timing.queue_wait_ms > 0
+
+
+def test_failed_task_frees_its_slot():
+    executor = InferenceExecutor(workers=1, queue_size=0)
+
+    def boom():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run(boom))
+    assert executor.stats()["in_flight"] == 0
+    assert asyncio.run(executor.run(len, "ok"))[0] == 2
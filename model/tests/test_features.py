@@ -0,0 +1,116 @@
+"""Parity of the vectorized feature block with the original per-day feature loop."""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.features import SERVING_FEATURES, build_feature_block
+from app.models import PredictionRequest
+
+
+def per_day_features(request):
+    """The original build_features_series: one feature dict per observed day."""
+    daily_metrics = dict(request.daily_metrics)
+    if not daily_metrics:
+        return []
+    day1_views = daily_metrics.get(1).views if 1 in daily_metrics else None
+
+    features_list = []
+    for day in sorted(daily_metrics):
+        metrics = daily_metrics[day]
+        views_t = int(metrics.views or 0)
+
+        if day > 1 and (day - 1) in daily_metrics:
+            views_dif_last1 = max(views_t - int(daily_metrics[day - 1].views or 0), 0)
+        else:
+            views_dif_last1 = 0
+
+        diffs = []
+        for d in range(max(2, day - 2), day + 1):
+            if d in daily_metrics and (d - 1) in daily_metrics:
+                diffs.append(max(int(daily_metrics[d].views or 0) - int(daily_metrics[d - 1].views or 0), 0))
+
+        pub = request.published_at
+        features_list.append({
+            "t": day,
+            "views_cml_t": views_t,
+            "likes_cml_t": int(metrics.likes or 0),
+            "comments_cml_t": int(metrics.comments or 0),
+            "views_dif_last1": views_dif_last1,
+            "views_dif_last3_mean": float(np.mean(diffs)) if diffs else 0.0,
+            "growth_ratio_t": float(views_t) / float(max(day1_views or 1, 1)),
+            "weekday": pub.weekday() if pub is not None else 0,
+            "hour_bin": int(pub.hour // 6) if pub is not None else 0,
+            "is_short": 1 if request.video_type.value == "short" else 0,
+            "video_duration_seconds": getattr(request.video_metadata, "duration_seconds", 0),
+            "title_pca2": getattr(request.text_features, "title_pca2", 0) if request.text_features else 0,
+            "sharpness": getattr(request.thumbnail_features, "sharpness", 0) if request.thumbnail_features else 0,
+            "colorfulness": (
+                getattr(request.thumbnail_features, "colorfulness", 0) if request.thumbnail_features else 0
+            ),
+            "channel_subs": getattr(request.channel_info, "subscribers", 0),
+            "channel_total_views": getattr(request.channel_info, "total_views", 0),
+            "channel_no_of_videos": getattr(request.channel_info, "total_videos", 0),
+        })
+    return features_list
+
+
+def make_request(views, current_day, video_type="long", **extra):
+    """A request observing `views` ({day: cumulative views}) with likes and comments derived from them."""
+    return PredictionRequest(
+        video_id="features",
+        category_id=10,
+        video_metadata={"duration_seconds": 900, "width": 1920, "height": 1080, "fps": 30,
+                        "orientation": "landscape", "resolution": "1080p"},
+        published_at=datetime(2024, 3, 7, 19, 30),
+        channel_info={"channel_id": "c", "subscribers": 2_500, "total_views": 400_000, "total_videos": 80,
+                      "created_at": datetime(2020, 1, 1)},
+        daily_metrics={day: {"views": v, "likes": v // 20, "comments": v // 200} for day, v in views.items()},
+        current_day=current_day,
+        horizon="7d",
+        video_type=video_type,
+        **extra,
+    )
+
+
+REQUESTS = {
+    # Gaps on days 3, 6 and 7, and a day where the count drops
+    "gaps": make_request({1: 400, 2: 1_100, 4: 2_000, 5: 1_900, 8: 3_500}, 8),
+    # Zero views on day 1, so growth is relative to 1 view
+    "zero_views": make_request({1: 0, 2: 0, 3: 250}, 3, "short"),
+    # First observed day is not day 1
+    "no_day_one": make_request({3: 900, 4: 1_300, 5: 1_500}, 5),
+    "single_day": make_request({1: 50}, 1),
+    # Optional features sent as explicit nulls
+    "null_enrichment": make_request(
+        {1: 100, 2: 300}, 2,
+        text_features={"title": "A title", "title_pca2": None},
+        thumbnail_features={"sharpness": None, "colorfulness": 41.5},
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(REQUESTS))
+def test_feature_block_matches_per_day_loop(name):
+    request = REQUESTS[name]
+
+    block = build_feature_block(request)
+
+    expected = per_day_features(request)
+    assert block.names == list(SERVING_FEATURES)
+    assert block.days.tolist() == [row["t"] for row in expected]
+    assert block.to_rows() == [pytest.approx(row, rel=1e-12) for row in expected]
+
+
+def test_gap_and_drop_features():
+    rows = build_feature_block(REQUESTS["gaps"]).to_rows()
+    by_day = {row["t"]: row for row in rows}
+
+    # Day 4 follows the unobserved day 3, so it has no daily gain of its own
+    assert by_day[4]["views_dif_last1"] == 0
+    assert by_day[4]["views_dif_last3_mean"] == 700.0
+    # A drop in cumulative views counts as no gain
+    assert by_day[5]["views_dif_last1"] == 0
+    assert by_day[5]["views_dif_last3_mean"] == 0.0
+    assert by_day[8]["views_dif_last3_mean"] == 0.0
+    assert by_day[8]["growth_ratio_t"] == 3_500 / 400
@@ -0,0 +1,93 @@
+"""Tests for the vectorized horizon simulation."""
+import os
+
+import numpy as np
+import pytest
+
+from app.feature_schema import FeatureSchema
+from app.features import build_feature_block
+from app.horizon import CompoundGrowth, future_grid, rollout, stack_bases
+from app.predictor import HybridPredictor
+from app.registry import ModelRegistry
+from app.warmup import synthetic_request
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return ModelRegistry(MODEL_DIR).load()
+
+
+def base_row(views, title_pca2=0.5):
+    return {"t": 3, "views_cml_t": views, "likes_cml_t": views // 10, "comments_cml_t": views // 100,
+            "views_dif_last1": 50, "views_dif_last3_mean": 40.0, "growth_ratio_t": 2.0,
+            "title_pca2": title_pca2}
+
+
+def test_future_grid_matches_per_day_extrapolation():
+    bases = [base_row(1000), base_row(5000)]
+    columns, n_rows = future_grid(stack_bases(bases), np.array([3, 5]), 4)
+
+    assert n_rows == 8
+    np.testing.assert_array_equal(columns["t"], [4, 5, 6, 7, 6, 7, 8, 9])
+    for i, base in enumerate(bases):
+        for offset in range(1, 5):
+            row = i * 4 + offset - 1
+            assert columns["views_cml_t"][row] == pytest.approx(base["views_cml_t"] * 1.02 ** offset)
+            assert columns["views_dif_last1"][row] == base["views_dif_last1"]
+
+
+def test_null_feature_of_one_video_packs_as_missing():
+    columns, n_rows = future_grid(stack_bases([base_row(1000, None), base_row(2000, 0.25)]), np.array([3, 3]), 2)
+    schema = FeatureSchema.build(["title_pca2", "sharpness"], {"title_pca2": -1.0, "sharpness": -1.0})
+    packed = schema.pack_columns(columns, n_rows)
+    np.testing.assert_array_equal(packed[:, 0], [np.nan, np.nan, 0.25, 0.25])
+    # Features absent from the request still fall back to the default
+    np.testing.assert_array_equal(packed[:, 1], [-1.0] * 4)
+
+
+def test_null_feature_of_every_video_packs_as_missing():
+    columns, n_rows = future_grid(stack_bases([base_row(1000, None)]), np.array([3]), 2)
+    schema = FeatureSchema.build(["title_pca2"], {"title_pca2": -1.0})
+    np.testing.assert_array_equal(schema.pack_columns(columns, n_rows)[:, 0], [np.nan, np.nan])
+    np.testing.assert_array_equal(schema.pack([{"title_pca2": None}, {}])[:, 0], [np.nan, -1.0])
+
+
+def test_growth_curve_is_pluggable():
+    columns, _ = future_grid(stack_bases([base_row(1000)]), np.array([3]), 3, CompoundGrowth(0.1))
+    np.testing.assert_allclose(columns["views_cml_t"], [1100, 1210, 1331])
+
+
+def test_rollout_feeds_predictions_back_in_blocks():
+    seen = []
+
+    def score(columns, n_rows):
+        seen.append(np.array(columns["views_cml_t"]))
+        # Predict 3% growth over the block's cumulative views
+        return (np.log1p(np.asarray(columns["views_cml_t"]) * 1.03),)
+
+    (scores,) = rollout(score, stack_bases([base_row(1000), base_row(2000)]), np.array([3, 3]), 5, step=2)
+
+    assert [len(v) for v in seen] == [4, 4, 2]
+    # The second block continues from the first block's predicted day-2 views
+    np.testing.assert_allclose(seen[1][0], 1000 * 1.02 ** 2 * 1.03 * 1.02)
+    assert scores.shape == (10,)
+    views = np.expm1(scores).reshape(2, 5)
+    assert np.all(np.diff(views, axis=1) > 0)
+
+
+@pytest.mark.parametrize("horizon,video_type", [("7d", "all"), ("30d", "short")])
+def test_rollout_covers_whole_horizon(registry, horizon, video_type):
+    request = synthetic_request(horizon, video_type)
+    block = build_feature_block(request)
+    open_loop = HybridPredictor(registry=registry, rollout_step=0)
+    closed_loop = HybridPredictor(registry=registry, rollout_step=7)
+
+    a = open_loop.predict_series(block, horizon, video_type, request.current_day)
+    b = closed_loop.predict_series(block, horizon, video_type, request.current_day)
+
+    assert [p["day"] for p in a] == [p["day"] for p in b]
+    # The first block is identical; later blocks start from predicted views
+    assert [p["predicted"] for p in a[:7]] == [p["predicted"] for p in b[:7]]
+    assert all(np.isfinite(p["predicted"]) for p in b)
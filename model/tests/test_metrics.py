@@ -0,0 +1,76 @@
+"""Tests for the per-stage latency histograms and the /metrics endpoint."""
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.features import build_feature_block
+from app.predictor import HybridPredictor
+from app.registry import ModelRegistry
+from app.warmup import synthetic_request
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+
+
+def sample(text, name, **labels):
+    """Value of the sample `name` whose labels include `labels`."""
+    for line in text.splitlines():
+        if line.startswith(name + "{") and all(f'{k}="{v}"' in line for k, v in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("t_seconds", "Test.", ("stage",), buckets=(0.001, 0.01))
+    for seconds in (0.0005, 0.001, 0.005, 2.0):
+        histogram.observe(seconds, "pack")
+
+    text = "\n".join(histogram.render())
+    assert "# TYPE t_seconds histogram" in text
+    assert sample(text, "t_seconds_bucket", stage="pack", le="0.001") == 2
+    assert sample(text, "t_seconds_bucket", stage="pack", le="0.01") == 3
+    assert sample(text, "t_seconds_bucket", stage="pack", le="+Inf") == 4
+    assert sample(text, "t_seconds_count", stage="pack") == 4
+    assert abs(sample(text, "t_seconds_sum", stage="pack") - 2.0065) < 1e-9
+
+
+def test_predictor_observes_model_stages():
+    metrics.STAGE_SECONDS.clear()
+    predictor = HybridPredictor(registry=ModelRegistry(MODEL_DIR).load(), backend="native")
+    request = synthetic_request("30d", "short")
+    predictor.predict_series(build_feature_block(request), "30d", "short", request.current_day)
+
+    text = metrics.render()
+    for stage in ("pack", "lightgbm", "xgboost", "blend"):
+        assert sample(text, "forecast_stage_seconds_count", stage=stage, horizon="30d", video_type="short") >= 1
+    assert sample(text, "forecast_stage_seconds_count", stage="pack", horizon="7d") is None
+
+
+def test_middleware_times_parse_serialize_and_request():
+    metrics.STAGE_SECONDS.clear()
+    metrics.REQUEST_SECONDS.clear()
+    app = FastAPI()
+    app.add_middleware(metrics.StageTimingMiddleware)
+
+    @app.get("/forecast")
+    def forecast(http_request: Request):
+        http_request.state.stage_labels = ("7d", "all")
+        metrics.observe_stage("parse", "7d", "all", metrics.parse_seconds(http_request))
+        http_request.state.handled_at = metrics.perf_counter()
+        return {"ok": True}
+
+    @app.get("/other")
+    def other():
+        return {}
+
+    client = TestClient(app)
+    assert client.get("/forecast").json() == {"ok": True}
+    client.get("/other")
+
+    text = metrics.render()
+    for stage in ("parse", "serialize"):
+        assert sample(text, "forecast_stage_seconds_count", stage=stage, horizon="7d", video_type="all") == 1
+    # Requests without stage labels are not observed
+    assert sample(text, "forecast_request_seconds_count", horizon="7d", video_type="all") == 1
+    assert text.count("forecast_request_seconds_count") == 1
@@ -0,0 +1,55 @@
+"""Tests for the native model store and lazy bundle loading."""
+import os
+
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from app import model_store
+from app.registry import HORIZONS, VIDEO_TYPES, ModelRegistry
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+BUNDLE_KEYS = [(h, v) for h in HORIZONS for v in VIDEO_TYPES]
+
+
+@pytest.fixture(scope="module")
+def store_dir(tmp_path_factory):
+    out = tmp_path_factory.mktemp("store")
+    for h, v in BUNDLE_KEYS:
+        model_store.export_bundle(os.path.join(MODEL_DIR, f"hybrid_{h}_{v}.joblib"), str(out))
+    return str(out)
+
+
+@pytest.mark.parametrize("key", BUNDLE_KEYS, ids=lambda k: f"{k[0]}_{k[1]}")
+def test_native_bundle_matches_joblib(store_dir, key):
+    joblib_bundle = ModelRegistry(MODEL_DIR).load().get(*key)
+    native_bundle = ModelRegistry(store_dir).load().get(*key)
+    assert native_bundle.storage == "native"
+    assert native_bundle.raw["meta"] == joblib_bundle.raw["meta"]
+    assert native_bundle.weights == joblib_bundle.weights
+    assert native_bundle.lgb_schema.names == joblib_bundle.lgb_schema.names
+    np.testing.assert_array_equal(native_bundle.xgb_schema.defaults, joblib_bundle.xgb_schema.defaults)
+
+    rng = np.random.default_rng(0)
+    X_lgb = np.abs(rng.standard_normal((64, native_bundle.lgb_schema.width))).astype(np.float32) * 1000
+    np.testing.assert_array_equal(native_bundle.lgb_model.predict(X_lgb), joblib_bundle.lgb_model.predict(X_lgb))
+    X_xgb = np.abs(rng.standard_normal((64, native_bundle.xgb_schema.width))).astype(np.float32) * 1000
+    dmatrix = xgb.DMatrix(X_xgb, feature_names=native_bundle.xgb_features)
+    np.testing.assert_array_equal(native_bundle.xgb_model.predict(dmatrix), joblib_bundle.xgb_model.predict(dmatrix))
+
+
+def test_lazy_registry_loads_on_first_use(store_dir):
+    registry = ModelRegistry(store_dir, lazy=True).load()
+    loaded = []
+    registry.add_load_hook(lambda bundle: loaded.append(bundle.name))
+    assert set(registry.keys()) == set(BUNDLE_KEYS)
+    assert registry.bundles == {}
+
+    bundle = registry.get("7d", "all")
+    assert registry.get("7d", "all") is bundle
+    assert list(registry.bundles) == [("7d", "all")]
+    assert loaded == ["hybrid_7d_all"]
+
+    registry.preload()
+    assert set(registry.bundles) == set(BUNDLE_KEYS)
+    assert len(loaded) == len(BUNDLE_KEYS)
@@ -0,0 +1,88 @@
+"""Parity of the batched predictor with the original per-day scoring loop."""
+import os
+
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from app.features import build_feature_block
+from app.models import TextFeatures, ThumbnailFeatures
+from app.predictor import HybridPredictor
+from app.registry import HORIZONS, VIDEO_TYPES, ModelRegistry
+from app.warmup import synthetic_request
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+BUNDLE_KEYS = [(h, v) for h in HORIZONS for v in VIDEO_TYPES]
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return ModelRegistry(MODEL_DIR).load()
+
+
+@pytest.fixture(scope="module")
+def predictor(registry):
+    return HybridPredictor(registry=registry, backend="native", rollout_step=0)
+
+
+def per_day_loop(bundle, base_feats, current_day, horizon_days):
+    """The original predict_series: one feature row and one call per model for each future day."""
+    results = []
+    for offset in range(1, horizon_days + 1):
+        feats = dict(base_feats)
+        feats["t"] = current_day + offset
+        for key in ["views_cml_t", "likes_cml_t", "comments_cml_t"]:
+            if key in feats:
+                feats[key] = float(feats[key] * (1.02 ** offset))
+
+        X_lgb = np.array([feats.get(f, 0) for f in bundle.lgb_features]).reshape(1, -1)
+        lgb_pred = bundle.lgb_model.predict(X_lgb)[0]
+        X_xgb = np.array([feats.get(f, 0) for f in bundle.xgb_features]).reshape(1, -1)
+        xgb_pred = bundle.xgb_model.predict(xgb.DMatrix(X_xgb, feature_names=bundle.xgb_features))[0]
+
+        final_log = bundle.weights["lightgbm"] * lgb_pred + bundle.weights["xgboost"] * xgb_pred
+        results.append({
+            "day": current_day + offset,
+            "predicted": float(np.expm1(final_log)),
+            "lgb_pred": float(np.expm1(lgb_pred)),
+            "xgb_pred": float(np.expm1(xgb_pred)),
+        })
+    return results
+
+
+def assert_matches_per_day_loop(preds, expected):
+    assert [p["day"] for p in preds] == [e["day"] for e in expected]
+    for key in ("predicted", "lgb_pred", "xgb_pred"):
+        np.testing.assert_allclose([p[key] for p in preds], [e[key] for e in expected], rtol=1e-6)
+
+
+@pytest.mark.parametrize("horizon,video_type", BUNDLE_KEYS)
+def test_batched_series_matches_per_day_loop(registry, predictor, horizon, video_type):
+    request = synthetic_request(horizon, video_type, current_day=5)
+    block = build_feature_block(request)
+
+    preds = predictor.predict_series(block, horizon, video_type, request.current_day)
+
+    expected = per_day_loop(registry.get(horizon, video_type), block.to_rows()[request.current_day - 1],
+                            request.current_day, int(horizon.rstrip("d")))
+    assert_matches_per_day_loop(preds, expected)
+
+
+@pytest.mark.parametrize("horizon,video_type", BUNDLE_KEYS)
+def test_null_features_score_as_missing(registry, predictor, horizon, video_type):
+    request = synthetic_request(horizon, video_type).model_copy(update={
+        "text_features": TextFeatures(title="Untitled", title_pca2=None),
+        "thumbnail_features": ThumbnailFeatures(sharpness=None, colorfulness=None),
+    })
+    block = build_feature_block(request)
+    base_feats = block.to_rows()[request.current_day - 1]
+    assert base_feats["title_pca2"] is None and base_feats["sharpness"] is None
+
+    preds = predictor.predict_series(block, horizon, video_type, request.current_day)
+    (batched,) = predictor.predict_batch([(block, request.current_day)], horizon, video_type)
+
+    # The original loop handed None to the boosters, which treat it as missing (NaN)
+    expected = per_day_loop(registry.get(horizon, video_type), base_feats,
+                            request.current_day, int(horizon.rstrip("d")))
+    assert_matches_per_day_loop(preds, expected)
+    assert_matches_per_day_loop(batched, expected)
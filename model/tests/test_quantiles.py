@@ -0,0 +1,71 @@
+"""Tests for prediction intervals from quantile models in a bundle."""
+import os
+
+import joblib
+import lightgbm as lgb
+import numpy as np
+import pytest
+
+from app import model_store
+from app.features import build_feature_block
+from app.predictor import HybridPredictor
+from app.registry import ModelRegistry
+from app.warmup import synthetic_request
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+
+
+def quantile_entry(bundle, alpha, seed=0):
+    features = bundle["lightgbm"]["features"]
+    rng = np.random.default_rng(seed)
+    X = np.abs(rng.standard_normal((500, len(features)))) * 1000
+    y = bundle["lightgbm"]["booster"].predict(X) + rng.normal(0, 0.3, len(X))
+    booster = lgb.train({"objective": "quantile", "alpha": alpha, "verbose": -1},
+                        lgb.Dataset(X, y, feature_name=features), num_boost_round=20)
+    return {"booster": booster, "features": features, "medians": bundle["lightgbm"]["medians"]}
+
+
+@pytest.fixture(scope="module")
+def quantile_dir(tmp_path_factory):
+    out = tmp_path_factory.mktemp("quantiles")
+    bundle = joblib.load(os.path.join(MODEL_DIR, "hybrid_7d_all.joblib"))
+    bundle["quantiles"] = {0.1: quantile_entry(bundle, 0.1), 0.9: quantile_entry(bundle, 0.9)}
+    joblib.dump(bundle, out / "hybrid_7d_all.joblib")
+    return out
+
+
+def forecast(registry, n=1):
+    predictor = HybridPredictor(registry=registry)
+    request = synthetic_request("7d", "all")
+    block = build_feature_block(request)
+    return predictor.predict_batch([(block, request.current_day)] * n, "7d", "all")
+
+
+def test_interval_scored_with_point_forecast(quantile_dir):
+    registry = ModelRegistry(str(quantile_dir)).load()
+    bundle = registry.get("7d", "all")
+    assert bundle.interval == (0.1, 0.9)
+    # Quantile models on the LightGBM features share its packed matrix
+    assert all(schema is bundle.lgb_schema for _, schema in bundle.quantile_models.values())
+
+    plain = forecast(ModelRegistry(MODEL_DIR).load())[0]
+    (with_interval,) = forecast(registry)
+    assert [p["predicted"] for p in with_interval] == [p["predicted"] for p in plain]
+    assert all(p["lower"] is None and p["upper"] is None for p in plain)
+    assert all(p["lower"] <= p["upper"] for p in with_interval)
+
+
+def test_interval_aligned_in_batches(quantile_dir):
+    registry = ModelRegistry(str(quantile_dir)).load()
+    single = forecast(registry)[0]
+    for preds in forecast(registry, n=3):
+        assert [(p["lower"], p["upper"]) for p in preds] == [(p["lower"], p["upper"]) for p in single]
+
+
+def test_quantiles_survive_native_store(quantile_dir, tmp_path):
+    model_store.export_bundle(str(quantile_dir / "hybrid_7d_all.joblib"), str(tmp_path))
+    assert (tmp_path / "hybrid_7d_all" / "quantile_0.1.txt").exists()
+
+    expected = forecast(ModelRegistry(str(quantile_dir)).load())[0]
+    actual = forecast(ModelRegistry(str(tmp_path)).load())[0]
+    assert [(p["lower"], p["upper"]) for p in actual] == [(p["lower"], p["upper"]) for p in expected]
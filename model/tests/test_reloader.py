@@ -0,0 +1,66 @@
+"""Tests for hot reloading the model registry."""
+import os
+import shutil
+
+import pytest
+
+from app.features import build_feature_block
+from app.predictor import HybridPredictor
+from app.registry import ModelRegistry
+from app.reloader import ModelReloader
+from app.warmup import synthetic_request
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    for name in ("hybrid_7d_all.joblib", "hybrid_7d_short.joblib"):
+        shutil.copy(os.path.join(MODEL_DIR, name), tmp_path / name)
+    return tmp_path
+
+
+def forecast(predictor, registry=None):
+    request = synthetic_request("7d", "all")
+    preds = predictor.predict_series(
+        build_feature_block(request), "7d", "all", request.current_day, registry=registry
+    )
+    return [p["predicted"] for p in preds]
+
+
+def test_reload_swaps_registry_and_keeps_old_snapshot(model_dir):
+    predictor = HybridPredictor(registry=ModelRegistry(str(model_dir)).load())
+    reloader = ModelReloader(predictor)
+    assert reloader.reload()["status"] == "unchanged"
+
+    old = predictor.registry
+    old_id = old.get("7d", "all").model_id
+    old_preds = forecast(predictor)
+
+    # Deploy a different bundle under the same name
+    shutil.copy(os.path.join(MODEL_DIR, "hybrid_7d_long.joblib"), model_dir / "hybrid_7d_all.joblib")
+    result = reloader.reload()
+
+    assert result["status"] == "reloaded"
+    assert result["generation"] == 1
+    assert predictor.registry is not old
+    assert result["bundles"]["hybrid_7d_all"] != old_id
+    assert predictor.registry.get("7d", "all").model_id == result["bundles"]["hybrid_7d_all"]
+    # A request that captured the old snapshot still scores with the old bundle
+    assert forecast(predictor, registry=old) == old_preds
+    assert forecast(predictor) != old_preds
+
+
+def test_failed_reload_keeps_serving_current_registry(model_dir):
+    predictor = HybridPredictor(registry=ModelRegistry(str(model_dir)).load())
+    reloader = ModelReloader(predictor)
+    current = predictor.registry
+
+    (model_dir / "hybrid_30d_all.joblib").write_bytes(b"not a bundle")
+    result = reloader.reload()
+
+    assert result["status"] == "failed"
+    assert "hybrid_30d_all" in result["detail"]
+    assert predictor.registry is current
+    assert reloader.last_reload["generation"] == 0
+    assert forecast(predictor)
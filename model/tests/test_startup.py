@@ -0,0 +1,97 @@
+"""Tests for the startup warm-up phase."""
+import asyncio
+import os
+import shutil
+import threading
+
+from fastapi.testclient import TestClient
+
+from app import main, startup
+from app.executor import InferenceExecutor
+from app.predictor import HybridPredictor
+from app.registry import ModelRegistry
+from app.startup import StartupState
+from app.warmup import synthetic_request
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+
+
+def test_ready_after_every_bundle_is_warmed():
+    registry = ModelRegistry(MODEL_DIR, lazy=True).load()
+    predictor = HybridPredictor(registry=registry)
+    state = StartupState(import_ms=1.0)
+    assert not state.ready
+
+    asyncio.run(state.run(predictor, InferenceExecutor(workers=2, queue_size=0)))
+
+    report = state.report()
+    assert report["ready"] and report["ready_at"] is not None
+    assert set(registry.bundles) == set(registry.keys())
+    assert set(report["bundles_warm_ms"]) == {b.name for b in registry.bundles.values()}
+    assert report["load_ms"] >= 0 and report["warm_ms"] >= 0
+
+
+def test_each_worker_thread_runs_one_warm_up(monkeypatch):
+    threads = []
+
+    def record(predictor, registry):
+        threads.append(threading.current_thread().name)
+        return {}
+
+    monkeypatch.setattr(startup, "warm_up", record)
+    predictor = HybridPredictor(registry=ModelRegistry(MODEL_DIR, lazy=True).load())
+    executor = InferenceExecutor(workers=4, queue_size=0)
+
+    asyncio.run(StartupState(import_ms=1.0).run(predictor, executor))
+
+    assert len(threads) == 4 and len(set(threads)) == 4
+
+
+def test_not_ready_when_a_bundle_fails_to_load(tmp_path):
+    shutil.copy(os.path.join(MODEL_DIR, "hybrid_7d_all.joblib"), tmp_path / "hybrid_7d_all.joblib")
+    (tmp_path / "hybrid_7d_short.joblib").write_bytes(b"truncated")
+    predictor = HybridPredictor(registry=ModelRegistry(str(tmp_path), lazy=True).load())
+    state = StartupState(import_ms=1.0)
+
+    asyncio.run(state.run(predictor, InferenceExecutor(workers=1, queue_size=0)))
+
+    assert not state.ready
+    assert "hybrid_7d_short" in state.detail
+
+
+def test_health_reports_bundles_that_failed_to_load(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(MODEL_DIR, "hybrid_7d_all.joblib"), tmp_path / "hybrid_7d_all.joblib")
+    shutil.copy(os.path.join(MODEL_DIR, "hybrid_7d_long.joblib"), tmp_path / "hybrid_7d_long.joblib")
+    (tmp_path / "hybrid_7d_short.joblib").write_bytes(b"truncated")
+    registry = ModelRegistry(str(tmp_path), lazy=True).load()
+    registry.get("7d", "all")
+    registry.get("7d", "short")
+    monkeypatch.setattr(main, "predictor", HybridPredictor(registry=registry))
+
+    health = TestClient(main.app).get("/health").json()
+
+    # hybrid_7d_long has not been loaded yet, so it is not reported either way
+    assert health["models_status"] == {"hybrid_7d_all": True, "hybrid_7d_short": False}
+    assert set(health["models_errors"]) == {"hybrid_7d_short"}
+    assert set(health["models_info"]) == {"hybrid_7d_all"}
+
+
+def test_predict_loads_a_lazy_bundle_off_the_event_loop(monkeypatch):
+    registry = ModelRegistry(MODEL_DIR, lazy=True).load()
+    threads = []
+    load = registry._load_locked
+
+    def record(key):
+        threads.append(threading.current_thread().name)
+        return load(key)
+
+    monkeypatch.setattr(registry, "_load_locked", record)
+    monkeypatch.setattr(main, "predictor", HybridPredictor(registry=registry))
+    monkeypatch.setattr(main, "inference_executor", InferenceExecutor(workers=1, queue_size=0))
+    request = synthetic_request("7d", "all").model_copy(update={"video_id": "lazy-load"})
+
+    response = TestClient(main.app).post("/predict", content=request.model_dump_json())
+
+    assert response.status_code == 200
+    assert threads and all(name.startswith("inference") for name in threads)
+    assert ("7d", "all") in registry.bundles